@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -7,11 +7,14 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str
+    DATABASE_READ_URL: Optional[str] = None  # read replica for read-only routes (separate pool)
+    READ_AFTER_WRITE_PIN_SECONDS: float = 5.0  # reads stay on the primary this long after a write
 
     # JWT
     JWT_SECRET: str
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRATION_DAYS: int = 7
+    AUTH_HASH_WORKERS: int = 4  # threads reserved for bcrypt (register/login)
 
     # CORS
     CORS_ORIGINS: str = "http://localhost:3000"
@@ -19,8 +22,56 @@ class Settings(BaseSettings):
     # Environment
     ENVIRONMENT: str = "development"
 
+    # Real-time task events (SSE)
+    TASK_EVENTS_HISTORY: int = 1000  # recent events kept for Last-Event-ID resume
+    TASK_EVENTS_BACKPLANE: bool = False  # fan out across workers via PostgreSQL LISTEN/NOTIFY
+
+    # Delta sync
+    TOMBSTONE_RETENTION_DAYS: int = 30  # clients older than this get a full resync
+    TOMBSTONE_COMPACT_EVERY: int = 500  # purge expired tombstones every N deletes
+
+    # Archival of old completed tasks to tasks_archive (see app/services/task_archive.py)
+    ARCHIVE_ENABLED: bool = False  # moves user data; enable deliberately
+    ARCHIVE_AFTER_DAYS: int = 90  # completed and not updated for this long
+    ARCHIVE_BATCH_SIZE: int = 1000  # tasks moved per transaction
+    ARCHIVE_INTERVAL_MINUTES: float = 60.0
+
+    # Request coalescing (app/services/single_flight.py)
+    SINGLE_FLIGHT_WAIT_SECONDS: float = 2.0  # followers then run their own query
+
+    # Rate limiting (token buckets; "N/second|minute|hour|day")
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_LOGIN: str = "10/minute"  # per client IP
+    RATE_LIMIT_REGISTER: str = "5/minute"  # per client IP
+    RATE_LIMIT_CHAT: str = "20/minute"  # per authenticated user
+    RATE_LIMIT_REDIS_URL: Optional[str] = None  # share buckets between workers
+    RATE_LIMIT_MAX_KEYS: int = 100_000  # in-process buckets kept before idle ones are dropped
+    RATE_LIMIT_TRUST_FORWARDED: bool = False  # key by the address the proxy appends to X-Forwarded-For
+    RATE_LIMIT_TRUSTED_PROXIES: str = ""  # comma-separated proxy IPs/CIDRs; empty trusts the peer (proxy-only apps)
+
+    # Response compression (br and zstd need the optional brotli / zstandard packages)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024  # bytes; smaller bodies are sent as-is
+    COMPRESSION_GZIP_LEVEL: int = 4  # see benchmarks/bench_compression.py
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+
+    # Chat interpreter backend: "gemini" or "local" (offline, deterministic)
+    LLM_PROVIDER: str = "gemini"
+    LLM_REPLAY_FILE: Optional[str] = None  # recorded responses for the local provider
+    LLM_LATENCY_MS: int = 0  # latency injected by the local provider
+
+    # Resilience for remote providers (see app/services/resilience.py)
+    LLM_TIMEOUT_SECONDS: float = 10.0  # per attempt
+    LLM_DEADLINE_SECONDS: float = 20.0  # per chat message, retries included
+    LLM_MAX_RETRIES: int = 2  # transient errors only
+    LLM_RETRY_BASE_DELAY: float = 0.25  # seconds; jittered, doubled per retry
+    LLM_BREAKER_THRESHOLD: int = 5  # consecutive failed calls before failing fast
+    LLM_BREAKER_RESET_SECONDS: float = 30.0  # open time before a probe call
+    LLM_FALLBACK: str = "local"  # interpreter used when the model fails; "" to disable
+
     # Gemini AI Configuration (FREE!)
-    GEMINI_API_KEY: str
+    GEMINI_API_KEY: str = ""
     GEMINI_MODEL: str = "gemini-2.5-flash"
     GEMINI_MAX_TOKENS: int = 1000
     GEMINI_TEMPERATURE: float = 0.7
@@ -30,6 +81,11 @@ class Settings(BaseSettings):
         """Parse CORS origins from comma-separated string."""
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
 
+    @property
+    def rate_limit_trusted_proxies_list(self) -> List[str]:
+        """Parse trusted proxy addresses from comma-separated string."""
+        return [proxy.strip() for proxy in self.RATE_LIMIT_TRUSTED_PROXIES.split(",") if proxy.strip()]
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -1,3 +1,9 @@
+import threading
+import time
+import uuid
+from typing import Annotated, Any, Dict, Optional
+from fastapi import Path
+from sqlalchemy import Engine, text
 from sqlmodel import create_engine, SQLModel, Session
 from .config import settings
 
@@ -8,6 +14,20 @@ engine = create_engine(
     pool_pre_ping=True,
 )
 
+# Optional read replica with its own connection pool; reads use the primary
+# when it is not configured
+read_engine = create_engine(
+    settings.DATABASE_READ_URL,
+    echo=settings.ENVIRONMENT == "development",
+    pool_pre_ping=True,
+) if settings.DATABASE_READ_URL else engine
+
+# Read-your-writes: users who wrote recently read from the primary until the
+# replica has had time to replay their writes (user_id -> monotonic expiry)
+_pinned: Dict[uuid.UUID, float] = {}
+_pinned_lock = threading.Lock()
+_reads = {"primary": 0, "replica": 0}
+
 
 def create_tables():
     """Create all database tables."""
@@ -18,3 +38,63 @@ def get_session():
     """Dependency for FastAPI to get database session."""
     with Session(engine) as session:
         yield session
+
+
+def pin_to_primary(user_id: uuid.UUID) -> None:
+    """Route this user's reads to the primary for READ_AFTER_WRITE_PIN_SECONDS."""
+    if read_engine is engine:
+        return
+    expires = time.monotonic() + settings.READ_AFTER_WRITE_PIN_SECONDS
+    with _pinned_lock:
+        _pinned[user_id] = expires
+        if len(_pinned) > 10_000:
+            now = time.monotonic()
+            for pinned_id in [key for key, until in _pinned.items() if until <= now]:
+                del _pinned[pinned_id]
+
+
+def read_engine_for(user_id: uuid.UUID) -> Engine:
+    """The engine a user's reads should use: the replica, unless they wrote recently."""
+    if read_engine is engine:
+        return engine
+    with _pinned_lock:
+        until = _pinned.get(user_id)
+        if until is not None and until <= time.monotonic():
+            del _pinned[user_id]
+            until = None
+        target = "replica" if until is None else "primary"
+        _reads[target] += 1
+    return read_engine if until is None else engine
+
+
+def get_read_session(user_id: Annotated[uuid.UUID, Path()]):
+    """Dependency for read-only routes: a session on the read replica when one is configured."""
+    with Session(read_engine_for(user_id)) as session:
+        yield session
+
+
+def replica_stats() -> Dict[str, Any]:
+    """Read routing counters and the replica's replication lag (PostgreSQL only)."""
+    if read_engine is engine:
+        return {"configured": False}
+
+    lag: Optional[float] = None
+    if read_engine.dialect.name == "postgresql":
+        try:
+            with read_engine.connect() as conn:
+                lag = conn.execute(text(
+                    "SELECT CASE WHEN pg_is_in_recovery() "
+                    "THEN COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+                    "ELSE 0 END"
+                )).scalar()
+        except Exception as e:
+            print(f"Replica lag check failed: {e}")
+    with _pinned_lock:
+        now = time.monotonic()
+        return {
+            "configured": True,
+            "lag_seconds": float(lag) if lag is not None else None,
+            "pin_seconds": settings.READ_AFTER_WRITE_PIN_SECONDS,
+            "pinned_users": sum(1 for until in _pinned.values() if until > now),
+            "reads": dict(_reads),
+        }
@@ -1,9 +1,16 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from .config import settings
-from .database import create_tables
-from .migrations import run_migrations
+from .database import create_tables, engine, replica_stats
+from .migrations import MigrationError, run_migrations
+from .middleware import CompressionMiddleware, RateLimitMiddleware
+from .middleware.rate_limit import create_bucket_store
 from .routes import auth_router, tasks_router, chat_router
+from .services.task_events import task_events
+from .services.task_archive import task_archiver
+from .services.single_flight import task_list_reads
+from .services.llm_provider import llm_stats
+from .services.chatbot_service import chat_stats
 
 # Create FastAPI app
 app = FastAPI(
@@ -14,6 +21,15 @@ app = FastAPI(
     redoc_url="/redoc",
 )
 
+# Rate limiting (added first so CORS headers are also set on 429 responses)
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(
+        RateLimitMiddleware,
+        store=create_bucket_store(settings.RATE_LIMIT_REDIS_URL),
+        trust_forwarded=settings.RATE_LIMIT_TRUST_FORWARDED,
+        trusted_proxies=settings.rate_limit_trusted_proxies_list,
+    )
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -23,6 +39,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Response compression (outermost, so every response body passes through it)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE)
+
 # Include routers
 app.include_router(auth_router)
 app.include_router(tasks_router)
@@ -37,10 +57,26 @@ def on_startup():
         print("✅ Database tables created successfully")
         run_migrations()
         print("✅ Database migrations completed successfully")
+    except MigrationError as e:
+        print(f"❌ Database migration failed: {e}")
+        raise
     except Exception as e:
         print(f"⚠️  Warning: Could not initialize database: {e}")
         print("The app will still start, but database operations may fail")
 
+    if settings.TASK_EVENTS_BACKPLANE:
+        task_events.start_backplane(engine)
+
+    if settings.ARCHIVE_ENABLED:
+        task_archiver.start(engine)
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    """Stop background listeners."""
+    task_events.stop_backplane()
+    task_archiver.stop()
+
 
 @app.get("/api/health")
 def health_check():
@@ -67,6 +103,18 @@ def health_check():
     }
 
 
+@app.get("/api/metrics")
+def metrics():
+    """In-process counters for this worker."""
+    return {
+        "single_flight": {task_list_reads.name: task_list_reads.stats()},
+        "llm": llm_stats(),
+        "chat": chat_stats(),
+        "read_replica": replica_stats(),
+        "archive": task_archiver.stats(),
+    }
+
+
 @app.get("/")
 def root():
     """Root endpoint."""
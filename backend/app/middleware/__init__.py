@@ -1,3 +1,11 @@
-from .auth import get_current_user
+from .auth import get_current_user, get_current_reader
+from .compression import CompressionMiddleware
+from .rate_limit import RateLimitMiddleware, RateLimitPolicy
 
-__all__ = ["get_current_user"]
+__all__ = [
+    "get_current_user",
+    "get_current_reader",
+    "CompressionMiddleware",
+    "RateLimitMiddleware",
+    "RateLimitPolicy",
+]
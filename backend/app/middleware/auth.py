@@ -3,7 +3,7 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlmodel import Session, select
 from typing import Annotated
 import uuid
-from ..database import get_session
+from ..database import engine, get_session, get_read_session
 from ..models.user import User
 from ..services.auth_service import verify_token
 
@@ -15,6 +15,18 @@ def get_current_user(
     session: Annotated[Session, Depends(get_session)]
 ) -> User:
     """Dependency to get the current authenticated user."""
+    return _authenticate(credentials, session)
+
+
+def get_current_reader(
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+    session: Annotated[Session, Depends(get_read_session)]
+) -> User:
+    """get_current_user for read-only routes, looked up on the read session."""
+    return _authenticate(credentials, session)
+
+
+def _authenticate(credentials: HTTPAuthorizationCredentials, session: Session) -> User:
     token = credentials.credentials
 
     # Verify token
@@ -40,6 +52,11 @@ def get_current_user(
     statement = select(User).where(User.id == user_id)
     user = session.exec(statement).first()
 
+    if not user and session.get_bind() is not engine:
+        # Just registered (possibly via another worker); the replica may lag behind
+        with Session(engine) as primary:
+            user = primary.exec(statement).first()
+
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
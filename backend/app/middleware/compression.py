@@ -0,0 +1,220 @@
+"""
+Negotiated response compression.
+
+CompressionMiddleware compresses response bodies with the best encoding the
+client accepts (Accept-Encoding) among zstd, br and gzip, in the configured
+order of preference. brotli and zstd need the optional `brotli` and
+`zstandard` packages; encodings whose package is missing are never offered.
+
+Left untouched: bodies smaller than the minimum size, Server-Sent Events
+(text/event-stream must reach the client event by event), responses that
+already have a Content-Encoding, and statuses without a body. Large bodies
+are compressed in a worker thread so they do not stall the event loop.
+"""
+import zlib
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+from anyio import to_thread
+from ..config import settings
+
+# Bodies above this size are compressed off the event loop
+_THREAD_THRESHOLD = 128 * 1024
+
+_NO_BODY_STATUSES = {204, 304}
+
+_SKIPPED_CONTENT_TYPES = (b"text/event-stream",)
+
+
+def _gzip_codec(level: int):
+    def compress(data: bytes) -> bytes:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+        return compressor.compress(data) + compressor.flush()
+
+    def stream():
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+        return compressor.compress, compressor.flush
+    return compress, stream
+
+
+def _brotli_codec(quality: int):
+    import brotli
+
+    def compress(data: bytes) -> bytes:
+        return brotli.compress(data, quality=quality)
+
+    def stream():
+        compressor = brotli.Compressor(quality=quality)
+        return compressor.process, compressor.finish
+    return compress, stream
+
+
+def _zstd_codec(level: int):
+    import zstandard
+
+    # ZstdCompressor instances must not be shared between threads
+    def compress(data: bytes) -> bytes:
+        return zstandard.ZstdCompressor(level=level).compress(data)
+
+    def stream():
+        compressor = zstandard.ZstdCompressor(level=level).compressobj()
+        return compressor.compress, compressor.flush
+    return compress, stream
+
+
+_CODECS = {"gzip": _gzip_codec, "br": _brotli_codec, "zstd": _zstd_codec}
+
+
+def available_codecs(levels: Dict[str, int]) -> Dict[str, Tuple[Callable, Callable]]:
+    """
+    Build (compress, stream) pairs for every encoding whose package is installed.
+
+    Args:
+        levels: Encoding name -> compression level, in order of preference
+    """
+    codecs = {}
+    for name, level in levels.items():
+        try:
+            codecs[name] = _CODECS[name](level)
+        except ImportError:
+            pass
+    return codecs
+
+
+@lru_cache(maxsize=256)
+def _accepted(accept_encoding: bytes) -> Dict[str, float]:
+    accepted = {}
+    for part in accept_encoding.decode("latin-1").split(","):
+        name, _, params = part.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name] = quality
+    return accepted
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses with a negotiated encoding."""
+
+    def __init__(self, app, minimum_size: int = 1024, levels: Optional[Dict[str, int]] = None):
+        self.app = app
+        self.minimum_size = minimum_size
+        if levels is None:
+            levels = {
+                "zstd": settings.COMPRESSION_ZSTD_LEVEL,
+                "br": settings.COMPRESSION_BROTLI_QUALITY,
+                "gzip": settings.COMPRESSION_GZIP_LEVEL,
+            }
+        self.codecs = available_codecs(levels)
+
+    def choose(self, accept_encoding: bytes) -> Optional[str]:
+        """The preferred available encoding the client accepts, if any."""
+        accepted = _accepted(accept_encoding)
+        best, best_quality = None, 0.0
+        for name in self.codecs:
+            quality = accepted.get(name, accepted.get("*", 0.0))
+            if quality > best_quality:
+                best, best_quality = name, quality
+        return best
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = None
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                encoding = self.choose(value)
+                break
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressingSender(send, encoding, self.codecs[encoding], self.minimum_size)
+        await self.app(scope, receive, responder)
+
+
+class _CompressingSender:
+    """Wraps `send` for one response, deciding on the first body message."""
+
+    def __init__(self, send, encoding: str, codec, minimum_size: int):
+        self.send = send
+        self.encoding = encoding
+        self.compress, self.stream = codec
+        self.minimum_size = minimum_size
+        self.start: Optional[dict] = None
+        self.skip = False
+        self.streaming: Optional[Tuple[Callable, Callable]] = None
+
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            headers = message.get("headers", [])
+            self.skip = message["status"] in _NO_BODY_STATUSES or any(
+                name == b"content-encoding"
+                or (name == b"content-type" and value.startswith(_SKIPPED_CONTENT_TYPES))
+                for name, value in headers
+            )
+            if self.skip:
+                await self.send(message)
+            else:
+                # Held until the first body chunk shows whether to compress
+                self.start = message
+            return
+
+        if message["type"] != "http.response.body" or self.skip:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.streaming is not None:
+            compress, flush = self.streaming
+            data = compress(body) if body else b""
+            if not more_body:
+                data += flush()
+            await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+            return
+
+        start, self.start = self.start, None
+        if not more_body:
+            if len(body) < self.minimum_size:
+                self.skip = True
+                await self.send(start)
+                await self.send(message)
+                return
+            if len(body) > _THREAD_THRESHOLD:
+                data = await to_thread.run_sync(self.compress, body)
+            else:
+                data = self.compress(body)
+            await self.send(self._start_message(start, len(data)))
+            await self.send({"type": "http.response.body", "body": data})
+            return
+
+        # Streamed response of unknown length
+        self.streaming = compress, flush = self.stream()
+        await self.send(self._start_message(start, None))
+        await self.send({"type": "http.response.body", "body": compress(body), "more_body": True})
+
+    def _start_message(self, start: dict, length: Optional[int]) -> dict:
+        headers: List[Tuple[bytes, bytes]] = []
+        vary = None
+        for name, value in start.get("headers", []):
+            if name == b"content-length":
+                continue
+            if name == b"vary":
+                vary = value
+                continue
+            headers.append((name, value))
+        headers.append((b"content-encoding", self.encoding.encode()))
+        headers.append((b"vary", vary + b", Accept-Encoding" if vary else b"Accept-Encoding"))
+        if length is not None:
+            headers.append((b"content-length", str(length).encode()))
+        return {**start, "headers": headers}
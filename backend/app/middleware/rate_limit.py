@@ -0,0 +1,269 @@
+"""
+Per-route rate limiting.
+
+RateLimitMiddleware is a plain ASGI middleware that checks each request
+against the first matching RateLimitPolicy. Every policy has one token bucket
+per client: per IP address for the public auth routes, per authenticated user
+for chat. A request that finds its bucket empty gets 429 with Retry-After and
+never reaches the route, so one client cannot tie up the bcrypt and LLM work
+of the whole worker pool.
+
+Behind a reverse proxy (RATE_LIMIT_TRUST_FORWARDED) the client IP is the
+rightmost X-Forwarded-For address that is not one of RATE_LIMIT_TRUSTED_PROXIES:
+the one our own proxy appended. Entries to its left come from the client and
+are never used, so a client cannot pick its own bucket.
+
+Buckets live in a sharded in-process dict by default (limits apply per
+worker). Set RATE_LIMIT_REDIS_URL to share them between workers through any
+Redis-compatible server; if that server is unreachable requests are let
+through rather than failing.
+"""
+import ipaddress
+import json
+import math
+import re
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+from ..config import settings
+from ..services.auth_service import verify_token
+
+_PERIODS = {"second": 1.0, "minute": 60.0, "hour": 3600.0, "day": 86400.0}
+
+_REJECTED_BODY = json.dumps({"detail": "Too many requests"}).encode()
+
+
+def parse_rate(value: str) -> Tuple[float, int]:
+    """
+    Parse a rate such as "10/minute".
+
+    Returns (tokens refilled per second, bucket capacity): the full count may
+    be used at once, then it refills evenly over the period.
+    """
+    try:
+        count, _, period = value.partition("/")
+        count = int(count)
+        seconds = _PERIODS[period.strip().lower().rstrip("s")]
+    except (ValueError, KeyError):
+        raise ValueError(f"Invalid rate limit '{value}', expected e.g. '10/minute'")
+    if count < 1:
+        raise ValueError(f"Invalid rate limit '{value}', the count must be at least 1")
+    return count / seconds, count
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    """A limit applied to requests whose method and path match."""
+    name: str
+    path: "re.Pattern[str]"
+    methods: FrozenSet[str]
+    rate: float  # tokens per second
+    burst: int  # bucket capacity
+    per_user: bool = False  # key by the bearer token's user instead of the client IP
+
+    @classmethod
+    def from_string(cls, name: str, path: str, methods, limit: str, per_user: bool = False):
+        rate, burst = parse_rate(limit)
+        return cls(name, re.compile(path), frozenset(methods), rate, burst, per_user)
+
+
+def default_policies() -> List[RateLimitPolicy]:
+    """The policies configured in settings."""
+    return [
+        RateLimitPolicy.from_string("login", r"/api/auth/login$", ["POST"], settings.RATE_LIMIT_LOGIN),
+        RateLimitPolicy.from_string("register", r"/api/auth/register$", ["POST"], settings.RATE_LIMIT_REGISTER),
+        RateLimitPolicy.from_string("chat", r"/api/[^/]+/chat/", ["POST"], settings.RATE_LIMIT_CHAT, per_user=True),
+    ]
+
+
+class MemoryBucketStore:
+    """
+    Token buckets in a sharded dict.
+
+    Each shard has its own lock and size bound; when a shard outgrows it,
+    buckets that have refilled completely are dropped (they hold no state a
+    fresh bucket would not), so memory stays bounded under IP churn.
+    """
+
+    def __init__(self, shards: int = 16, max_keys: int = 100_000):
+        self._shards: List[Tuple[Dict[str, list], threading.Lock]] = [
+            ({}, threading.Lock()) for _ in range(shards)
+        ]
+        self._max_shard_keys = max(1, max_keys // shards)
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        return self.take_now(key, rate, burst, time.monotonic())
+
+    def take_now(self, key: str, rate: float, burst: int, now: float) -> float:
+        """
+        Take one token from the bucket for `key`.
+
+        Returns:
+            0.0 if the request is allowed, otherwise seconds until a token is available
+        """
+        buckets, lock = self._shards[hash(key) % len(self._shards)]
+        with lock:
+            bucket = buckets.get(key)
+            if bucket is None:
+                if len(buckets) >= self._max_shard_keys:
+                    self._evict(buckets, now)
+                buckets[key] = [burst - 1.0, now, rate, burst]
+                return 0.0
+
+            tokens = min(burst, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+            if tokens >= 1.0:
+                bucket[0] = tokens - 1.0
+                return 0.0
+            bucket[0] = tokens
+            return (1.0 - tokens) / rate
+
+    def __len__(self) -> int:
+        return sum(len(buckets) for buckets, _ in self._shards)
+
+    def _evict(self, buckets: Dict[str, list], now: float) -> None:
+        full = [key for key, (tokens, stamp, rate, burst) in buckets.items()
+                if tokens + (now - stamp) * rate >= burst]
+        for key in full:
+            del buckets[key]
+        if len(buckets) >= self._max_shard_keys:
+            # Every client in this shard is mid-burst; forgetting them errs
+            # on the side of allowing requests
+            buckets.clear()
+
+
+# Atomic refill-and-take; uses the server clock so workers need not agree on time
+_TAKE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'stamp')
+local tokens = tonumber(state[1]) or burst
+local stamp = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - stamp) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'stamp', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000))
+return tostring(wait)
+"""
+
+
+class RedisBucketStore:
+    """Token buckets shared between workers through a Redis-compatible server."""
+
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("RATE_LIMIT_REDIS_URL requires the 'redis' package (pip install redis)")
+        self._errors = (redis.RedisError, OSError)
+        self._client = redis.Redis.from_url(url)
+        self._script = self._client.register_script(_TAKE_SCRIPT)
+        self._prefix = prefix
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        try:
+            wait = await self._script(keys=[self._prefix + key], args=[rate, burst])
+        except self._errors as e:
+            print(f"Rate limit store unavailable, allowing request: {e}")
+            return 0.0
+        return float(wait)
+
+
+def create_bucket_store(redis_url: Optional[str] = None):
+    """A shared store when a Redis URL is configured, otherwise an in-process one."""
+    if redis_url:
+        return RedisBucketStore(redis_url)
+    return MemoryBucketStore(max_keys=settings.RATE_LIMIT_MAX_KEYS)
+
+
+@lru_cache(maxsize=4096)
+def _token_subject(token: str) -> Optional[Tuple[str, float]]:
+    # Signature checks are the expensive part; a token's payload never changes
+    payload = verify_token(token)
+    if not payload or "user_id" not in payload:
+        return None
+    return payload["user_id"], payload.get("exp", math.inf)
+
+
+class RateLimitMiddleware:
+    """ASGI middleware enforcing RateLimitPolicy limits."""
+
+    def __init__(self, app, policies: Optional[List[RateLimitPolicy]] = None, store=None,
+                 trust_forwarded: bool = False, trusted_proxies: Iterable[str] = ()):
+        self.app = app
+        self.policies = default_policies() if policies is None else policies
+        self.store = store if store is not None else create_bucket_store()
+        self.trust_forwarded = trust_forwarded
+        self.trusted_proxies = [ipaddress.ip_network(proxy, strict=False) for proxy in trusted_proxies]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            policy = self._match(scope["method"], scope["path"])
+            if policy is not None:
+                key = f"{policy.name}:{self._client_key(scope, policy.per_user)}"
+                wait = await self.store.take(key, policy.rate, policy.burst)
+                if wait > 0:
+                    await _reject(send, wait)
+                    return
+        await self.app(scope, receive, send)
+
+    def _match(self, method: str, path: str) -> Optional[RateLimitPolicy]:
+        for policy in self.policies:
+            if method in policy.methods and policy.path.match(path):
+                return policy
+        return None
+
+    def _client_key(self, scope, per_user: bool) -> str:
+        headers = None
+        if per_user:
+            headers = dict(scope["headers"])
+            authorization = headers.get(b"authorization", b"")
+            if authorization[:7].lower() == b"bearer ":
+                subject = _token_subject(authorization[7:].decode("latin-1").strip())
+                if subject is not None and subject[1] > time.time():
+                    return "user:" + subject[0]
+            # Unauthenticated: the route will refuse it, but it still costs work
+
+        client = scope.get("client")
+        peer = client[0] if client else "unknown"
+        if self.trust_forwarded and (not self.trusted_proxies or self._is_trusted_proxy(peer)):
+            if headers is None:
+                headers = dict(scope["headers"])
+            forwarded = headers.get(b"x-forwarded-for")
+            if forwarded:
+                # Walk back from the entry our proxy appended; anything left
+                # of the first untrusted address was written by the client
+                for address in reversed(forwarded.decode("latin-1").split(",")):
+                    address = address.strip()
+                    if address and not self._is_trusted_proxy(address):
+                        return "ip:" + address
+        return "ip:" + peer
+
+    def _is_trusted_proxy(self, address: str) -> bool:
+        try:
+            ip = ipaddress.ip_address(address)
+        except ValueError:
+            return False
+        return any(ip in network for network in self.trusted_proxies)
+
+
+async def _reject(send, wait: float) -> None:
+    await send({
+        "type": "http.response.start",
+        "status": 429,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(_REJECTED_BODY)).encode()),
+            (b"retry-after", str(math.ceil(wait)).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": _REJECTED_BODY})
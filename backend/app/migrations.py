@@ -4,6 +4,11 @@ This runs on app startup to ensure schema is up-to-date.
 """
 from sqlalchemy import text, inspect
 from .database import engine
+from .models.task import Task
+
+
+class MigrationError(RuntimeError):
+    """A migration cannot be applied safely; the app must not start until it is resolved."""
 
 
 def run_migrations():
@@ -35,4 +40,165 @@ def run_migrations():
                 conn.commit()
                 print("✓ Added tags column")
 
+            # Delta sync index (create_all only adds indexes to new tables)
+            task_indexes = {index['name'] for index in inspector.get_indexes('tasks')}
+            if 'ix_tasks_user_id_updated_at' not in task_indexes:
+                print("Adding (user_id, updated_at) index to tasks table...")
+                conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS ix_tasks_user_id_updated_at "
+                    "ON tasks (user_id, updated_at)"
+                ))
+                conn.commit()
+                print("✓ Added ix_tasks_user_id_updated_at index")
+
+            _ensure_task_ids_not_reused(conn, inspector.get_table_names())
+            _ensure_search_index(conn, columns, inspector.get_table_names())
+
+        if 'users' in inspector.get_table_names():
+            _ensure_email_lower_index(conn)
+
         print("✓ Migrations complete")
+
+
+def _ensure_email_lower_index(conn):
+    """
+    Unique index on lower(email): case-insensitive login lookups, and the
+    constraint register relies on (INSERT ... ON CONFLICT DO NOTHING).
+
+    Accounts registered before emails were normalized may differ only in
+    case; they are listed and MigrationError is raised rather than creating
+    the index without uniqueness.
+    """
+    # Expression indexes are not reflected by every dialect, so read the DDL
+    if engine.dialect.name == "postgresql":
+        definition = conn.execute(text(
+            "SELECT indexdef FROM pg_indexes WHERE indexname = 'ix_users_email_lower'"
+        )).scalar()
+    else:
+        definition = conn.execute(text(
+            "SELECT sql FROM sqlite_master WHERE type = 'index' AND name = 'ix_users_email_lower'"
+        )).scalar()
+    if definition is not None and "UNIQUE" in definition.upper():
+        return
+
+    duplicates = conn.execute(text(
+        "SELECT lower(email), count(*) FROM users GROUP BY lower(email) HAVING count(*) > 1"
+    )).all()
+    if duplicates:
+        listing = ", ".join(f"{email} ({count} accounts)" for email, count in duplicates)
+        raise MigrationError(
+            f"Cannot make emails case-insensitively unique: {len(duplicates)} address(es) are "
+            f"shared by accounts differing only in case: {listing}. Merge or rename them, then restart."
+        )
+
+    print("Adding unique lower(email) index to users table...")
+    if definition is not None:
+        # Left non-unique by an earlier version of this migration
+        conn.execute(text("DROP INDEX ix_users_email_lower"))
+    conn.execute(text(
+        "CREATE UNIQUE INDEX ix_users_email_lower ON users (lower(email))"
+    ))
+    conn.commit()
+    print("✓ Added ix_users_email_lower index")
+
+
+def _ensure_task_ids_not_reused(conn, table_names):
+    """
+    SQLite: rebuild tasks with AUTOINCREMENT IDs.
+
+    Without it SQLite hands out max(id) + 1, so once the newest tasks are
+    deleted or archived their IDs are given to new tasks, clashing with
+    tasks_archive rows and tombstones. Tables created by create_all already
+    have it (Task.__table_args__).
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    table_sql = conn.execute(text(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'tasks'"
+    )).scalar()
+    if "AUTOINCREMENT" in table_sql.upper():
+        return
+
+    print("Rebuilding tasks table with AUTOINCREMENT IDs...")
+    for trigger in ("tasks_fts_ai", "tasks_fts_ad", "tasks_fts_au"):
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+    conn.execute(text("ALTER TABLE tasks RENAME TO tasks_old"))
+    old_indexes = conn.execute(text(
+        "SELECT name FROM sqlite_master "
+        "WHERE type = 'index' AND tbl_name = 'tasks_old' AND sql IS NOT NULL"
+    )).scalars().all()
+    for index in old_indexes:
+        conn.execute(text(f'DROP INDEX "{index}"'))
+    Task.__table__.create(conn)
+    columns = ", ".join(column.name for column in Task.__table__.columns)
+    conn.execute(text(f"INSERT INTO tasks ({columns}) SELECT {columns} FROM tasks_old"))
+    conn.execute(text("DROP TABLE tasks_old"))
+
+    # Continue numbering after every ID ever handed out, archived and deleted ones included
+    last_id = conn.execute(text(
+        "SELECT max(id) FROM ("
+        "SELECT max(id) AS id FROM tasks "
+        "UNION ALL SELECT max(id) FROM tasks_archive "
+        "UNION ALL SELECT max(task_id) FROM task_tombstones)"
+    )).scalar() or 0
+    conn.execute(text("DELETE FROM sqlite_sequence WHERE name = 'tasks'"))
+    conn.execute(text("INSERT INTO sqlite_sequence (name, seq) VALUES ('tasks', :seq)"), {"seq": last_id})
+
+    if 'tasks_fts' in table_names:
+        _create_fts_triggers(conn)
+    conn.commit()
+    print(f"✓ Rebuilt tasks table (next ID {last_id + 1})")
+
+
+def _ensure_search_index(conn, columns, table_names):
+    """Create the full-text search structures used by TaskService.search_tasks."""
+    dialect = engine.dialect.name
+
+    if dialect == "postgresql" and 'search_vector' not in columns:
+        print("Adding search_vector column to tasks table...")
+        conn.execute(text(
+            "ALTER TABLE tasks ADD COLUMN search_vector tsvector "
+            "GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(description, '')), 'B')"
+            ") STORED"
+        ))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_tasks_search_vector "
+            "ON tasks USING GIN (search_vector)"
+        ))
+        conn.commit()
+        print("✓ Added search_vector column and GIN index")
+
+    elif dialect == "sqlite" and 'tasks_fts' not in table_names:
+        print("Creating tasks_fts full-text index...")
+        conn.execute(text(
+            "CREATE VIRTUAL TABLE tasks_fts USING fts5("
+            "title, description, content='tasks', content_rowid='id', "
+            "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        ))
+        _create_fts_triggers(conn)
+        conn.execute(text("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')"))
+        conn.commit()
+        print("✓ Created tasks_fts full-text index")
+
+
+def _create_fts_triggers(conn):
+    """Keep the external-content tasks_fts index in sync with the tasks table."""
+    conn.execute(text(
+        "CREATE TRIGGER tasks_fts_ai AFTER INSERT ON tasks BEGIN "
+        "INSERT INTO tasks_fts(rowid, title, description) "
+        "VALUES (new.id, new.title, new.description); END"
+    ))
+    conn.execute(text(
+        "CREATE TRIGGER tasks_fts_ad AFTER DELETE ON tasks BEGIN "
+        "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+        "VALUES ('delete', old.id, old.title, old.description); END"
+    ))
+    conn.execute(text(
+        "CREATE TRIGGER tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN "
+        "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+        "VALUES ('delete', old.id, old.title, old.description); "
+        "INSERT INTO tasks_fts(rowid, title, description) "
+        "VALUES (new.id, new.title, new.description); END"
+    ))
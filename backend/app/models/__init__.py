@@ -1,12 +1,15 @@
 from .user import User, UserCreate, UserResponse
-from .task import Task, TaskCreate, TaskUpdate, TaskResponse
+from .task import Task, TaskArchive, TaskTombstone, TaskCreate, TaskUpdate, TaskResponse, TaskChanges
 
 __all__ = [
     "User",
     "UserCreate",
     "UserResponse",
     "Task",
+    "TaskArchive",
+    "TaskTombstone",
     "TaskCreate",
     "TaskUpdate",
     "TaskResponse",
+    "TaskChanges",
 ]
@@ -1,5 +1,5 @@
 from sqlmodel import SQLModel, Field, Column
-from sqlalchemy import JSON
+from sqlalchemy import JSON, Index
 from typing import Optional, List
 from datetime import datetime, date
 import uuid
@@ -8,6 +8,12 @@ import uuid
 class Task(SQLModel, table=True):
     """Task model for todo items."""
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Serves delta sync: WHERE user_id = ? AND updated_at > ?
+        Index("ix_tasks_user_id_updated_at", "user_id", "updated_at"),
+        # SQLite: never reuse the IDs of deleted or archived tasks
+        {"sqlite_autoincrement": True},
+    )
 
     id: Optional[int] = Field(
         default=None,
@@ -49,6 +55,81 @@ class Task(SQLModel, table=True):
     )
 
 
+class TaskArchive(SQLModel, table=True):
+    """Completed task moved out of `tasks` by the archival job (same columns, same ID)."""
+    __tablename__ = "tasks_archive"
+    __table_args__ = (
+        # Serves include_archived listings: WHERE user_id = ? ORDER BY created_at DESC
+        Index("ix_tasks_archive_user_id_created_at", "user_id", "created_at"),
+    )
+
+    id: int = Field(
+        primary_key=True,
+        sa_column_kwargs={"autoincrement": False}
+    )
+    user_id: uuid.UUID = Field(
+        foreign_key="users.id",
+        nullable=False
+    )
+    title: str = Field(
+        max_length=200,
+        nullable=False
+    )
+    description: Optional[str] = Field(
+        default=None
+    )
+    completed: bool = Field(
+        default=True,
+        nullable=False
+    )
+    due_date: Optional[date] = Field(
+        default=None,
+        nullable=True
+    )
+    tags: List[str] = Field(
+        default_factory=list,
+        sa_column=Column(JSON)
+    )
+    created_at: datetime = Field(
+        nullable=False
+    )
+    updated_at: datetime = Field(
+        nullable=False
+    )
+    archived_at: datetime = Field(
+        default_factory=datetime.utcnow,
+        nullable=False
+    )
+
+    @property
+    def archived(self) -> bool:
+        return True
+
+
+class TaskTombstone(SQLModel, table=True):
+    """Record of a deleted task, kept so sync clients can drop it locally."""
+    __tablename__ = "task_tombstones"
+    __table_args__ = (
+        Index("ix_task_tombstones_user_id_deleted_at", "user_id", "deleted_at"),
+    )
+
+    id: Optional[int] = Field(
+        default=None,
+        primary_key=True
+    )
+    task_id: int = Field(
+        nullable=False
+    )
+    user_id: uuid.UUID = Field(
+        nullable=False
+    )
+    deleted_at: datetime = Field(
+        default_factory=datetime.utcnow,
+        nullable=False,
+        index=True
+    )
+
+
 class TaskCreate(SQLModel):
     """Schema for creating a task."""
     title: str = Field(min_length=1, max_length=200)
@@ -87,3 +168,12 @@ class TaskResponse(SQLModel):
     tags: List[str]
     created_at: datetime
     updated_at: datetime
+    archived: bool = False  # archived tasks are read-only
+
+
+class TaskChanges(SQLModel):
+    """Schema for a delta sync response."""
+    tasks: List[TaskResponse]
+    deleted: List[int]
+    cursor: int
+    reset: bool
@@ -1,4 +1,5 @@
 from sqlmodel import SQLModel, Field
+from sqlalchemy import Index, text
 from typing import Optional
 from datetime import datetime
 from pydantic import EmailStr
@@ -8,6 +9,10 @@ import uuid
 class User(SQLModel, table=True):
     """User model for authentication."""
     __tablename__ = "users"
+    __table_args__ = (
+        # Case-insensitive uniqueness; login looks users up by lower(email)
+        Index("ix_users_email_lower", text("lower(email)"), unique=True),
+    )
 
     id: uuid.UUID = Field(
         default_factory=uuid.uuid4,
@@ -1,29 +1,26 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
+from fastapi.concurrency import run_in_threadpool
+from sqlmodel import Session, select, func
 from typing import Annotated
 from ..database import get_session
 from ..models.user import User, UserCreate, UserResponse
-from ..services.auth_service import hash_password, verify_password, create_access_token
+from ..services.auth_service import (
+    create_access_token,
+    hash_password_async,
+    insert_user,
+    normalize_email,
+    verify_password_async,
+)
 
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 
 
 @router.post("/register", response_model=dict, status_code=status.HTTP_201_CREATED)
-def register(
+async def register(
     user_data: UserCreate,
     session: Annotated[Session, Depends(get_session)]
 ):
     """Register a new user."""
-    # Check if email already exists
-    statement = select(User).where(User.email == user_data.email)
-    existing_user = session.exec(statement).first()
-
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Email already registered"
-        )
-
     # Validate password length
     if len(user_data.password) < 8:
         raise HTTPException(
@@ -31,16 +28,18 @@ def register(
             detail="Password must be at least 8 characters"
         )
 
-    # Create user
+    # Create user (a single INSERT; an existing email inserts nothing)
     user = User(
-        email=user_data.email,
+        email=normalize_email(user_data.email),
         name=user_data.name,
-        password_hash=hash_password(user_data.password)
+        password_hash=await hash_password_async(user_data.password)
     )
 
-    session.add(user)
-    session.commit()
-    session.refresh(user)
+    if not await run_in_threadpool(insert_user, session, user):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Email already registered"
+        )
 
     # Generate token
     token = create_access_token(user.id, user.email)
@@ -57,16 +56,16 @@ def register(
 
 
 @router.post("/login", response_model=dict)
-def login(
+async def login(
     user_data: UserCreate,
     session: Annotated[Session, Depends(get_session)]
 ):
     """Login user and return JWT token."""
-    # Find user by email
-    statement = select(User).where(User.email == user_data.email)
-    user = session.exec(statement).first()
+    # Find user by email (served by the lower(email) index)
+    statement = select(User).where(func.lower(User.email) == normalize_email(user_data.email))
+    user = await run_in_threadpool(lambda: session.exec(statement).first())
 
-    if not user or not verify_password(user_data.password, user.password_hash):
+    if not user or not await verify_password_async(user_data.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Path
+from fastapi.responses import StreamingResponse
 from sqlmodel import Session
-from typing import Annotated
+from typing import Annotated, Any, Dict, Iterator, Tuple
+import json
 import uuid
 from ..database import get_session
 from ..models.user import User
@@ -59,3 +61,34 @@ def send_chat_message(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to process chat message"
         )
+
+
+@router.post("/message/stream")
+def stream_chat_message(
+    user_id: Annotated[uuid.UUID, Path()],
+    message: ChatMessage,
+    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[Session, Depends(get_session)]
+):
+    """
+    Send a message to the AI chatbot and follow its progress as Server-Sent Events.
+
+    Emits `interpreting` immediately, `executing` (`{"actions": [...]}`) as
+    soon as the model has chosen its actions, then one `result` event with the same
+    `message` / `actions_performed` body as POST /message, and closes.
+    """
+    verify_user_access(user_id, current_user)
+
+    # Only needed to authenticate; the stream opens its own session
+    session.close()
+
+    return StreamingResponse(
+        _encode_events(ChatbotService.stream_message(message.text, user_id)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _encode_events(events: Iterator[Tuple[str, Dict[str, Any]]]) -> Iterator[str]:
+    for event, data in events:
+        yield f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
@@ -1,12 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Path
+from fastapi import APIRouter, Depends, HTTPException, status, Path, Query, Header
+from fastapi.responses import Response, StreamingResponse
+from pydantic import TypeAdapter
 from sqlmodel import Session
-from typing import Annotated, List
+from typing import Annotated, List, Optional
 import uuid
-from ..database import get_session
+from ..database import get_session, get_read_session
 from ..models.user import User
-from ..models.task import Task, TaskCreate, TaskUpdate, TaskResponse
-from ..middleware.auth import get_current_user
+from ..models.task import Task, TaskCreate, TaskUpdate, TaskResponse, TaskChanges
+from ..middleware.auth import get_current_user, get_current_reader
 from ..services.task_service import TaskService
+from ..services.task_events import task_events
+from ..services.single_flight import task_list_reads
 
 router = APIRouter(prefix="/api/{user_id}/tasks", tags=["Tasks"])
 
@@ -20,25 +24,117 @@ def verify_user_access(user_id: uuid.UUID, current_user: User):
         )
 
 
+def _task_not_found(session: Session, task_id: int, user_id: uuid.UUID) -> HTTPException:
+    """404, or 409 if the task was archived (archived tasks are read-only)."""
+    if TaskService.get_archived_task(session, task_id, user_id) is not None:
+        return HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Task is archived and read-only"
+        )
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Task not found"
+    )
+
+
+_TASK_LIST = TypeAdapter(List[TaskResponse])
+
+
+def _task_list_body(tasks: List[Task]) -> bytes:
+    items = _TASK_LIST.dump_json([TaskResponse.model_validate(task) for task in tasks])
+    return b'{"tasks":%b,"total":%d,"limit":100,"offset":0}' % (items, len(tasks))
+
+
 @router.get("/", response_model=dict)
 def get_tasks(
     user_id: Annotated[uuid.UUID, Path()],
-    current_user: Annotated[User, Depends(get_current_user)],
-    session: Annotated[Session, Depends(get_session)]
+    current_user: Annotated[User, Depends(get_current_reader)],
+    session: Annotated[Session, Depends(get_read_session)],
+    include_archived: bool = False
 ):
-    """Get all tasks for the authenticated user."""
+    """Get all tasks for the authenticated user (`include_archived=true` adds archived completed tasks)."""
     verify_user_access(user_id, current_user)
 
-    tasks = TaskService.get_all_tasks(session, user_id)
+    # Return the connection used to authenticate: requests that end up waiting
+    # for a shared query must not hold one. The session reconnects if it runs
+    # the query itself.
+    session.close()
+
+    # Concurrent identical requests share one query and one serialized body
+    body = task_list_reads.run(user_id, (include_archived,), lambda: _task_list_body(
+        TaskService.get_all_tasks(session, user_id, include_archived)
+    ))
+    return Response(content=body, media_type="application/json")
+
+
+@router.get("/search", response_model=dict)
+def search_tasks(
+    user_id: Annotated[uuid.UUID, Path()],
+    q: Annotated[str, Query(min_length=1, max_length=200)],
+    current_user: Annotated[User, Depends(get_current_reader)],
+    session: Annotated[Session, Depends(get_read_session)],
+    limit: Annotated[int, Query(ge=1, le=100)] = 20
+):
+    """Search task titles and descriptions (prefix matching, ranked by relevance)."""
+    verify_user_access(user_id, current_user)
+
+    tasks = TaskService.search_tasks(session, user_id, q, limit)
 
     return {
         "tasks": [TaskResponse.model_validate(task) for task in tasks],
         "total": len(tasks),
-        "limit": 100,
-        "offset": 0
+        "query": q,
+        "limit": limit
     }
 
 
+@router.get("/changes", response_model=TaskChanges)
+def get_task_changes(
+    user_id: Annotated[uuid.UUID, Path()],
+    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[Session, Depends(get_session)],
+    since: Annotated[Optional[int], Query(ge=0)] = None
+):
+    """
+    Delta sync: tasks changed and IDs deleted since a cursor.
+
+    Pass the `cursor` from the previous response as `since`. A response with
+    `reset: true` contains every task and replaces the client's local copy.
+    """
+    verify_user_access(user_id, current_user)
+
+    return TaskService.get_changes(session, user_id, since)
+
+
+@router.get("/events")
+async def stream_task_events(
+    user_id: Annotated[uuid.UUID, Path()],
+    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[Session, Depends(get_session)],
+    last_event_id: Annotated[Optional[str], Header()] = None
+):
+    """
+    Server-Sent Events stream of task changes for the authenticated user.
+
+    Emits `task.created`, `task.updated`, `task.toggled` (task payload) and
+    `task.deleted` (`{"id": ...}`) as they are committed. Reconnecting with
+    `Last-Event-ID` replays missed events; a `resync` event means they could
+    not be recovered and the client should refetch its task list.
+    """
+    verify_user_access(user_id, current_user)
+
+    # The session was only needed to authenticate; don't hold a pooled
+    # connection for the lifetime of the stream.
+    session.close()
+
+    subscription = task_events.subscribe(user_id, last_event_id)
+    return StreamingResponse(
+        task_events.stream(subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
 def create_task(
     user_id: Annotated[uuid.UUID, Path()],
@@ -57,13 +153,16 @@ def create_task(
 def get_task(
     user_id: Annotated[uuid.UUID, Path()],
     task_id: int,
-    current_user: Annotated[User, Depends(get_current_user)],
-    session: Annotated[Session, Depends(get_session)]
+    current_user: Annotated[User, Depends(get_current_reader)],
+    session: Annotated[Session, Depends(get_read_session)]
 ):
     """Get a specific task by ID."""
     verify_user_access(user_id, current_user)
 
     task = TaskService.get_task_by_id(session, task_id, user_id)
+    if not task:
+        # Archived tasks can still be read (with archived: true)
+        task = TaskService.get_archived_task(session, task_id, user_id)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -92,10 +191,7 @@ def update_task_full(
 
     task = TaskService.update_task(session, task_id, task_update, user_id)
     if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Task not found"
-        )
+        raise _task_not_found(session, task_id, user_id)
 
     return TaskResponse.model_validate(task)
 
@@ -113,10 +209,7 @@ def update_task_partial(
 
     task = TaskService.update_task(session, task_id, task_update, user_id)
     if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Task not found"
-        )
+        raise _task_not_found(session, task_id, user_id)
 
     return TaskResponse.model_validate(task)
 
@@ -133,10 +226,7 @@ def toggle_task_complete(
 
     task = TaskService.toggle_complete(session, task_id, user_id)
     if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Task not found"
-        )
+        raise _task_not_found(session, task_id, user_id)
 
     return TaskResponse.model_validate(task)
 
@@ -153,9 +243,6 @@ def delete_task(
 
     success = TaskService.delete_task(session, task_id, user_id)
     if not success:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Task not found"
-        )
+        raise _task_not_found(session, task_id, user_id)
 
     return None
@@ -5,6 +5,8 @@ from .auth_service import (
     verify_token,
 )
 from .task_service import TaskService
+from .task_events import task_events
+from .task_archive import task_archiver
 
 __all__ = [
     "hash_password",
@@ -12,4 +14,6 @@ __all__ = [
     "create_access_token",
     "verify_token",
     "TaskService",
+    "task_events",
+    "task_archiver",
 ]
@@ -1,9 +1,24 @@
+import asyncio
 import bcrypt
+from concurrent.futures import ThreadPoolExecutor
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
 from typing import Optional
 import uuid
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session
 from ..config import settings
+from ..database import pin_to_primary
+from ..models.user import User
+
+# bcrypt runs here rather than on the request worker threads, so a burst of
+# logins cannot use up the threads that serve every other route
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.AUTH_HASH_WORKERS,
+    thread_name_prefix="bcrypt",
+)
 
 
 def hash_password(password: str) -> str:
@@ -21,6 +36,51 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(password_bytes, hashed_bytes)
 
 
+async def hash_password_async(password: str) -> str:
+    """hash_password() on the dedicated bcrypt thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password() on the dedicated bcrypt thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, verify_password, plain_password, hashed_password)
+
+
+def normalize_email(email: str) -> str:
+    """Canonical form of an email address, as stored and looked up."""
+    return email.strip().lower()
+
+
+def insert_user(session: Session, user: User) -> bool:
+    """
+    Insert a new user in one statement and commit.
+
+    Uses INSERT ... ON CONFLICT DO NOTHING RETURNING on PostgreSQL and
+    SQLite, so a duplicate email (including one registered concurrently)
+    inserts nothing instead of raising. Returns False if the email is taken.
+    """
+    values = user.model_dump()
+    dialect = session.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        statement = dialect_insert(User).values(**values).on_conflict_do_nothing().returning(User.id)
+        inserted = session.execute(statement).first() is not None
+    else:
+        try:
+            session.execute(insert(User).values(**values))
+            inserted = True
+        except IntegrityError:
+            inserted = False
+    if inserted:
+        session.commit()
+        pin_to_primary(user.id)
+    else:
+        session.rollback()
+    return inserted
+
+
 def create_access_token(user_id: uuid.UUID, email: str) -> str:
     """Create a JWT access token."""
     expires_delta = timedelta(days=settings.JWT_EXPIRATION_DAYS)
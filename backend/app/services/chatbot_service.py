@@ -1,191 +1,87 @@
-import google.generativeai as genai
+from sqlalchemy import Engine
 from sqlmodel import Session
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+import itertools
 import json
+import threading
 import uuid
 from datetime import datetime, date
-from ..config import settings
+from ..database import engine, read_engine_for
 from ..models.user import User
 from ..models.task import TaskCreate, TaskUpdate
 from .task_service import TaskService
+from .llm_provider import get_llm_provider
+
+# Actions executed per chat message; the rest are reported as skipped
+MAX_CHAT_ACTIONS = 10
+
+_parse_lock = threading.Lock()
+_parse_counts = {"parsed": 0, "parse_failures": 0}
+
+
+def _count_parse(failed: bool) -> None:
+    with _parse_lock:
+        _parse_counts["parse_failures" if failed else "parsed"] += 1
+
+
+def chat_stats() -> Dict[str, int]:
+    """Interpreter response parse counters for GET /api/metrics."""
+    with _parse_lock:
+        return dict(_parse_counts)
 
 
 class ChatbotService:
-    """Service for handling AI chatbot interactions using Google Gemini (headless interpreter mode)."""
+    """Service for handling AI chatbot interactions (headless interpreter mode).
 
-    @staticmethod
-    def _get_headless_prompt() -> str:
-        """Get the headless command interpreter system prompt."""
-        current_date = datetime.now().date()
-        current_year = current_date.year
-
-        return f"""Role:
-You are a headless command interpreter for a Todo application.
-Current date: {current_date.isoformat()} (format: YYYY-MM-DD, example: 2025-12-13)
-Current year: {current_year}
-
-CRITICAL ACTION DETECTION RULES (apply in order):
-
-1. DELETE_TASK - If input contains "delete", "remove", "get rid" + "task" + number
-   - Extract task_id from number after "task"
-   - Example: "delete task 5" → {{"action": "delete_task", "data": {{"task_id": 5}}}}
-   - Example: "remove task 10" → {{"action": "delete_task", "data": {{"task_id": 10}}}}
-
-2. TOGGLE_COMPLETE - If input contains "mark", "complete", "done", "finish" + "task" + number
-   - Extract task_id from number after "task"
-   - Example: "mark task 3 as done" → {{"action": "toggle_complete", "data": {{"task_id": 3}}}}
-   - Example: "complete task 7" → {{"action": "toggle_complete", "data": {{"task_id": 7}}}}
-
-3. UPDATE_TASK - If input contains "update", "change", "modify", "edit" + "task" + number
-   - Extract task_id from number after "task"
-   - Extract field to update: title, description, due_date, or tags
-   - Example: "update task 5 title to New Title" → {{"action": "update_task", "data": {{"task_id": 5, "updates": {{"title": "New Title"}}}}}}
-   - Example: "change task 2 description to Updated" → {{"action": "update_task", "data": {{"task_id": 2, "updates": {{"description": "Updated"}}}}}}
-
-4. LIST_TASKS - If input contains "show", "list", "display", "what" + "task" (no specific number)
-   - Detect filter: "completed", "incomplete", or default "all"
-   - Example: "show my tasks" → {{"action": "list_tasks", "data": {{"filter": "all"}}}}
-   - Example: "show completed tasks" → {{"action": "list_tasks", "data": {{"filter": "completed"}}}}
-   - Example: "list incomplete tasks" → {{"action": "list_tasks", "data": {{"filter": "incomplete"}}}}
-
-5. CREATE_TASK - If input contains "add", "create", "new" + "task" OR none of the above keywords
-   - Extract task text, due_date, and tags
-   - Example: "add task buy milk" → {{"action": "create_task", "data": {{"text": "buy milk", "due_date": null, "tags": []}}}}
-
-TASK ID EXTRACTION:
-- Look for number immediately after word "task"
-- "task 5" → task_id: 5
-- "task 123" → task_id: 123
-- Task IDs start from 1 and increment
-
-DATE EXTRACTION (for create_task only):
-- Formats: YYYY-MM-DD, Month DD YYYY, DD/MM/YYYY
-- If year missing, use {current_year}
-- Normalize to YYYY-MM-DD
-- If no date found, set to null
-
-TAG EXTRACTION (for create_task only):
-- Tags start with # followed by alphanumeric
-- Space-separated: "#tag1 #tag2"
-- Remove # in output
-- If no tags found, set to []
-
-General Rules:
-- Return ONLY a JSON object
-- No markdown, no explanations
-- Preserve exact text/casing/typos
-- If unclear, return {{"error":"invalid_request"}}
-
-Output Schemas:
-
-1. CREATE_TASK:
-{{
-  "action": "create_task",
-  "data": {{
-    "text": "string",
-    "due_date": "YYYY-MM-DD or null",
-    "tags": ["array of strings"]
-  }}
-}}
-
-2. LIST_TASKS:
-{{
-  "action": "list_tasks",
-  "data": {{
-    "filter": "all" or "completed" or "incomplete"
-  }}
-}}
-
-3. UPDATE_TASK:
-{{
-  "action": "update_task",
-  "data": {{
-    "task_id": number,
-    "updates": {{
-      "title": "string (optional)",
-      "description": "string (optional)",
-      "due_date": "YYYY-MM-DD or null (optional)",
-      "tags": ["array of strings (optional)"]
-    }}
-  }}
-}}
-
-4. TOGGLE_COMPLETE:
-{{
-  "action": "toggle_complete",
-  "data": {{
-    "task_id": number
-  }}
-}}
-
-5. DELETE_TASK:
-{{
-  "action": "delete_task",
-  "data": {{
-    "task_id": number
-  }}
-}}
-
-Error Response:
-{{
-  "error": "invalid_request"
-}}
-
-EXAMPLES (use these as reference):
-
-Input: "delete task 5"
-Output: {{"action": "delete_task", "data": {{"task_id": 5}}}}
-
-Input: "remove task 10"
-Output: {{"action": "delete_task", "data": {{"task_id": 10}}}}
-
-Input: "mark task 3 as done"
-Output: {{"action": "toggle_complete", "data": {{"task_id": 3}}}}
-
-Input: "complete task 7"
-Output: {{"action": "toggle_complete", "data": {{"task_id": 7}}}}
-
-Input: "update task 5 title to Buy groceries"
-Output: {{"action": "update_task", "data": {{"task_id": 5, "updates": {{"title": "Buy groceries"}}}}}}
-
-Input: "change task 2 description to Updated description"
-Output: {{"action": "update_task", "data": {{"task_id": 2, "updates": {{"description": "Updated description"}}}}}}
-
-Input: "show my tasks"
-Output: {{"action": "list_tasks", "data": {{"filter": "all"}}}}
-
-Input: "list completed tasks"
-Output: {{"action": "list_tasks", "data": {{"filter": "completed"}}}}
-
-Input: "add task buy milk"
-Output: {{"action": "create_task", "data": {{"text": "buy milk", "due_date": null, "tags": []}}}}
-
-Input: "create task finish report #work 2025-12-20"
-Output: {{"action": "create_task", "data": {{"text": "finish report", "due_date": "2025-12-20", "tags": ["work"]}}}}"""
+    The model behind the interpreter is pluggable, see llm_provider.py.
+    """
 
     @staticmethod
-    def _get_gemini_model():
-        """Initialize and return Gemini model for headless mode."""
-        genai.configure(api_key=settings.GEMINI_API_KEY)
-
-        generation_config = {
-            "temperature": 0.1,  # Low temperature for consistent parsing
-            "max_output_tokens": 500,
-        }
+    def _get_headless_prompt() -> str:
+        """
+        Get the headless command interpreter system prompt.
 
-        model = genai.GenerativeModel(
-            model_name=settings.GEMINI_MODEL,
-            generation_config=generation_config,
-            system_instruction=ChatbotService._get_headless_prompt()
-        )
+        Kept short: it is sent with every message, and models with structured
+        output receive the response shape as a schema (RESPONSE_SCHEMA in
+        command_interpreter.py) instead of prose.
+        """
+        current_date = datetime.now().date()
 
-        return model
+        return f"""You are a headless command interpreter for a Todo app. Today is {current_date.isoformat()}.
+Return ONLY JSON: {{"actions": [...]}} with one action per requested operation, in order (at most 10), or {{"error": "invalid_request"}} if unclear.
+
+Actions (first matching rule wins for each operation):
+1. delete_task {{task_id}}: "delete", "remove", "get rid of" task N
+2. toggle_complete {{task_id}}: "mark", "complete", "done", "finish" task N
+3. update_task {{task_id, updates: {{title?, description?, due_date?, tags?}}}}: "update", "change", "modify", "edit" task N
+4. list_tasks {{filter: "all" | "completed" | "incomplete"}}: "show", "list", "display", "what" tasks, no task number
+5. create_task {{text, due_date, tags}}: "add", "create", "new" task, or anything else
+
+Rules:
+- task_id is the number after "task"; "tasks 3, 5 and 7" means one action per ID
+- Items listed for adding ("milk, eggs and bread") are one create_task each, sharing tags and due date
+- due_date: YYYY-MM-DD or null; read YYYY-MM-DD, Month DD [YYYY] and DD/MM/YYYY; missing year means {current_date.year}
+- tags: words after #, without the #; [] if none
+- text: the task without command words, tags or date; keep exact casing and typos
+
+Examples:
+"add milk, eggs and bread #shopping" -> {{"actions": [{{"action": "create_task", "data": {{"text": "milk", "due_date": null, "tags": ["shopping"]}}}}, {{"action": "create_task", "data": {{"text": "eggs", "due_date": null, "tags": ["shopping"]}}}}, {{"action": "create_task", "data": {{"text": "bread", "due_date": null, "tags": ["shopping"]}}}}]}}
+"create task finish report #work 2025-12-20" -> {{"actions": [{{"action": "create_task", "data": {{"text": "finish report", "due_date": "2025-12-20", "tags": ["work"]}}}}]}}
+"complete task 3 and delete task 4" -> {{"actions": [{{"action": "toggle_complete", "data": {{"task_id": 3}}}}, {{"action": "delete_task", "data": {{"task_id": 4}}}}]}}
+"change task 2 title to Buy groceries" -> {{"actions": [{{"action": "update_task", "data": {{"task_id": 2, "updates": {{"title": "Buy groceries"}}}}}}]}}
+"show incomplete tasks" -> {{"actions": [{{"action": "list_tasks", "data": {{"filter": "incomplete"}}}}]}}"""
 
     @staticmethod
     def _parse_json_response(response_text: str) -> Dict[str, Any]:
-        """Parse JSON from Gemini response, handling potential markdown wrapping."""
+        """
+        Parse the interpreter's JSON response.
+
+        In JSON output mode the text is the object itself; markdown code
+        fences (free-form models) are only stripped if that fails.
+        """
         try:
-            # Remove markdown code blocks if present
+            parsed = json.loads(response_text)
+        except json.JSONDecodeError:
             text = response_text.strip()
             if text.startswith("```json"):
                 text = text[7:]
@@ -193,57 +89,66 @@ Output: {{"action": "create_task", "data": {{"text": "finish report", "due_date"
                 text = text[3:]
             if text.endswith("```"):
                 text = text[:-3]
-
-            text = text.strip()
-            return json.loads(text)
-        except json.JSONDecodeError as e:
-            print(f"JSON parse error: {e}, Response: {response_text}")
+            try:
+                parsed = json.loads(text)
+            except json.JSONDecodeError as e:
+                _count_parse(failed=True)
+                print(f"JSON parse error: {e} ({len(response_text)} characters)")
+                return {"error": "invalid_request"}
+
+        if not isinstance(parsed, dict):
+            _count_parse(failed=True)
             return {"error": "invalid_request"}
+        _count_parse(failed=False)
+        return parsed
 
     @staticmethod
-    def _execute_create_task(
+    def _execute_create_tasks(
         session: Session,
-        data: Dict[str, Any],
+        data_list: List[Dict[str, Any]],
         user_id: uuid.UUID
-    ) -> Dict[str, Any]:
-        """Execute create_task action."""
-        try:
-            # Parse due_date from string to date object
-            due_date = None
-            if data.get("due_date"):
-                try:
-                    due_date = datetime.strptime(data["due_date"], "%Y-%m-%d").date()
-                except ValueError:
-                    due_date = None
-
-            # Create task
-            task_data = TaskCreate(
-                title=data["text"],
-                description=None,
-                due_date=due_date,
-                tags=data.get("tags", [])
-            )
-
-            task = TaskService.create_task(session, task_data, user_id)
-
-            return {
-                "success": True,
-                "task": {
-                    "id": task.id,
-                    "title": task.title,
-                    "due_date": task.due_date.isoformat() if task.due_date else None,
-                    "tags": task.tags,
-                    "completed": task.completed
-                },
-                "message": f"✓ Created task ID {task.id}"
-            }
+    ) -> List[Dict[str, Any]]:
+        """Execute consecutive create_task actions with one bulk insert (not committed)."""
+        results: List[Optional[Dict[str, Any]]] = [None] * len(data_list)
+        valid = []
+        for index, data in enumerate(data_list):
+            try:
+                # Parse due_date from string to date object
+                due_date = None
+                if data.get("due_date"):
+                    try:
+                        due_date = datetime.strptime(data["due_date"], "%Y-%m-%d").date()
+                    except ValueError:
+                        due_date = None
+
+                valid.append((index, TaskCreate(
+                    title=data["text"],
+                    description=None,
+                    due_date=due_date,
+                    tags=data.get("tags", [])
+                )))
+            except Exception as e:
+                print(f"Error creating task: {e}")
+                results[index] = {
+                    "success": False,
+                    "message": f"Error: {str(e)}"
+                }
 
-        except Exception as e:
-            print(f"Error creating task: {e}")
-            return {
-                "success": False,
-                "message": f"Error: {str(e)}"
-            }
+        if valid:
+            tasks = TaskService.create_tasks(session, [task_data for _, task_data in valid], user_id, commit=False)
+            for (index, _), task in zip(valid, tasks):
+                results[index] = {
+                    "success": True,
+                    "task": {
+                        "id": task.id,
+                        "title": task.title,
+                        "due_date": task.due_date.isoformat() if task.due_date else None,
+                        "tags": task.tags,
+                        "completed": task.completed
+                    },
+                    "message": f"✓ Created task ID {task.id}"
+                }
+        return results
 
     @staticmethod
     def _execute_list_tasks(
@@ -333,7 +238,7 @@ Output: {{"action": "create_task", "data": {{"text": "finish report", "due_date"
             task_update = TaskUpdate(**updates)
 
             # Update task
-            task = TaskService.update_task(session, task_id, task_update, user_id)
+            task = TaskService.update_task(session, task_id, task_update, user_id, commit=False)
 
             if not task:
                 return {
@@ -375,7 +280,7 @@ Output: {{"action": "create_task", "data": {{"text": "finish report", "due_date"
                 }
 
             # Toggle completion
-            task = TaskService.toggle_complete(session, task_id, user_id)
+            task = TaskService.toggle_complete(session, task_id, user_id, commit=False)
 
             if not task:
                 return {
@@ -418,7 +323,7 @@ Output: {{"action": "create_task", "data": {{"text": "finish report", "due_date"
                 }
 
             # Delete task
-            success = TaskService.delete_task(session, task_id, user_id)
+            success = TaskService.delete_task(session, task_id, user_id, commit=False)
 
             if not success:
                 return {
@@ -458,57 +363,196 @@ Output: {{"action": "create_task", "data": {{"text": "finish report", "due_date"
             Dictionary with 'message' and optional 'actions_performed'
         """
         try:
-            model = ChatbotService._get_gemini_model()
+            provider = get_llm_provider()
 
-            # Send message to Gemini
-            response = model.generate_content(message)
+            # Send message to the model
+            response_text = provider.generate(ChatbotService._get_headless_prompt(), message)
 
             # Parse JSON response
-            parsed = ChatbotService._parse_json_response(response.text)
+            parsed = ChatbotService._parse_json_response(response_text)
 
-            # Check for error
-            if "error" in parsed:
-                return {
-                    "message": "Invalid request. Please provide a task to create.",
-                    "actions_performed": None
-                }
+            bind = ChatbotService._engine_for(parsed, user_id)
+            if bind is not session.get_bind():
+                with Session(bind) as read_session:
+                    return ChatbotService._execute_actions(read_session, parsed, user_id)
+            return ChatbotService._execute_actions(session, parsed, user_id)
 
-            # Execute action
-            action = parsed.get("action")
-            data = parsed.get("data", {})
-
-            # Route to appropriate action handler
-            if action == "create_task":
-                result = ChatbotService._execute_create_task(session, data, user_id)
-            elif action == "list_tasks":
-                result = ChatbotService._execute_list_tasks(session, data, user_id)
-            elif action == "update_task":
-                result = ChatbotService._execute_update_task(session, data, user_id)
-            elif action == "toggle_complete":
-                result = ChatbotService._execute_toggle_complete(session, data, user_id)
-            elif action == "delete_task":
-                result = ChatbotService._execute_delete_task(session, data, user_id)
-            else:
-                return {
-                    "message": f"Unknown action '{action}'.",
-                    "actions_performed": None
-                }
+        except Exception as e:
+            print(f"Chatbot error: {e}")
+            return {
+                "message": "Sorry, I encountered an error. Please try again.",
+                "actions_performed": None
+            }
 
-            # Return result
-            if result.get("success"):
-                return {
-                    "message": result["message"],
-                    "actions_performed": [result["message"]]
-                }
-            else:
-                return {
-                    "message": result["message"],
-                    "actions_performed": None
-                }
+    @staticmethod
+    def stream_message(message: str, user_id: uuid.UUID) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Process a chat message, reporting progress as it happens.
+
+        The model's response is streamed and the actions run as soon as its
+        JSON object is complete; the rest of the generation is not awaited.
+        Runs in its own database session, so it can outlive the request's.
+
+        Yields:
+            (event, data) pairs: ("interpreting", {}), then
+            ("executing", {"actions": [...]}) once the actions are known, and
+            finally ("result", {"message": ..., "actions_performed": ...})
+        """
+        yield "interpreting", {}
+        try:
+            chunks = get_llm_provider().generate_stream(ChatbotService._get_headless_prompt(), message)
+            try:
+                response_text, json_object = _read_json_object(chunks)
+            finally:
+                close = getattr(chunks, "close", None)
+                if close is not None:
+                    close()
+
+            parsed = ChatbotService._parse_json_response(json_object or response_text)
+
+            actions = ChatbotService._parse_actions(parsed)
+            if actions:
+                yield "executing", {"actions": [action.get("action") for action in actions[:MAX_CHAT_ACTIONS]]}
+            with Session(ChatbotService._engine_for(parsed, user_id)) as session:
+                yield "result", ChatbotService._execute_actions(session, parsed, user_id)
 
         except Exception as e:
             print(f"Chatbot error: {e}")
-            return {
+            yield "result", {
                 "message": "Sorry, I encountered an error. Please try again.",
                 "actions_performed": None
             }
+
+    @staticmethod
+    def _parse_actions(parsed: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """The actions in an interpreter response, or None for an error response."""
+        if "error" in parsed:
+            return None
+        if isinstance(parsed.get("actions"), list):
+            actions = [action for action in parsed["actions"] if isinstance(action, dict)]
+        elif "action" in parsed:
+            # Single-action responses (the previous schema, recorded replays)
+            actions = [parsed]
+        else:
+            return None
+        return actions or None
+
+    @staticmethod
+    def _engine_for(parsed: Dict[str, Any], user_id: uuid.UUID) -> Engine:
+        """Where to run the actions: the read replica if they only list tasks."""
+        actions = ChatbotService._parse_actions(parsed)
+        if actions and all(action.get("action") == "list_tasks" for action in actions[:MAX_CHAT_ACTIONS]):
+            return read_engine_for(user_id)
+        return engine
+
+    @staticmethod
+    def _execute_actions(session: Session, parsed: Dict[str, Any], user_id: uuid.UUID) -> Dict[str, Any]:
+        """
+        Run the actions the model chose in one transaction and build the chat response.
+
+        Actions run in order, consecutive creates as one bulk insert, and
+        everything is committed once at the end. An action that fails (e.g.
+        an unknown task ID) is reported without undoing the others; a
+        database error rolls back all of them.
+        """
+        actions = ChatbotService._parse_actions(parsed)
+        if actions is None:
+            return {
+                "message": "Invalid request. Please provide a task to create.",
+                "actions_performed": None
+            }
+
+        skipped = len(actions) - MAX_CHAT_ACTIONS
+        actions = actions[:MAX_CHAT_ACTIONS]
+
+        results: List[Dict[str, Any]] = []
+        wrote = False
+        try:
+            for is_create, group in itertools.groupby(actions, key=lambda a: a.get("action") == "create_task"):
+                group = list(group)
+                if is_create:
+                    results.extend(ChatbotService._execute_create_tasks(
+                        session, [action.get("data", {}) for action in group], user_id
+                    ))
+                    wrote = True
+                    continue
+
+                for action in group:
+                    name = action.get("action")
+                    data = action.get("data", {})
+                    # Route to appropriate action handler
+                    if name == "list_tasks":
+                        results.append(ChatbotService._execute_list_tasks(session, data, user_id))
+                        continue
+                    if name == "update_task":
+                        result = ChatbotService._execute_update_task(session, data, user_id)
+                    elif name == "toggle_complete":
+                        result = ChatbotService._execute_toggle_complete(session, data, user_id)
+                    elif name == "delete_task":
+                        result = ChatbotService._execute_delete_task(session, data, user_id)
+                    else:
+                        result = {"success": False, "message": f"Unknown action '{name}'."}
+                    results.append(result)
+                    wrote = wrote or result.get("success", False)
+
+            if wrote:
+                TaskService.commit_changes(session, user_id)
+        except Exception as e:
+            session.rollback()
+            print(f"Error executing chat actions: {e}")
+            return {
+                "message": "Sorry, I couldn't save those changes. Nothing was changed.",
+                "actions_performed": None
+            }
+
+        messages = [result["message"] for result in results]
+        if skipped > 0:
+            messages.append(f"Skipped {skipped} more action(s); at most {MAX_CHAT_ACTIONS} per message.")
+        performed = [result["message"] for result in results if result.get("success")]
+        return {
+            "message": "\n".join(messages),
+            "actions_performed": performed or None
+        }
+
+
+def _read_json_object(chunks: Iterable[str]) -> Tuple[str, Optional[str]]:
+    """
+    Consume chunks until the first top-level JSON object closes.
+
+    Braces inside strings are ignored, so the object is detected without
+    parsing. Anything before the object (such as a markdown fence) is skipped.
+
+    Returns:
+        (all text read, the object's text or None if the stream ended first)
+    """
+    parts = []
+    depth = 0
+    in_string = escaped = False
+    start = None  # (chunk index, offset) of the opening brace
+
+    for chunk in chunks:
+        parts.append(chunk)
+        for offset, char in enumerate(chunk):
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == "\\":
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = depth > 0
+            elif char == "{":
+                if depth == 0:
+                    start = (len(parts) - 1, offset)
+                depth += 1
+            elif char == "}" and depth:
+                depth -= 1
+                if depth == 0:
+                    first, begin = start
+                    text = "".join(parts)
+                    head = sum(len(part) for part in parts[:first])
+                    end = len(text) - len(chunk) + offset + 1
+                    return text, text[head + begin:end]
+
+    return "".join(parts), None
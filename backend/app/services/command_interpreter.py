@@ -0,0 +1,203 @@
+"""
+Rule-based command interpreter.
+
+A deterministic, offline implementation of the headless interpreter contract
+described in ChatbotService's system prompt: it turns a chat message into the
+same {"actions": [{"action": ..., "data": ...}, ...]} JSON the model is asked
+to return. Compound messages are split into clauses at "; ", "then" and
+"and" followed by a command verb; "task 3, 5 and 7" targets every listed ID,
+and a comma-separated list of items to add becomes one create per item.
+"""
+import re
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+_TASK_ID_RE = re.compile(r"\btasks?\s*#?(\d+)((?:\s*(?:,|and|&)\s*#?\d+\b)*)", re.IGNORECASE)
+_NUMBER_RE = re.compile(r"\d+")
+_TAG_RE = re.compile(r"#(\w+)")
+
+_DELETE_RE = re.compile(r"\b(delete|remove)\b|\bget rid\b", re.IGNORECASE)
+_TOGGLE_RE = re.compile(r"\b(mark|complete|completed|done|finish|finished)\b", re.IGNORECASE)
+_UPDATE_RE = re.compile(r"\b(update|change|modify|edit|rename)\b", re.IGNORECASE)
+_LIST_RE = re.compile(r"\b(show|list|display|what)\b", re.IGNORECASE)
+
+_UPDATE_FIELD_RE = re.compile(
+    r"\b(title|description|due[ _]date|tags?)\b\s*(?:to\s+|:\s*|=\s*)?(.*)$",
+    re.IGNORECASE | re.DOTALL,
+)
+_UPDATE_TO_RE = re.compile(r"\bto\b\s*(.+)$", re.IGNORECASE | re.DOTALL)
+_CREATE_PREFIX_RE = re.compile(
+    r"^\s*(?:please\s+)?(?:add|create|new)\b\s*(?:a\s+)?(?:new\s+)?(?:task\b\s*)?(?:to\s+)?:?\s*",
+    re.IGNORECASE,
+)
+
+_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+_ISO_DATE_RE = re.compile(r"\b(\d{4})-(\d{1,2})-(\d{1,2})\b")
+_SLASH_DATE_RE = re.compile(r"\b(\d{1,2})/(\d{1,2})/(\d{4})\b")
+_MONTH_DATE_RE = re.compile(
+    r"\b(?:on\s+|by\s+|due\s+)?(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+"
+    r"(\d{1,2})(?:st|nd|rd|th)?(?:,?\s+(\d{4}))?\b",
+    re.IGNORECASE,
+)
+
+_CLAUSE_SPLIT_RE = re.compile(
+    r"\s*(?:;|,?\s+(?:and\s+)?then\s+|,?\s+and\s+(?=(?:delete|remove|mark|complete|finish|update|change|"
+    r"modify|edit|rename|add|create|show|list|display)\b))\s*",
+    re.IGNORECASE,
+)
+_ITEM_SPLIT_RE = re.compile(r"\s*,\s*(?:and\s+)?|\s+and\s+", re.IGNORECASE)
+
+INVALID_REQUEST = {"error": "invalid_request"}
+
+_DATE = {"type": "string", "nullable": True, "description": "YYYY-MM-DD"}
+_TAGS = {"type": "array", "items": {"type": "string"}}
+
+# JSON schema of the interpreter's response, for models with structured output.
+# One "data" object covers all five actions, each using only its own fields.
+RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "actions": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "action": {
+                        "type": "string",
+                        "enum": ["create_task", "list_tasks", "update_task", "toggle_complete", "delete_task"],
+                    },
+                    "data": {
+                        "type": "object",
+                        "properties": {
+                            "text": {"type": "string"},
+                            "due_date": _DATE,
+                            "tags": _TAGS,
+                            "filter": {"type": "string", "enum": ["all", "completed", "incomplete"]},
+                            "task_id": {"type": "integer"},
+                            "updates": {
+                                "type": "object",
+                                "properties": {
+                                    "title": {"type": "string"},
+                                    "description": {"type": "string"},
+                                    "due_date": _DATE,
+                                    "tags": _TAGS,
+                                },
+                            },
+                        },
+                    },
+                },
+                "required": ["action", "data"],
+            },
+        },
+        "error": {"type": "string"},
+    },
+}
+
+
+def interpret_command(message: str, today: Optional[date] = None) -> Dict[str, Any]:
+    """Interpret a chat message. Returns {"actions": [...]} or {"error": "invalid_request"}."""
+    today = today or datetime.now().date()
+    actions = []
+    for clause in _CLAUSE_SPLIT_RE.split(message.strip()):
+        if clause:
+            actions.extend(_interpret_clause(clause, today))
+    return {"actions": actions} if actions else INVALID_REQUEST
+
+
+def _interpret_clause(text: str, today: date) -> List[Dict[str, Any]]:
+    task_id_match = _TASK_ID_RE.search(text)
+    task_ids = [int(number) for number in _NUMBER_RE.findall(task_id_match.group(0))] if task_id_match else []
+
+    if task_ids:
+        if _DELETE_RE.search(text):
+            return [{"action": "delete_task", "data": {"task_id": task_id}} for task_id in task_ids]
+        if _UPDATE_RE.search(text):
+            updates = _parse_updates(text[task_id_match.end():], today)
+            if not updates:
+                return []
+            return [{"action": "update_task", "data": {"task_id": task_ids[0], "updates": updates}}]
+        if _TOGGLE_RE.search(text):
+            return [{"action": "toggle_complete", "data": {"task_id": task_id}} for task_id in task_ids]
+
+    if _LIST_RE.search(text) and re.search(r"\btasks?\b|\btodos?\b", text, re.IGNORECASE):
+        lowered = text.lower()
+        if re.search(r"\b(incomplete|pending|unfinished|open|not done|remaining)\b", lowered):
+            task_filter = "incomplete"
+        elif re.search(r"\b(completed|complete|done|finished)\b", lowered):
+            task_filter = "completed"
+        else:
+            task_filter = "all"
+        return [{"action": "list_tasks", "data": {"filter": task_filter}}]
+
+    return _parse_create(text, today)
+
+
+def _parse_create(text: str, today: date) -> List[Dict[str, Any]]:
+    tags = _TAG_RE.findall(text)
+    due_date, text = _extract_date(text, today)
+    text = _TAG_RE.sub("", text)
+    text = _CREATE_PREFIX_RE.sub("", text)
+    text = re.sub(r"\s+", " ", text).strip(" ,.-")
+
+    # "milk, eggs and bread" is three tasks; without a comma "and" is part of the title
+    items = _ITEM_SPLIT_RE.split(text) if "," in text else [text]
+
+    return [
+        {
+            "action": "create_task",
+            "data": {
+                "text": item,
+                "due_date": due_date.isoformat() if due_date else None,
+                "tags": tags,
+            },
+        }
+        for item in map(str.strip, items)
+        if item
+    ]
+
+
+def _parse_updates(rest: str, today: date) -> Dict[str, Any]:
+    field_match = _UPDATE_FIELD_RE.search(rest)
+    if field_match:
+        field = field_match.group(1).lower().replace(" ", "_")
+        value = _strip_quotes(field_match.group(2))
+        if field.startswith("tag"):
+            return {"tags": _TAG_RE.findall(value) or value.replace(",", " ").split()}
+        if field == "due_date":
+            due_date, _ = _extract_date(value, today)
+            return {"due_date": due_date.isoformat() if due_date else None}
+        return {field: value} if value else {}
+
+    to_match = _UPDATE_TO_RE.search(rest)
+    if to_match:
+        value = _strip_quotes(to_match.group(1))
+        return {"title": value} if value else {}
+
+    return {}
+
+
+def _extract_date(text: str, today: date):
+    """Find the first supported date in text. Returns (date or None, text without it)."""
+    for pattern in (_ISO_DATE_RE, _SLASH_DATE_RE, _MONTH_DATE_RE):
+        match = pattern.search(text)
+        if not match:
+            continue
+        try:
+            if pattern is _ISO_DATE_RE:
+                found = date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+            elif pattern is _SLASH_DATE_RE:
+                found = date(int(match.group(3)), int(match.group(2)), int(match.group(1)))
+            else:
+                year = int(match.group(3)) if match.group(3) else today.year
+                found = date(year, _MONTHS[match.group(1).lower()[:3]], int(match.group(2)))
+        except ValueError:
+            continue
+        return found, text[:match.start()] + text[match.end():]
+    return None, text
+
+
+def _strip_quotes(value: str) -> str:
+    return value.strip().strip("'\"").strip()
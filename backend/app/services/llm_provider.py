@@ -0,0 +1,301 @@
+"""
+LLM providers for the chat interpreter.
+
+ChatbotService only needs "system prompt + user message -> raw response text".
+The provider is chosen with LLM_PROVIDER:
+- "gemini": Google Gemini (needs GEMINI_API_KEY and network access)
+- "local": deterministic offline provider that replays recorded responses
+  (LLM_REPLAY_FILE) and otherwise runs the rule-based command interpreter,
+  with optional injected latency (LLM_LATENCY_MS). Used for development,
+  tests and benchmarking the chat path without network access.
+
+Every provider counts prompt and response tokens per call (reported by the
+model where it can, estimated otherwise), see stats().
+"""
+import json
+import math
+from abc import ABC, abstractmethod
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional
+from ..config import settings
+from .command_interpreter import RESPONSE_SCHEMA, interpret_command
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) for models that don't report usage."""
+    return math.ceil(len(text) / 4)
+
+
+class TokenUsage:
+    """Thread-safe prompt/response token counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.response_tokens = 0
+        self.last: Optional[Dict[str, int]] = None
+
+    def record(self, prompt_tokens: int, response_tokens: int) -> None:
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += prompt_tokens
+            self.response_tokens += response_tokens
+            self.last = {"prompt_tokens": prompt_tokens, "response_tokens": response_tokens}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            calls = self.calls or 1
+            return {
+                "calls": self.calls,
+                "prompt_tokens": self.prompt_tokens,
+                "response_tokens": self.response_tokens,
+                "avg_prompt_tokens": round(self.prompt_tokens / calls, 1),
+                "avg_response_tokens": round(self.response_tokens / calls, 1),
+                "last": self.last,
+            }
+
+
+class LLMProvider(ABC):
+    """Interface for the model behind the chat interpreter (subclasses implement generate)."""
+
+    name = "base"
+
+    # Errors worth retrying (see resilience.py)
+    transient_errors = (TimeoutError, ConnectionError)
+
+    def __init__(self):
+        self.usage = TokenUsage()
+
+    @abstractmethod
+    def generate(self, system_prompt: str, message: str, timeout: Optional[float] = None) -> str:
+        """Return the model's raw response text for a user message (within `timeout` seconds)."""
+
+    def generate_stream(self, system_prompt: str, message: str, timeout: Optional[float] = None) -> Iterator[str]:
+        """
+        Yield the response text in chunks as the model produces it.
+
+        Callers may stop iterating (and close the iterator) once they have
+        what they need. Providers without streaming yield one chunk.
+        """
+        yield self.generate(system_prompt, message, timeout=timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for GET /api/metrics."""
+        return {"provider": self.name, "tokens": self.usage.stats()}
+
+
+class GeminiProvider(LLMProvider):
+    """Google Gemini via the google-generativeai SDK."""
+
+    name = "gemini"
+
+    def __init__(self, api_key: str, model_name: str, response_schema: Optional[dict] = None):
+        """
+        Args:
+            api_key: Gemini API key
+            model_name: Model to use
+            response_schema: JSON schema the response must follow (native
+                JSON output mode); None for free-form text
+        """
+        super().__init__()
+        # Imported lazily so the SDK is only required when Gemini is used
+        import google.generativeai as genai
+
+        if not api_key:
+            raise ValueError("GEMINI_API_KEY is required when LLM_PROVIDER=gemini")
+
+        genai.configure(api_key=api_key)
+        self._genai = genai
+        self.transient_errors = LLMProvider.transient_errors + _google_transient_errors()
+        self._model_name = model_name
+        self._response_schema = response_schema
+        self._lock = threading.Lock()
+        self._cached_prompt: Optional[str] = None
+        self._cached_model = None
+
+    def _get_model(self, system_prompt: str):
+        # The prompt embeds today's date, so it changes at most once a day
+        with self._lock:
+            if system_prompt != self._cached_prompt:
+                generation_config = {
+                    "temperature": 0.1,  # Low temperature for consistent parsing
+                    "max_output_tokens": 500,
+                }
+                if self._response_schema is not None:
+                    generation_config["response_mime_type"] = "application/json"
+                    generation_config["response_schema"] = self._response_schema
+                self._cached_model = self._genai.GenerativeModel(
+                    model_name=self._model_name,
+                    generation_config=generation_config,
+                    system_instruction=system_prompt,
+                )
+                self._cached_prompt = system_prompt
+            return self._cached_model
+
+    def generate(self, system_prompt: str, message: str, timeout: Optional[float] = None) -> str:
+        response = self._get_model(system_prompt).generate_content(
+            message, request_options=_request_options(timeout)
+        )
+        self._record_usage(response.usage_metadata)
+        return response.text
+
+    def generate_stream(self, system_prompt: str, message: str, timeout: Optional[float] = None) -> Iterator[str]:
+        response = self._get_model(system_prompt).generate_content(
+            message, stream=True, request_options=_request_options(timeout)
+        )
+        usage = None
+        try:
+            for chunk in response:
+                # Running totals; the last chunk received has the final counts
+                usage = chunk.usage_metadata or usage
+                if chunk.parts:
+                    yield chunk.text
+        finally:
+            self._record_usage(usage)
+
+    def _record_usage(self, usage) -> None:
+        if usage:
+            self.usage.record(usage.prompt_token_count, usage.candidates_token_count)
+
+
+def _request_options(timeout: Optional[float]) -> dict:
+    # The SDK's own retry wrapper is disabled; ResilientProvider retries
+    return {"timeout": timeout, "retry": None} if timeout else {}
+
+
+def _google_transient_errors() -> tuple:
+    """Rate limiting, overload and server errors from the Google API client."""
+    from google.api_core import exceptions
+
+    return (
+        exceptions.DeadlineExceeded,
+        exceptions.ServiceUnavailable,
+        exceptions.InternalServerError,
+        exceptions.TooManyRequests,
+        exceptions.ResourceExhausted,
+    )
+
+
+class LocalProvider(LLMProvider):
+    """Deterministic offline provider: recorded responses, then rule-based interpretation."""
+
+    name = "local"
+
+    STREAM_CHUNK_SIZE = 16
+
+    def __init__(self, replay_file: Optional[str] = None, latency_ms: int = 0):
+        super().__init__()
+        self.latency_ms = latency_ms
+        self.recorded: Dict[str, str] = {}
+        if replay_file:
+            self.recorded = self._load_recordings(replay_file)
+
+    @staticmethod
+    def _load_recordings(path: str) -> Dict[str, str]:
+        """
+        Load recorded responses keyed by message.
+
+        Accepts a JSON object ({"message": response, ...}) or JSON lines of
+        {"input": message, "output": response}. Responses may be strings or
+        JSON objects.
+        """
+        with open(path, encoding="utf-8") as f:
+            content = f.read()
+
+        try:
+            recordings = json.loads(content)
+        except ValueError:
+            recordings = None
+        # A JSON lines file with a single record also parses as one object
+        if isinstance(recordings, dict) and recordings.keys() != {"input", "output"}:
+            entries = recordings.items()
+        else:
+            entries = [
+                (record["input"], record["output"])
+                for record in map(json.loads, filter(str.strip, content.splitlines()))
+            ]
+
+        return {
+            message.strip(): response if isinstance(response, str) else json.dumps(response)
+            for message, response in entries
+        }
+
+    def generate(self, system_prompt: str, message: str, timeout: Optional[float] = None) -> str:
+        if self.latency_ms:
+            if timeout is not None and self.latency_ms / 1000 > timeout:
+                time.sleep(timeout)
+                raise TimeoutError(f"local provider latency exceeds the {timeout:.2f}s timeout")
+            time.sleep(self.latency_ms / 1000)
+
+        response = self.recorded.get(message.strip())
+        if response is None:
+            response = json.dumps(interpret_command(message, datetime.now().date()))
+
+        # Estimated, so prompt changes can be compared offline
+        self.usage.record(estimate_tokens(system_prompt) + estimate_tokens(message), estimate_tokens(response))
+        return response
+
+    def generate_stream(self, system_prompt: str, message: str, timeout: Optional[float] = None) -> Iterator[str]:
+        # Latency is injected before the first chunk, like a model's time to first token
+        text = self.generate(system_prompt, message, timeout=timeout)
+        for start in range(0, len(text), self.STREAM_CHUNK_SIZE):
+            yield text[start:start + self.STREAM_CHUNK_SIZE]
+
+
+_provider: Optional[LLMProvider] = None
+_provider_lock = threading.Lock()
+
+
+def get_llm_provider() -> LLMProvider:
+    """
+    Return the configured provider (created once per process).
+
+    Remote providers are wrapped with deadlines, retries, a circuit breaker
+    and, with LLM_FALLBACK=local, the offline interpreter as fallback.
+    """
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                provider = create_llm_provider(settings.LLM_PROVIDER)
+                if provider.name != "local":
+                    provider = _make_resilient(provider)
+                _provider = provider
+    return _provider
+
+
+def _make_resilient(provider: LLMProvider) -> LLMProvider:
+    from .resilience import CircuitBreaker, ResilientProvider
+
+    fallback = None
+    if settings.LLM_FALLBACK == "local":
+        fallback = LocalProvider(settings.LLM_REPLAY_FILE)
+    elif settings.LLM_FALLBACK:
+        raise ValueError(f"Unknown LLM_FALLBACK '{settings.LLM_FALLBACK}' (expected 'local' or empty)")
+
+    return ResilientProvider(
+        provider,
+        fallback=fallback,
+        timeout=settings.LLM_TIMEOUT_SECONDS,
+        deadline=settings.LLM_DEADLINE_SECONDS,
+        max_retries=settings.LLM_MAX_RETRIES,
+        base_delay=settings.LLM_RETRY_BASE_DELAY,
+        breaker=CircuitBreaker(settings.LLM_BREAKER_THRESHOLD, settings.LLM_BREAKER_RESET_SECONDS),
+    )
+
+
+def llm_stats() -> dict:
+    """Token and resilience counters of the provider in use (empty until the first chat call)."""
+    return _provider.stats() if _provider is not None else {}
+
+
+def create_llm_provider(name: str) -> LLMProvider:
+    """Build a provider by name."""
+    if name == "gemini":
+        return GeminiProvider(settings.GEMINI_API_KEY, settings.GEMINI_MODEL, response_schema=RESPONSE_SCHEMA)
+    if name == "local":
+        return LocalProvider(settings.LLM_REPLAY_FILE, settings.LLM_LATENCY_MS)
+    raise ValueError(f"Unknown LLM_PROVIDER '{name}' (expected 'gemini' or 'local')")
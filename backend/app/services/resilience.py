@@ -0,0 +1,210 @@
+"""
+Fault tolerance for the chat model.
+
+ResilientProvider wraps the configured LLMProvider with:
+- a deadline per call (LLM_DEADLINE_SECONDS), split into per-attempt
+  timeouts (LLM_TIMEOUT_SECONDS) that are passed to the provider
+- retries of transient errors (timeouts, connection errors, 429/5xx) with
+  exponential backoff and full jitter, never past the deadline
+- a circuit breaker: after LLM_BREAKER_THRESHOLD consecutive failed calls it
+  opens and calls fail fast for LLM_BREAKER_RESET_SECONDS, then a single
+  probe call decides whether to close it again
+- a fallback provider (the offline rule-based interpreter) used while the
+  breaker is open or when a call fails
+
+Counters are reported by stats() under "llm" in GET /api/metrics.
+"""
+import random
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional
+from .llm_provider import LLMProvider
+
+
+class CircuitOpenError(Exception):
+    """The circuit breaker is open; the call was not attempted."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker (closed -> open -> half-open -> closed)."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self.opened = 0  # times the breaker has opened
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go ahead. In half-open state only one probe is let through."""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self._state = self.HALF_OPEN
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self.opened += 1
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+
+class ResilientProvider(LLMProvider):
+    """LLMProvider decorator adding deadlines, retries, a circuit breaker and a fallback."""
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        fallback: Optional[LLMProvider] = None,
+        timeout: float = 10.0,
+        deadline: float = 20.0,
+        max_retries: int = 2,
+        base_delay: float = 0.25,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        super().__init__()
+        self.provider = provider
+        self.fallback = fallback
+        self.name = provider.name
+        self.timeout = timeout
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.breaker = breaker or CircuitBreaker()
+        self._lock = threading.Lock()
+        self._counters = {
+            "calls": 0,
+            "successes": 0,
+            "failures": 0,  # calls that failed after all retries
+            "retries": 0,
+            "timeouts": 0,
+            "rejected": 0,  # calls refused by the open breaker
+            "fallbacks": 0,
+        }
+
+    def generate(self, system_prompt: str, message: str, timeout: Optional[float] = None) -> str:
+        try:
+            return self._call(lambda attempt_timeout: self.provider.generate(
+                system_prompt, message, timeout=attempt_timeout
+            ))
+        except Exception:
+            if self.fallback is None:
+                raise
+            self._count("fallbacks")
+            return self.fallback.generate(system_prompt, message)
+
+    def generate_stream(self, system_prompt: str, message: str, timeout: Optional[float] = None) -> Iterator[str]:
+        # Retries are only possible until the first chunk has been handed on
+        def first_chunk(attempt_timeout):
+            chunks = self.provider.generate_stream(system_prompt, message, timeout=attempt_timeout)
+            return chunks, next(chunks, "")
+
+        try:
+            chunks, first = self._call(first_chunk, record_success=False)
+        except Exception:
+            if self.fallback is None:
+                raise
+            self._count("fallbacks")
+            yield from self.fallback.generate_stream(system_prompt, message)
+            return
+
+        try:
+            yield first
+            yield from chunks
+        except GeneratorExit:
+            # The caller stopped reading (e.g. once it had a complete JSON object)
+            self.breaker.record_success()
+            self._count("successes")
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            self._count("failures")
+            raise
+        self.breaker.record_success()
+        self._count("successes")
+
+    def _call(self, attempt, record_success: bool = True):
+        self._count("calls")
+        if not self.breaker.allow():
+            self._count("rejected")
+            raise CircuitOpenError(f"{self.name} circuit breaker is open")
+
+        give_up_at = time.monotonic() + self.deadline
+        retry = 0
+        while True:
+            remaining = give_up_at - time.monotonic()
+            try:
+                if remaining <= 0:
+                    raise TimeoutError(f"{self.name} call exceeded its {self.deadline:g}s deadline")
+                result = attempt(min(self.timeout, remaining))
+            except Exception as e:
+                transient = isinstance(e, self.provider.transient_errors)
+                if isinstance(e, TimeoutError) or _is_timeout(e):
+                    self._count("timeouts")
+                # Full jitter: sleep a random time up to base * 2^retry
+                delay = random.uniform(0, self.base_delay * (2 ** retry))
+                if not transient or retry >= self.max_retries or time.monotonic() + delay >= give_up_at:
+                    self.breaker.record_failure()
+                    self._count("failures")
+                    print(f"LLM call failed ({type(e).__name__}: {e})")
+                    raise
+                retry += 1
+                self._count("retries")
+                time.sleep(delay)
+                continue
+
+            if record_success:
+                self.breaker.record_success()
+                self._count("successes")
+            return result
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+        return {
+            "provider": self.name,
+            "breaker": self.breaker.state,
+            "breaker_opened": self.breaker.opened,
+            **counters,
+            "tokens": self.provider.usage.stats(),
+            "fallback_tokens": self.fallback.usage.stats() if self.fallback is not None else None,
+        }
+
+
+def _is_timeout(error: Exception) -> bool:
+    return type(error).__name__ in ("DeadlineExceeded", "ReadTimeout", "Timeout")
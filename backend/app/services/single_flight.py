@@ -0,0 +1,106 @@
+"""
+Single-flight coalescing of identical reads.
+
+When several requests ask for the same user's data with the same parameters
+while a query for it is already running, they wait for that query and share
+its result instead of each running their own. Results are not cached: a call
+that arrives after the running one finished starts a new query.
+
+A committed write calls invalidate(user_id), which detaches that user's
+in-flight calls, so reads that start after the write never join a query
+that may have started before it.
+
+Followers wait at most `wait_timeout` seconds for the shared call, then run
+the query themselves, so one slow query cannot hold every waiting request.
+"""
+import threading
+import uuid
+from typing import Any, Callable, Dict, Hashable, Optional
+from ..config import settings
+
+
+class _Call:
+    """One in-flight computation and the requests waiting for it."""
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same user and key (thread-safe)."""
+
+    def __init__(self, name: str, wait_timeout: Optional[float] = None):
+        self.name = name
+        self.wait_timeout = wait_timeout
+        self._lock = threading.Lock()
+        self._calls: Dict[uuid.UUID, Dict[Hashable, _Call]] = {}
+        self.executed = 0  # calls that ran the function
+        self.coalesced = 0  # calls that shared another call's result
+        self.invalidations = 0
+        self.wait_timeouts = 0  # followers that gave up waiting and ran the function
+
+    def run(self, user_id: uuid.UUID, key: Hashable, func: Callable[[], Any]) -> Any:
+        """
+        Return func(), or the result of an identical call already in flight.
+
+        If the shared call raises, every waiting caller raises the same exception.
+        A caller that waits longer than wait_timeout calls func() itself.
+        """
+        with self._lock:
+            calls = self._calls.setdefault(user_id, {})
+            call = calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = calls[key] = _Call()
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            if not call.done.wait(self.wait_timeout):
+                with self._lock:
+                    self.wait_timeouts += 1
+                return func()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                calls = self._calls.get(user_id)
+                # A write may have detached this call (and a newer one taken its place)
+                if calls is not None and calls.get(key) is call:
+                    del calls[key]
+                    if not calls:
+                        del self._calls[user_id]
+            call.done.set()
+        return call.result
+
+    def invalidate(self, user_id: uuid.UUID) -> None:
+        """Stop new callers for this user from joining calls already in flight."""
+        with self._lock:
+            if self._calls.pop(user_id, None) is not None:
+                self.invalidations += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "executed": self.executed,
+                "coalesced": self.coalesced,
+                "invalidations": self.invalidations,
+                "wait_timeouts": self.wait_timeouts,
+                "in_flight": sum(len(calls) for calls in self._calls.values()),
+            }
+
+
+# GET /api/{user_id}/tasks/ (shares the serialized response body)
+task_list_reads = SingleFlight("task_list", wait_timeout=settings.SINGLE_FLIGHT_WAIT_SECONDS)
@@ -0,0 +1,103 @@
+"""
+Background archival of old completed tasks.
+
+Completed tasks not updated for ARCHIVE_AFTER_DAYS are moved from `tasks` to
+`tasks_archive` in batches of ARCHIVE_BATCH_SIZE, every
+ARCHIVE_INTERVAL_MINUTES, so the hot table (and the indexes every task list
+query uses) only grows with live tasks. Archived tasks are listed with
+GET /api/{user_id}/tasks/?include_archived=true.
+
+Each run sleeps briefly between batches so it never holds the database for
+long. Counters are reported by stats() under "archive" in GET /api/metrics.
+"""
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+from sqlalchemy import func
+from sqlmodel import Session, select
+from ..config import settings
+from ..models.task import Task, TaskArchive
+from .task_service import TaskService
+
+# Pause between batches, leaving room for request traffic
+_BATCH_PAUSE_SECONDS = 0.05
+
+
+class TaskArchiver:
+    """Runs TaskService.archive_completed_tasks periodically in a daemon thread."""
+
+    def __init__(self, after_days: int, batch_size: int, interval_minutes: float):
+        self.after_days = after_days
+        self.batch_size = batch_size
+        self.interval_minutes = interval_minutes
+        self._engine = None
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Any] = {
+            "runs": 0,
+            "archived": 0,
+            "errors": 0,
+            "last_run_at": None,
+            "last_run_ms": None,
+            "hot_tasks": None,  # rows in tasks after the last run
+            "archived_tasks": None,  # rows in tasks_archive after the last run
+        }
+
+    def start(self, engine) -> None:
+        """Start the archival thread (the first run happens right away)."""
+        self._engine = engine
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._loop, name="task-archiver", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def run_once(self, engine) -> int:
+        """Archive every eligible task now, batch by batch. Returns the number moved."""
+        started = time.perf_counter()
+        completed_before = datetime.utcnow() - timedelta(days=self.after_days)
+        moved = 0
+        with Session(engine) as session:
+            while not self._stopped.is_set():
+                batch = TaskService.archive_completed_tasks(session, completed_before, self.batch_size)
+                moved += batch
+                if batch < self.batch_size:
+                    break
+                time.sleep(_BATCH_PAUSE_SECONDS)
+            hot = session.exec(select(func.count()).select_from(Task)).one()
+            archived = session.exec(select(func.count()).select_from(TaskArchive)).one()
+
+        with self._lock:
+            self._counters["runs"] += 1
+            self._counters["archived"] += moved
+            self._counters["last_run_at"] = datetime.utcnow().isoformat() + "Z"
+            self._counters["last_run_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            self._counters["hot_tasks"] = hot
+            self._counters["archived_tasks"] = archived
+        if moved:
+            print(f"Archived {moved} completed task(s)")
+        return moved
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._counters)
+
+    def _loop(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self.run_once(self._engine)
+            except Exception as e:
+                with self._lock:
+                    self._counters["errors"] += 1
+                print(f"Task archival error: {e}")
+            self._stopped.wait(self.interval_minutes * 60)
+
+
+task_archiver = TaskArchiver(
+    after_days=settings.ARCHIVE_AFTER_DAYS,
+    batch_size=settings.ARCHIVE_BATCH_SIZE,
+    interval_minutes=settings.ARCHIVE_INTERVAL_MINUTES,
+)
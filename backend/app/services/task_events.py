@@ -0,0 +1,275 @@
+"""
+Real-time task change feed.
+
+TaskService records a change on the session for every create/update/toggle/
+delete; once the transaction commits, the change is fanned out to every
+Server-Sent Events subscriber of that user. With TASK_EVENTS_BACKPLANE enabled
+(PostgreSQL only) changes are sent with NOTIFY inside the committing
+transaction and every worker re-broadcasts what it receives on LISTEN, so
+clients connected to any worker see every change. NOTIFY payloads are capped
+at 8000 bytes, so they only carry the user, event type and task ID; receiving
+workers reload the task from the primary.
+"""
+import asyncio
+import itertools
+import json
+import select as select_module
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from sqlalchemy import event, text
+from sqlmodel import Session
+from ..config import settings
+from ..database import pin_to_primary
+from ..models.task import Task, TaskResponse
+from .single_flight import task_list_reads
+
+NOTIFY_CHANNEL = "task_events"
+KEEPALIVE_SECONDS = 15.0
+
+_PENDING_KEY = "task_events"
+
+
+@dataclass
+class TaskEvent:
+    """A single change delivered to subscribers."""
+    id: str
+    seq: int
+    user_id: str
+    type: str
+    data: str
+
+    def encode(self) -> str:
+        """Render the event in text/event-stream format."""
+        return f"id: {self.id}\nevent: {self.type}\ndata: {self.data}\n\n"
+
+
+@dataclass
+class Subscription:
+    """An open event stream for one user."""
+    user_id: str
+    queue: asyncio.Queue
+    loop: asyncio.AbstractEventLoop
+    backlog: List[TaskEvent] = field(default_factory=list)
+    resync: bool = False
+
+
+class TaskEventBroadcaster:
+    """In-process fan-out of task changes to async subscribers."""
+
+    def __init__(self, history_size: int = 1000, queue_size: int = 500):
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, List[Subscription]] = {}
+        # One shared ring buffer keeps memory bounded regardless of user count;
+        # it is only scanned when a client reconnects with Last-Event-ID.
+        self._history: deque = deque(maxlen=history_size)
+        self._seq = itertools.count(1)
+        # Event ids are only meaningful to the process that issued them
+        self._epoch = uuid.uuid4().hex[:8]
+        self._queue_size = queue_size
+        self._backplane_engine = None
+        self._listener: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    @property
+    def backplane_enabled(self) -> bool:
+        return self._backplane_engine is not None
+
+    def subscribe(self, user_id: uuid.UUID, last_event_id: Optional[str] = None) -> Subscription:
+        """
+        Register a subscriber on the running event loop.
+
+        If last_event_id is given, events the client missed are placed in the
+        subscription's backlog. When they can't be recovered (the id is from
+        another worker/restart or fell out of history) `resync` is set and the
+        client should refetch its task list.
+        """
+        key = str(user_id)
+        subscription = Subscription(
+            user_id=key,
+            queue=asyncio.Queue(maxsize=self._queue_size),
+            loop=asyncio.get_running_loop(),
+        )
+
+        with self._lock:
+            if last_event_id:
+                subscription.backlog, subscription.resync = self._replay(key, last_event_id)
+            self._subscribers.setdefault(key, []).append(subscription)
+
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a subscriber (called when its stream closes)."""
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id, [])
+            if subscription in subscribers:
+                subscribers.remove(subscription)
+            if not subscribers:
+                self._subscribers.pop(subscription.user_id, None)
+
+    def publish(self, user_id: uuid.UUID, event_type: str, data: Dict[str, Any]) -> None:
+        """Deliver a change to this process's subscribers. Safe to call from any thread."""
+        self._fanout(str(user_id), event_type, json.dumps(data, separators=(",", ":"), default=str))
+
+    async def stream(self, subscription: Subscription) -> AsyncIterator[str]:
+        """Yield the subscription's events as text/event-stream chunks."""
+        try:
+            yield "retry: 3000\n\n"
+            if subscription.resync:
+                yield "event: resync\ndata: {}\n\n"
+            for missed in subscription.backlog:
+                yield missed.encode()
+
+            while True:
+                try:
+                    task_event = await asyncio.wait_for(subscription.queue.get(), timeout=KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield task_event.encode()
+        finally:
+            self.unsubscribe(subscription)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def _replay(self, user_id: str, last_event_id: str) -> Tuple[List[TaskEvent], bool]:
+        """Collect the events after last_event_id for user_id (caller holds the lock)."""
+        epoch, _, seq = last_event_id.partition("-")
+        if epoch != self._epoch or not seq.isdigit():
+            return [], True
+
+        last_seq = int(seq)
+        if self._history and last_seq < self._history[0].seq - 1:
+            return [], True
+
+        return [e for e in self._history if e.seq > last_seq and e.user_id == user_id], False
+
+    def _fanout(self, user_id: str, event_type: str, data: str) -> None:
+        with self._lock:
+            seq = next(self._seq)
+            task_event = TaskEvent(
+                id=f"{self._epoch}-{seq}",
+                seq=seq,
+                user_id=user_id,
+                type=event_type,
+                data=data,
+            )
+            self._history.append(task_event)
+            subscribers = list(self._subscribers.get(user_id, ()))
+
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(_offer, subscription, task_event)
+            except RuntimeError:
+                # Event loop already closed; the stream's finally block will unsubscribe
+                pass
+
+    # ----- PostgreSQL LISTEN/NOTIFY backplane -----
+
+    def start_backplane(self, engine) -> None:
+        """Start relaying changes through PostgreSQL LISTEN/NOTIFY."""
+        if engine.dialect.name != "postgresql":
+            print("⚠️  TASK_EVENTS_BACKPLANE requires PostgreSQL; using in-process events only")
+            return
+
+        self._backplane_engine = engine
+        self._stopped.clear()
+        self._listener = threading.Thread(target=self._listen, name="task-events-listener", daemon=True)
+        self._listener.start()
+
+    def stop_backplane(self) -> None:
+        self._stopped.set()
+        self._backplane_engine = None
+
+    def _listen(self) -> None:
+        engine = self._backplane_engine
+        while not self._stopped.is_set():
+            try:
+                raw = engine.raw_connection()
+                try:
+                    connection = raw.driver_connection
+                    connection.autocommit = True
+                    with connection.cursor() as cursor:
+                        cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+
+                    while not self._stopped.is_set():
+                        if select_module.select([connection], [], [], KEEPALIVE_SECONDS) == ([], [], []):
+                            continue
+                        connection.poll()
+                        while connection.notifies:
+                            notify = connection.notifies.pop(0)
+                            self._receive(notify.payload, engine)
+                finally:
+                    raw.invalidate()
+            except Exception as e:
+                print(f"Task events listener error: {e}")
+                time.sleep(1)
+
+    def _receive(self, payload: str, engine) -> None:
+        try:
+            message = json.loads(payload)
+            # Writes in other workers must also stop reads here from coalescing
+            # and from going to a replica that may not have them yet
+            user_id = uuid.UUID(message["u"])
+            task_id = int(message["id"])
+            task_list_reads.invalidate(user_id)
+            pin_to_primary(user_id)
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"Ignoring malformed task event: {e}")
+            return
+
+        if message["t"] == "task.deleted":
+            data = {"id": task_id}
+        else:
+            # NOTIFY is delivered after the commit, so the primary has the row
+            with Session(engine) as session:
+                task = session.get(Task, task_id)
+                if task is None or task.user_id != user_id:
+                    return  # deleted since; its task.deleted event follows
+                data = TaskResponse.model_validate(task).model_dump(mode="json")
+        self._fanout(message["u"], message["t"], json.dumps(data, separators=(",", ":")))
+
+
+def _offer(subscription: Subscription, task_event: TaskEvent) -> None:
+    """Queue an event on the subscriber's loop; a client that falls too far behind is told to resync."""
+    try:
+        subscription.queue.put_nowait(task_event)
+    except asyncio.QueueFull:
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        subscription.queue.put_nowait(TaskEvent(id="", seq=0, user_id=subscription.user_id, type="resync", data="{}"))
+
+
+task_events = TaskEventBroadcaster(history_size=settings.TASK_EVENTS_HISTORY)
+
+
+def record_task_change(session: Session, user_id: uuid.UUID, event_type: str, data: Dict[str, Any]) -> None:
+    """Queue a change on the session; it is published only if the transaction commits."""
+    session.info.setdefault(_PENDING_KEY, []).append((user_id, event_type, data))
+
+
+@event.listens_for(Session, "before_commit")
+def _notify_backplane(session) -> None:
+    if not task_events.backplane_enabled or not session.info.get(_PENDING_KEY):
+        return
+    # NOTIFY is transactional: listeners only receive it if this commit succeeds.
+    # Payloads are limited to 8000 bytes, so only the task ID is sent
+    for user_id, event_type, data in session.info.pop(_PENDING_KEY):
+        payload = json.dumps({"u": str(user_id), "t": event_type, "id": data["id"]}, separators=(",", ":"))
+        session.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": NOTIFY_CHANNEL, "payload": payload})
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed(session) -> None:
+    for user_id, event_type, data in session.info.pop(_PENDING_KEY, ()):
+        task_events.publish(user_id, event_type, data)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -1,17 +1,203 @@
-from sqlmodel import Session, select
-from typing import List, Optional
-from datetime import datetime
+from sqlmodel import Session, select, func, text
+from sqlalchemy import DateTime, bindparam, delete, insert, literal, literal_column, or_
+from typing import List, Optional, Union
+from datetime import datetime, timedelta
+import heapq
+import itertools
+import re
 import uuid
-from ..models.task import Task, TaskCreate, TaskUpdate
+from ..config import settings
+from ..database import pin_to_primary
+from ..models.task import Task, TaskArchive, TaskTombstone, TaskCreate, TaskUpdate, TaskResponse, TaskChanges
+from .task_events import record_task_change
+from .single_flight import task_list_reads
+
+# Word characters only, so user input can never inject tsquery/FTS5 operators
+_SEARCH_TERM_RE = re.compile(r"[^\W_]+")
+
+# Sync cursors are microseconds since the Unix epoch (timestamps are naive UTC)
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+# Cursors trail "now" so writes still committing (or stamped by a worker with a
+# slightly slow clock) are picked up by the next sync instead of being skipped.
+_SYNC_SAFETY_WINDOW = timedelta(seconds=2)
+
+_deletes = itertools.count(1)
 
 
 class TaskService:
     """Service for task operations."""
 
     @staticmethod
-    def get_all_tasks(session: Session, user_id: uuid.UUID) -> List[Task]:
-        """Get all tasks for a user."""
+    def get_all_tasks(
+        session: Session,
+        user_id: uuid.UUID,
+        include_archived: bool = False
+    ) -> List[Union[Task, TaskArchive]]:
+        """Get all tasks for a user (with include_archived, archived tasks too)."""
         statement = select(Task).where(Task.user_id == user_id).order_by(Task.created_at.desc())
+        tasks = session.exec(statement).all()
+        if not include_archived:
+            return tasks
+
+        archived = session.exec(
+            select(TaskArchive).where(TaskArchive.user_id == user_id).order_by(TaskArchive.created_at.desc())
+        ).all()
+        return list(heapq.merge(tasks, archived, key=lambda task: task.created_at, reverse=True))
+
+    @staticmethod
+    def get_changes(session: Session, user_id: uuid.UUID, since: Optional[int]) -> TaskChanges:
+        """
+        Get the tasks changed and deleted after a sync cursor.
+
+        Without a cursor, with one older than the tombstone retention
+        period, or with one from the future (never issued by this server),
+        every task is returned with reset=True and the client should
+        replace its local copy. Otherwise only the delta is returned; the
+        client applies `deleted` and upserts `tasks`, then stores `cursor`.
+        """
+        now = datetime.utcnow()
+        now_cursor = (now - _EPOCH) // _MICROSECOND
+        next_cursor = (now - _SYNC_SAFETY_WINDOW - _EPOCH) // _MICROSECOND
+        horizon = now - timedelta(days=settings.TOMBSTONE_RETENTION_DAYS)
+
+        if since is None or since > now_cursor or _EPOCH + since * _MICROSECOND < horizon:
+            tasks = TaskService.get_all_tasks(session, user_id)
+            return TaskChanges(
+                tasks=[TaskResponse.model_validate(task) for task in tasks],
+                deleted=[],
+                cursor=next_cursor,
+                reset=True
+            )
+
+        since_at = _EPOCH + since * _MICROSECOND
+        tasks = session.exec(
+            select(Task)
+            .where(Task.user_id == user_id, Task.updated_at > since_at)
+            .order_by(Task.updated_at)
+        ).all()
+        deleted = session.exec(
+            select(TaskTombstone.task_id)
+            .where(TaskTombstone.user_id == user_id, TaskTombstone.deleted_at > since_at)
+        ).all()
+
+        return TaskChanges(
+            tasks=[TaskResponse.model_validate(task) for task in tasks],
+            deleted=list(dict.fromkeys(deleted)),
+            # A cursor issued by a worker whose clock runs ahead may be slightly
+            # newer; moving back only re-sends a few unchanged tasks
+            cursor=next_cursor,
+            reset=False
+        )
+
+    @staticmethod
+    def compact_tombstones(session: Session) -> int:
+        """Purge tombstones older than the retention period. Returns the number removed."""
+        horizon = datetime.utcnow() - timedelta(days=settings.TOMBSTONE_RETENTION_DAYS)
+        result = session.execute(delete(TaskTombstone).where(TaskTombstone.deleted_at < horizon))
+        session.commit()
+        return result.rowcount
+
+    @staticmethod
+    def archive_completed_tasks(session: Session, completed_before: datetime, batch_size: int = 1000) -> int:
+        """
+        Move one batch of tasks completed before `completed_before` to tasks_archive.
+
+        Completion time is the task's last update. The copy and the delete
+        commit together, with a tombstone per task so delta sync clients
+        drop it like list clients do (archived tasks are only listed with
+        include_archived, and are read-only). On PostgreSQL the batch's rows are locked with SKIP
+        LOCKED, so archivers in several workers never pick the same tasks.
+        Owners see a task.deleted event for each task and their cached
+        lists are invalidated, as for delete_task.
+        Returns the number of tasks moved (0 when there is nothing left).
+        """
+        statement = (
+            select(Task.id, Task.user_id)
+            .where(Task.completed == True, Task.updated_at < completed_before)  # noqa: E712
+            .order_by(Task.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        rows = session.exec(statement).all()
+        if not rows:
+            session.rollback()
+            return 0
+        ids = [task_id for task_id, _ in rows]
+
+        columns = ["id", "user_id", "title", "description", "completed", "due_date", "tags", "created_at", "updated_at"]
+        archived_at = literal(datetime.utcnow(), DateTime)
+        session.execute(insert(TaskArchive).from_select(
+            columns + ["archived_at"],
+            select(*(getattr(Task, column) for column in columns), archived_at).where(Task.id.in_(ids))
+        ))
+        session.execute(insert(TaskTombstone).from_select(
+            ["task_id", "user_id", "deleted_at"],
+            select(Task.id, Task.user_id, archived_at).where(Task.id.in_(ids))
+        ))
+        session.execute(delete(Task).where(Task.id.in_(ids)))
+        for task_id, user_id in rows:
+            record_task_change(session, user_id, "task.deleted", {"id": task_id})
+        session.commit()
+        for user_id in {user_id for _, user_id in rows}:
+            task_list_reads.invalidate(user_id)
+            pin_to_primary(user_id)
+        return len(ids)
+
+    @staticmethod
+    def search_tasks(
+        session: Session,
+        user_id: uuid.UUID,
+        query: str,
+        limit: int = 20
+    ) -> List[Task]:
+        """
+        Full-text search over task titles and descriptions, best matches first.
+
+        Every search term is matched as a prefix, so partial input works for
+        type-ahead. Uses the tsvector/GIN index on PostgreSQL and the FTS5
+        index on SQLite (both created in migrations.py).
+        """
+        terms = _SEARCH_TERM_RE.findall(query.lower())
+        if not terms:
+            return []
+
+        dialect = session.get_bind().dialect.name
+
+        if dialect == "postgresql":
+            search_vector = literal_column("tasks.search_vector")
+            ts_query = func.to_tsquery("simple", " & ".join(f"{term}:*" for term in terms))
+            statement = (
+                select(Task)
+                .where(Task.user_id == user_id, search_vector.op("@@")(ts_query))
+                .order_by(func.ts_rank(search_vector, ts_query).desc(), Task.id.desc())
+                .limit(limit)
+            )
+            return session.exec(statement).all()
+
+        if dialect == "sqlite":
+            statement = text(
+                "SELECT tasks.id FROM tasks_fts "
+                "JOIN tasks ON tasks.id = tasks_fts.rowid "
+                "WHERE tasks_fts MATCH :match AND tasks.user_id = :user_id "
+                "ORDER BY bm25(tasks_fts, 2.0, 1.0) LIMIT :limit"
+            ).bindparams(bindparam("user_id", type_=Task.__table__.c.user_id.type))
+            task_ids = session.execute(statement, {
+                "match": " ".join(f'"{term}"*' for term in terms),
+                "user_id": user_id,
+                "limit": limit,
+            }).scalars().all()
+            if not task_ids:
+                return []
+            tasks = {task.id: task for task in session.exec(select(Task).where(Task.id.in_(task_ids)))}
+            return [tasks[task_id] for task_id in task_ids if task_id in tasks]
+
+        # No full-text index for this database: fall back to a substring scan
+        conditions = [
+            or_(Task.title.ilike(f"%{term}%"), Task.description.ilike(f"%{term}%"))
+            for term in terms
+        ]
+        statement = select(Task).where(Task.user_id == user_id, *conditions).order_by(Task.id.desc()).limit(limit)
         return session.exec(statement).all()
 
     @staticmethod
@@ -20,35 +206,63 @@ class TaskService:
         statement = select(Task).where(Task.id == task_id, Task.user_id == user_id)
         return session.exec(statement).first()
 
+    @staticmethod
+    def get_archived_task(session: Session, task_id: int, user_id: uuid.UUID) -> Optional[TaskArchive]:
+        """Get a task moved to tasks_archive by the archival job."""
+        statement = select(TaskArchive).where(TaskArchive.id == task_id, TaskArchive.user_id == user_id)
+        return session.exec(statement).first()
+
     @staticmethod
     def create_task(session: Session, task_data: TaskCreate, user_id: uuid.UUID) -> Task:
         """Create a new task."""
-        # Truncate description if too long
-        description = task_data.description
-        if description and len(description) > 1000:
-            description = description[:1000]
-
-        task = Task(
-            user_id=user_id,
-            title=task_data.title,
-            description=description,
-            completed=False,
-            due_date=task_data.due_date,
-            tags=task_data.tags if task_data.tags else []
-        )
-        session.add(task)
-        session.commit()
+        task = TaskService.create_tasks(session, [task_data], user_id)[0]
         session.refresh(task)
         return task
 
+    @staticmethod
+    def create_tasks(
+        session: Session,
+        tasks_data: List[TaskCreate],
+        user_id: uuid.UUID,
+        commit: bool = True
+    ) -> List[Task]:
+        """
+        Create several tasks in one flush.
+
+        On PostgreSQL this is a single multi-row INSERT ... RETURNING; SQLite
+        cannot order RETURNING rows, so it inserts row by row (still in one
+        transaction). With commit=False the tasks are only flushed (IDs assigned); the
+        caller commits with commit_changes().
+        """
+        tasks = [
+            Task(
+                user_id=user_id,
+                title=task_data.title,
+                # Truncate description if too long
+                description=task_data.description[:1000] if task_data.description else task_data.description,
+                completed=False,
+                due_date=task_data.due_date,
+                tags=task_data.tags if task_data.tags else []
+            )
+            for task_data in tasks_data
+        ]
+        session.add_all(tasks)
+        session.flush()
+        for task in tasks:
+            TaskService._record_change(session, user_id, "task.created", task)
+        if commit:
+            TaskService.commit_changes(session, user_id)
+        return tasks
+
     @staticmethod
     def update_task(
         session: Session,
         task_id: int,
         task_update: TaskUpdate,
-        user_id: uuid.UUID
+        user_id: uuid.UUID,
+        commit: bool = True
     ) -> Optional[Task]:
-        """Update a task."""
+        """Update a task (with commit=False, flush only; see create_tasks)."""
         task = TaskService.get_task_by_id(session, task_id, user_id)
         if not task:
             return None
@@ -62,13 +276,21 @@ class TaskService:
 
         task.updated_at = datetime.utcnow()
         session.add(task)
-        session.commit()
-        session.refresh(task)
+        session.flush()
+        TaskService._record_change(session, user_id, "task.updated", task)
+        if commit:
+            TaskService.commit_changes(session, user_id)
+            session.refresh(task)
         return task
 
     @staticmethod
-    def toggle_complete(session: Session, task_id: int, user_id: uuid.UUID) -> Optional[Task]:
-        """Toggle task completion status."""
+    def toggle_complete(
+        session: Session,
+        task_id: int,
+        user_id: uuid.UUID,
+        commit: bool = True
+    ) -> Optional[Task]:
+        """Toggle task completion status (with commit=False, flush only)."""
         task = TaskService.get_task_by_id(session, task_id, user_id)
         if not task:
             return None
@@ -76,17 +298,44 @@ class TaskService:
         task.completed = not task.completed
         task.updated_at = datetime.utcnow()
         session.add(task)
-        session.commit()
-        session.refresh(task)
+        session.flush()
+        TaskService._record_change(session, user_id, "task.toggled", task)
+        if commit:
+            TaskService.commit_changes(session, user_id)
+            session.refresh(task)
         return task
 
     @staticmethod
-    def delete_task(session: Session, task_id: int, user_id: uuid.UUID) -> bool:
-        """Delete a task."""
+    def delete_task(session: Session, task_id: int, user_id: uuid.UUID, commit: bool = True) -> bool:
+        """Delete a task (with commit=False, flush only)."""
         task = TaskService.get_task_by_id(session, task_id, user_id)
         if not task:
             return False
 
         session.delete(task)
-        session.commit()
+        session.add(TaskTombstone(task_id=task_id, user_id=user_id))
+        record_task_change(session, user_id, "task.deleted", {"id": task_id})
+        if not commit:
+            session.flush()
+            return True
+        TaskService.commit_changes(session, user_id)
+
+        if next(_deletes) % settings.TOMBSTONE_COMPACT_EVERY == 0:
+            TaskService.compact_tombstones(session)
         return True
+
+    @staticmethod
+    def commit_changes(session: Session, user_id: uuid.UUID) -> None:
+        """
+        Commit a user's writes. Reads starting after this no longer join older
+        in-flight ones and go to the primary until the replica has caught up.
+        """
+        session.commit()
+        task_list_reads.invalidate(user_id)
+        pin_to_primary(user_id)
+
+    @staticmethod
+    def _record_change(session: Session, user_id: uuid.UUID, event_type: str, task: Task) -> None:
+        """Queue a change event; it is broadcast once the session commits."""
+        payload = TaskResponse.model_validate(task).model_dump(mode="json")
+        record_task_change(session, user_id, event_type, payload)
@@ -0,0 +1,119 @@
+"""
+Hot-table size and task list latency as the service ages, with and without archival.
+
+Simulates --months of usage on two temporary SQLite databases: every month
+each of --users users adds --tasks-per-month tasks and completes most of
+them. After each month the "archive" database runs the archival job
+(completed tasks older than --after-days move to tasks_archive); the
+"baseline" database keeps everything in `tasks`. Reports the rows in `tasks`
+and the p50/p95 latency of TaskService.get_all_tasks for every user.
+
+Usage (from backend/):
+    python -m benchmarks.bench_archive
+    python -m benchmarks.bench_archive --users 200 --months 24 --tasks-per-month 50
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+
+def make_engine(path: str):
+    from sqlmodel import SQLModel, create_engine
+    import app.models  # noqa: F401  (registers the tables)
+
+    engine = create_engine(f"sqlite:///{path}")
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
+def add_month(engines, user_ids, month_start: datetime, per_user: int, completion: float, rng: random.Random):
+    from sqlalchemy import insert
+    from app.models.task import Task
+
+    rows = []
+    for user_id in user_ids:
+        for i in range(per_user):
+            created = month_start + timedelta(minutes=rng.randint(0, 60 * 24 * 30))
+            done = rng.random() < completion
+            updated = created + timedelta(hours=rng.randint(1, 72)) if done else created
+            rows.append({
+                "user_id": user_id,
+                "title": f"Task {i} of {created:%b %Y}",
+                "description": None,
+                "completed": done,
+                "due_date": None,
+                "tags": [],
+                "created_at": created,
+                "updated_at": updated,
+            })
+    for engine in engines:
+        with engine.begin() as conn:
+            conn.execute(insert(Task), rows)
+
+
+def measure(engine, user_ids):
+    from sqlmodel import Session, select, func
+    from app.models.task import Task
+    from app.services.task_service import TaskService
+
+    latencies = []
+    with Session(engine) as session:
+        hot = session.exec(select(func.count()).select_from(Task)).one()
+        for user_id in user_ids:
+            start = time.perf_counter()
+            TaskService.get_all_tasks(session, user_id)
+            latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return hot, statistics.median(latencies) * 1000, latencies[int(len(latencies) * 0.95) - 1] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--months", type=int, default=12)
+    parser.add_argument("--tasks-per-month", type=int, default=30, help="tasks added per user per month")
+    parser.add_argument("--completion", type=float, default=0.8, help="share of tasks completed")
+    parser.add_argument("--after-days", type=int, default=90, help="archive tasks completed this long ago")
+    args = parser.parse_args()
+
+    # Settings are read at import time
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    os.environ.setdefault("JWT_SECRET", "benchmark-secret")
+    os.environ["ARCHIVE_ENABLED"] = "false"
+    from sqlmodel import Session
+    from app.services.task_service import TaskService
+
+    rng = random.Random(42)
+    user_ids = [uuid.uuid4() for _ in range(args.users)]
+    start = datetime(2024, 1, 1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        baseline = make_engine(os.path.join(tmp, "baseline.db"))
+        archived = make_engine(os.path.join(tmp, "archive.db"))
+
+        print(f"{args.users} users, {args.tasks_per_month} tasks/user/month, "
+              f"archive after {args.after_days} days\n")
+        print(f"{'month':>5}  {'tasks rows':>21}  {'list p50 ms':>19}  {'list p95 ms':>19}")
+        print(f"{'':>5}  {'baseline':>10} {'archive':>10}  {'baseline':>9} {'archive':>9}  {'baseline':>9} {'archive':>9}")
+        for month in range(args.months):
+            month_start = start + timedelta(days=30 * month)
+            add_month((baseline, archived), user_ids, month_start, args.tasks_per_month, args.completion, rng)
+
+            now = month_start + timedelta(days=30)
+            with Session(archived) as session:
+                while TaskService.archive_completed_tasks(session, now - timedelta(days=args.after_days)):
+                    pass
+
+            base_rows, base_p50, base_p95 = measure(baseline, user_ids)
+            arch_rows, arch_p50, arch_p95 = measure(archived, user_ids)
+            print(f"{month + 1:>5}  {base_rows:>10,} {arch_rows:>10,}  {base_p50:>9.2f} {arch_p50:>9.2f}  "
+                  f"{base_p95:>9.2f} {arch_p95:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
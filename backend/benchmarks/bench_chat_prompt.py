@@ -0,0 +1,143 @@
+"""
+Regression benchmark for the chat interpreter prompt and output mode.
+
+Runs every command in benchmarks/chat_corpus.jsonl through the provider twice:
+- before: the previous long prompt (benchmarks/legacy_chat_prompt.txt) with
+  free-form text output
+- after: the compact ChatbotService prompt with native JSON output constrained
+  by RESPONSE_SCHEMA (Gemini only; other providers ignore the schema)
+
+and reports prompt/response tokens per call, latency, the parse-failure rate
+and how many responses match the expected actions. The default offline `local`
+provider ignores the prompt, so only the (estimated, ~4 characters per token)
+prompt size is reported; use --provider gemini (needs GEMINI_API_KEY) to
+measure the model itself.
+
+Usage (from backend/):
+    python -m benchmarks.bench_chat_prompt
+    python -m benchmarks.bench_chat_prompt --provider gemini --output prompt.json
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+from datetime import datetime
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_corpus(path: str):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def legacy_prompt() -> str:
+    today = datetime.now().date()
+    with open(os.path.join(HERE, "legacy_chat_prompt.txt"), encoding="utf-8") as f:
+        return f.read().rstrip("\n").format(current_date=today.isoformat(), current_year=today.year)
+
+
+def make_provider(name: str, json_mode: bool):
+    from app.config import settings
+    from app.services.command_interpreter import RESPONSE_SCHEMA
+    from app.services.llm_provider import GeminiProvider, LocalProvider
+
+    if name == "gemini":
+        schema = RESPONSE_SCHEMA if json_mode else None
+        return GeminiProvider(settings.GEMINI_API_KEY, settings.GEMINI_MODEL, response_schema=schema)
+    return LocalProvider(settings.LLM_REPLAY_FILE, settings.LLM_LATENCY_MS)
+
+
+def run(label: str, provider, prompt: str, corpus) -> dict:
+    from app.services.chatbot_service import ChatbotService, chat_stats
+
+    failures_before = chat_stats()["parse_failures"]
+    latencies = []
+    errors = correct = 0
+    for case in corpus:
+        start = time.perf_counter()
+        try:
+            text = provider.generate(prompt, case["input"])
+        except Exception as e:
+            print(f"  {label}: {case['input']!r} failed: {e}")
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - start)
+        parsed = ChatbotService._parse_json_response(text)
+        actions = ChatbotService._parse_actions(parsed)
+        expected = ChatbotService._parse_actions(case["expected"])
+        correct += actions == expected
+
+    usage = provider.usage.stats()
+    calls = usage["calls"] or 1
+    n = len(corpus)
+    latencies.sort()
+    return {
+        "commands": n,
+        "prompt_tokens": usage["prompt_tokens"] / calls,
+        "response_tokens": usage["response_tokens"] / calls,
+        "latency_p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "latency_p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000 if latencies else 0.0,
+        "parse_failure_rate": (chat_stats()["parse_failures"] - failures_before) / n,
+        "error_rate": errors / n,
+        "accuracy": correct / n,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--provider", choices=("local", "gemini"), default="local", help="model to measure")
+    parser.add_argument("--corpus", default=os.path.join(HERE, "chat_corpus.jsonl"),
+                        help="JSON lines of {\"input\": ..., \"expected\": ...}")
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args()
+
+    # Settings are read at import time
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    os.environ.setdefault("JWT_SECRET", "benchmark-secret")
+    from app.config import settings
+    from app.services.chatbot_service import ChatbotService
+
+    if args.provider == "gemini" and not settings.GEMINI_API_KEY:
+        parser.error("--provider gemini needs GEMINI_API_KEY")
+
+    corpus = load_corpus(args.corpus)
+    print(f"Chat prompt benchmark: {len(corpus)} commands, provider {args.provider}\n")
+
+    results = {
+        "before": run("before", make_provider(args.provider, json_mode=False), legacy_prompt(), corpus),
+        "after": run("after", make_provider(args.provider, json_mode=True),
+                     ChatbotService._get_headless_prompt(), corpus),
+    }
+
+    rows = [
+        ("prompt tokens / call", "prompt_tokens", "{:,.0f}"),
+        ("response tokens / call", "response_tokens", "{:,.0f}"),
+        ("latency p50 (ms)", "latency_p50_ms", "{:,.1f}"),
+        ("latency p95 (ms)", "latency_p95_ms", "{:,.1f}"),
+        ("parse failures", "parse_failure_rate", "{:.1%}"),
+        ("errors", "error_rate", "{:.1%}"),
+        ("matches expected", "accuracy", "{:.1%}"),
+    ]
+    if args.provider == "local":
+        # The rule-based provider answers the same whatever the prompt says, so
+        # its latency, parse failures and accuracy say nothing about the prompt
+        rows = rows[:1]
+        results = {key: {"commands": value["commands"], "prompt_tokens": value["prompt_tokens"]}
+                   for key, value in results.items()}
+    print(f"{'':<24}{'before':>12}{'after':>12}")
+    for label, key, fmt in rows:
+        print(f"{label:<24}{fmt.format(results['before'][key]):>12}{fmt.format(results['after'][key]):>12}")
+    if args.provider == "local":
+        print("\nOffline provider: model output is not measured; use --provider gemini for "
+              "latency, parse failures and accuracy.")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"provider": args.provider, "results": results}, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
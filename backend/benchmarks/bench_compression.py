@@ -0,0 +1,90 @@
+"""
+CPU-vs-bytes tradeoff of response compression on task list payloads.
+
+Builds GET /api/{user_id}/tasks/ bodies (the route's own serializer) for
+users with 10 to 5000 realistic tasks and, for every available encoding and
+level, reports the compressed size, ratio and compression time per response.
+brotli and zstd rows need the optional `brotli` and `zstandard` packages.
+
+Usage (from backend/):
+    python -m benchmarks.bench_compression
+    python -m benchmarks.bench_compression --sizes 100 1000 --repeat 50
+"""
+import argparse
+import os
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+
+LEVELS = {
+    "gzip": (1, 4, 6, 9),
+    "br": (1, 4, 6, 11),
+    "zstd": (1, 3, 9, 19),
+}
+
+WORDS = ("buy milk call mom finish quarterly report review pull request book flight "
+         "dentist appointment pay rent renew passport groceries team sync plan sprint "
+         "water plants gym session fix bike tyre send invoice update resume").split()
+TAGS = ("work", "personal", "shopping", "health", "finance", "urgent", "home")
+
+
+def make_tasks(n: int, rng: random.Random):
+    from app.models.task import Task
+
+    user_id = uuid.uuid4()
+    now = datetime(2025, 12, 1, 9, 30)
+    tasks = []
+    for i in range(n):
+        created = now - timedelta(minutes=rng.randint(0, 60 * 24 * 90))
+        tasks.append(Task(
+            id=i + 1,
+            user_id=user_id,
+            title=" ".join(rng.choices(WORDS, k=rng.randint(2, 6))).capitalize(),
+            description=" ".join(rng.choices(WORDS, k=rng.randint(0, 30))) or None,
+            completed=rng.random() < 0.3,
+            due_date=(created + timedelta(days=rng.randint(1, 30))).date() if rng.random() < 0.5 else None,
+            tags=rng.sample(TAGS, rng.randint(0, 2)),
+            created_at=created,
+            updated_at=created + timedelta(minutes=rng.randint(0, 600)),
+        ))
+    return tasks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 5000], help="tasks per response")
+    parser.add_argument("--repeat", type=int, default=20, help="compressions timed per case")
+    args = parser.parse_args()
+
+    # Settings are read at import time
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    os.environ.setdefault("JWT_SECRET", "benchmark-secret")
+    from app.middleware.compression import available_codecs
+    from app.routes.tasks import _task_list_body
+
+    codecs = []
+    for name, levels in LEVELS.items():
+        for level in levels:
+            codec = available_codecs({name: level}).get(name)
+            if codec is None:
+                print(f"({name}: package not installed, skipped)")
+                break
+            codecs.append((f"{name}-{level}", codec[0]))
+
+    rng = random.Random(42)
+    for size in args.sizes:
+        body = _task_list_body(make_tasks(size, rng))
+        print(f"\n{size:,} tasks, {len(body):,} bytes uncompressed")
+        print(f"  {'encoding':<10}{'bytes':>10}{'ratio':>8}{'µs/response':>14}{'MB/s':>9}")
+        for label, compress in codecs:
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                data = compress(body)
+            elapsed = (time.perf_counter() - start) / args.repeat
+            print(f"  {label:<10}{len(data):>10,}{len(body) / len(data):>8.1f}"
+                  f"{elapsed * 1e6:>14,.0f}{len(body) / elapsed / 1e6:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
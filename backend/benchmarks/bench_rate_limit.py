@@ -0,0 +1,104 @@
+"""
+Overhead of the rate-limiting middleware.
+
+Calls RateLimitMiddleware directly around a no-op ASGI app (no server, no
+routing) and reports the added time per request for:
+- a path no policy matches (the cost every other route pays)
+- login, keyed by client IP
+- chat, keyed by the bearer token's user (token verification is cached)
+- a rejected request (429 response)
+plus raw MemoryBucketStore throughput over many distinct keys.
+
+Usage (from backend/):
+    python -m benchmarks.bench_rate_limit --requests 200000
+"""
+import argparse
+import asyncio
+import os
+import time
+import uuid
+
+TARGET_US = 10.0
+
+
+async def noop_app(scope, receive, send):
+    pass
+
+
+async def noop_send(message):
+    pass
+
+
+def request(method: str, path: str, ip: str = "203.0.113.7", token: str = "") -> dict:
+    headers = [(b"host", b"localhost"), (b"content-type", b"application/json")]
+    if token:
+        headers.append((b"authorization", b"Bearer " + token.encode()))
+    return {"type": "http", "method": method, "path": path, "headers": headers, "client": (ip, 50000)}
+
+
+async def per_request_us(app, scope: dict, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        await app(scope, None, noop_send)
+    return (time.perf_counter() - start) / n * 1e6
+
+
+async def run(n: int) -> bool:
+    from app.middleware.rate_limit import MemoryBucketStore, RateLimitMiddleware, RateLimitPolicy
+    from app.services.auth_service import create_access_token
+
+    unlimited = "100000000/second"
+    policies = [
+        RateLimitPolicy.from_string("login", r"/api/auth/login$", ["POST"], unlimited),
+        RateLimitPolicy.from_string("register", r"/api/auth/register$", ["POST"], unlimited),
+        RateLimitPolicy.from_string("chat", r"/api/[^/]+/chat/", ["POST"], unlimited, per_user=True),
+    ]
+    limited = RateLimitMiddleware(noop_app, policies=policies, store=MemoryBucketStore())
+    user_id = uuid.uuid4()
+    token = create_access_token(user_id, "bench@example.com")
+
+    cases = [
+        ("unmatched path", request("GET", f"/api/{user_id}/tasks/")),
+        ("login (per IP)", request("POST", "/api/auth/login")),
+        ("chat (per user)", request("POST", f"/api/{user_id}/chat/message", token=token)),
+    ]
+    baseline = await per_request_us(noop_app, cases[0][1], n)
+    print(f"{'request':<20}{'overhead':>12}")
+    ok = True
+    for label, scope in cases:
+        overhead = await per_request_us(limited, scope, n) - baseline
+        ok &= overhead < TARGET_US
+        print(f"{label:<20}{overhead:>9.2f} µs")
+
+    exhausted = RateLimitMiddleware(
+        noop_app, store=MemoryBucketStore(),
+        policies=[RateLimitPolicy.from_string("login", r"/api/auth/login$", ["POST"], "1/day")],
+    )
+    overhead = await per_request_us(exhausted, request("POST", "/api/auth/login"), n) - baseline
+    print(f"{'rejected (429)':<20}{overhead:>9.2f} µs")
+
+    store = MemoryBucketStore()
+    keys = [f"login:ip:10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i in range(n)]
+    start = time.perf_counter()
+    for key in keys:
+        store.take_now(key, 1.0, 10, time.monotonic())
+    elapsed = time.perf_counter() - start
+    print(f"\nMemoryBucketStore: {n / elapsed:,.0f} takes/s over {n:,} keys ({len(store):,} kept)")
+
+    print(f"\nTarget: < {TARGET_US:.0f} µs per allowed request: {'met' if ok else 'MISSED'}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200_000, help="requests per case")
+    args = parser.parse_args()
+
+    # Settings are read at import time
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    os.environ.setdefault("JWT_SECRET", "benchmark-secret")
+    raise SystemExit(0 if asyncio.run(run(args.requests)) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,348 @@
+"""
+Load test / benchmark harness for the FastAPI backend.
+
+Seeds N users x M tasks, then drives the API with a weighted mix of list,
+create, patch, toggle, delete, login and chat requests. Chat uses the local
+LLM provider (LLM_PROVIDER=local), so no network access or API key is needed. Reports requests/second and
+p50/p95/p99 latency per route and writes machine-readable JSON that can be
+compared against a previous run.
+
+Usage (from backend/):
+    python -m benchmarks.load_test --users 20 --tasks 200 --duration 30
+    python -m benchmarks.load_test --output before.json
+    python -m benchmarks.load_test --output after.json --compare before.json
+
+By default the app runs in-process over ASGI against a throwaway SQLite file.
+Use --database-url for a local PostgreSQL (the benchmark writes to it; use a
+dedicated database) and --base-url to drive an already running server that
+points at that same database.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+PASSWORD = "benchmark-password"
+
+# (route name, weight)
+DEFAULT_MIX = [
+    ("list", 40),
+    ("create", 15),
+    ("patch", 15),
+    ("toggle", 15),
+    ("delete", 5),
+    ("login", 5),
+    ("chat", 5),
+]
+
+CHAT_MESSAGES = [
+    "show my tasks",
+    "list completed tasks",
+    "add task buy milk #shopping",
+    "create task finish report #work 2025-12-20",
+]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Todo API")
+    parser.add_argument("--users", type=int, default=10, help="number of seeded users")
+    parser.add_argument("--tasks", type=int, default=100, help="tasks seeded per user")
+    parser.add_argument("--duration", type=float, default=20.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=2.0, help="unmeasured warmup seconds")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent clients")
+    parser.add_argument("--seed", type=int, default=42, help="random seed for the request mix")
+    parser.add_argument("--llm-latency-ms", type=int, default=0,
+                        help="latency injected into each chat model call")
+    parser.add_argument("--database-url", help="database to seed (default: temporary SQLite file)")
+    parser.add_argument("--base-url", help="drive a running server instead of the in-process app")
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--compare", help="baseline JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="percent change reported as a regression (default: 10)")
+    return parser.parse_args(argv)
+
+
+def configure_environment(args) -> None:
+    """Settings are read at import time, so this must run before importing app."""
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    else:
+        path = os.path.join(tempfile.mkdtemp(prefix="todo-bench-"), "bench.db")
+        os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    os.environ.setdefault("JWT_SECRET", "benchmark-secret")
+    # Chat runs against the deterministic local provider instead of Gemini
+    os.environ["LLM_PROVIDER"] = "local"
+    os.environ["LLM_LATENCY_MS"] = str(args.llm_latency_ms)
+    # Every client logs in from the same address; measure the routes, not the limiter
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    # Keep SQL echo off; it would dominate the measurements
+    os.environ["ENVIRONMENT"] = "benchmark"
+
+
+def seed(n_users: int, n_tasks: int) -> List[dict]:
+    """Create users and tasks directly in the database. Returns user fixtures."""
+    from sqlmodel import Session, select
+    from app.database import engine, create_tables
+    from app.migrations import run_migrations
+    from app.models.task import Task
+    from app.models.user import User
+    from app.services.auth_service import hash_password, create_access_token
+
+    create_tables()
+    run_migrations()
+
+    password_hash = hash_password(PASSWORD)  # bcrypt once, shared by every user
+    users = []
+    with Session(engine) as session:
+        run_id = uuid.uuid4().hex[:8]
+        for i in range(n_users):
+            user = User(email=f"bench-{run_id}-{i}@example.com", name=f"Bench {i}", password_hash=password_hash)
+            session.add(user)
+            users.append(user)
+        session.commit()
+
+        fixtures = []
+        for user in users:
+            session.add_all([
+                Task(
+                    user_id=user.id,
+                    title=f"Benchmark task {j}",
+                    description="Seeded by benchmarks/load_test.py " * 3,
+                    completed=j % 3 == 0,
+                    tags=["bench"] if j % 2 else [],
+                )
+                for j in range(n_tasks)
+            ])
+            session.commit()
+            task_ids = list(session.exec(select(Task.id).where(Task.user_id == user.id)).all())
+            fixtures.append({
+                "id": str(user.id),
+                "email": user.email,
+                "token": create_access_token(user.id, user.email),
+                "task_ids": task_ids,
+            })
+
+    return fixtures
+
+
+class Recorder:
+    """Collects per-route latencies while recording is enabled."""
+
+    def __init__(self):
+        self.recording = False
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def add(self, route: str, seconds: float, ok: bool) -> None:
+        if not self.recording:
+            return
+        self.latencies[route].append(seconds)
+        if not ok:
+            self.errors[route] += 1
+
+
+async def run_request(client, route: str, user: dict, rng: random.Random):
+    headers = {"Authorization": f"Bearer {user['token']}"}
+    base = f"/api/{user['id']}/tasks"
+    task_ids = user["task_ids"]
+
+    if route in ("patch", "toggle", "delete") and not task_ids:
+        route = "create"
+
+    if route == "list":
+        return route, await client.get(f"{base}/", headers=headers)
+    if route == "create":
+        response = await client.post(f"{base}/", headers=headers, json={
+            "title": f"Load test task {rng.randrange(1_000_000)}",
+            "description": "created during benchmark",
+            "tags": ["bench"],
+        })
+        if response.status_code == 201:
+            task_ids.append(response.json()["id"])
+        return route, response
+    if route == "patch":
+        task_id = rng.choice(task_ids)
+        return route, await client.patch(f"{base}/{task_id}", headers=headers,
+                                         json={"title": f"Patched {rng.randrange(1_000_000)}"})
+    if route == "toggle":
+        task_id = rng.choice(task_ids)
+        return route, await client.patch(f"{base}/{task_id}/complete", headers=headers)
+    if route == "delete":
+        task_id = task_ids.pop(rng.randrange(len(task_ids)))
+        return route, await client.delete(f"{base}/{task_id}", headers=headers)
+    if route == "login":
+        return route, await client.post("/api/auth/login", json={"email": user["email"], "password": PASSWORD})
+    if route == "chat":
+        return route, await client.post(f"/api/{user['id']}/chat/message", headers=headers,
+                                        json={"text": rng.choice(CHAT_MESSAGES)})
+    raise ValueError(f"unknown route {route}")
+
+
+async def worker(client, users, recorder: Recorder, stop_at: float, rng: random.Random):
+    routes = [route for route, _ in DEFAULT_MIX]
+    weights = [weight for _, weight in DEFAULT_MIX]
+    while time.perf_counter() < stop_at:
+        user = rng.choice(users)
+        route = rng.choices(routes, weights)[0]
+        started = time.perf_counter()
+        try:
+            route, response = await run_request(client, route, user, rng)
+            ok = response.status_code < 400
+        except Exception as e:
+            print(f"{route} failed: {e}", file=sys.stderr)
+            ok = False
+        recorder.add(route, time.perf_counter() - started, ok)
+
+
+async def drive(args, users) -> Recorder:
+    import httpx
+
+    if args.base_url:
+        transport = None
+        base_url = args.base_url
+    else:
+        from app.main import app
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://benchmark"
+
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=60, limits=limits) as client:
+        start = time.perf_counter()
+        warmup_end = start + args.warmup
+        stop_at = warmup_end + args.duration
+
+        async def start_recording():
+            await asyncio.sleep(args.warmup)
+            recorder.recording = True
+
+        await asyncio.gather(
+            start_recording(),
+            *(worker(client, users, recorder, stop_at, random.Random(args.seed + i))
+              for i in range(args.concurrency)),
+        )
+    return recorder
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(recorder: Recorder, duration: float) -> Dict[str, dict]:
+    summary = {}
+    all_latencies = []
+    for route, latencies in sorted(recorder.latencies.items()):
+        values = sorted(latencies)
+        all_latencies.extend(values)
+        summary[route] = _stats(values, recorder.errors[route], duration)
+    summary["total"] = _stats(sorted(all_latencies), sum(recorder.errors.values()), duration)
+    return summary
+
+
+def _stats(values: List[float], errors: int, duration: float) -> dict:
+    return {
+        "requests": len(values),
+        "errors": errors,
+        "rps": round(len(values) / duration, 2),
+        "p50_ms": round(percentile(values, 50) * 1000, 3),
+        "p95_ms": round(percentile(values, 95) * 1000, 3),
+        "p99_ms": round(percentile(values, 99) * 1000, 3),
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_table(routes: Dict[str, dict]) -> None:
+    print(f"\n{'route':<10}{'requests':>10}{'errors':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for route, stats in routes.items():
+        print(f"{route:<10}{stats['requests']:>10}{stats['errors']:>8}{stats['rps']:>10.1f}"
+              f"{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}")
+
+
+def compare(current: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> bool:
+    """Print changes against a baseline. Returns True if any route regressed."""
+    regressed = False
+    print(f"\nComparison with baseline (regression threshold {threshold:.0f}%):")
+    for route, stats in current.items():
+        before = baseline.get(route)
+        if not before:
+            continue
+        changes = []
+        for metric, higher_is_better in (("rps", True), ("p50_ms", False), ("p95_ms", False), ("p99_ms", False)):
+            if not before[metric]:
+                continue
+            delta = (stats[metric] - before[metric]) / before[metric] * 100
+            worse = -delta if higher_is_better else delta
+            flag = " !" if worse > threshold else ""
+            regressed = regressed or bool(flag)
+            changes.append(f"{metric} {delta:+.1f}%{flag}")
+        print(f"  {route:<10}" + "  ".join(changes))
+    return regressed
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    configure_environment(args)
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    print(f"Seeding {args.users} users x {args.tasks} tasks into {os.environ['DATABASE_URL']} ...")
+    users = seed(args.users, args.tasks)
+
+    print(f"Running for {args.duration:.0f}s with {args.concurrency} clients "
+          f"({'in-process ASGI' if not args.base_url else args.base_url}) ...")
+    recorder = asyncio.run(drive(args, users))
+    routes = summarize(recorder, args.duration)
+    print_table(routes)
+
+    results = {
+        "meta": {
+            "git_revision": git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "database": os.environ["DATABASE_URL"].split(":", 1)[0],
+            "target": args.base_url or "asgi",
+            "users": args.users,
+            "tasks_per_user": args.tasks,
+            "duration_s": args.duration,
+            "concurrency": args.concurrency,
+            "llm_latency_ms": args.llm_latency_ms,
+            "mix": dict(DEFAULT_MIX),
+        },
+        "routes": routes,
+    }
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(routes, baseline["routes"], args.threshold):
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,11 @@
 from app.database import engine
+import app.models  # noqa: F401  (registers the tables with SQLModel.metadata)
 from sqlmodel import SQLModel, text
 
 # Drop existing tables
 with engine.connect() as conn:
+    conn.execute(text("DROP TABLE IF EXISTS task_tombstones CASCADE"))
+    conn.execute(text("DROP TABLE IF EXISTS tasks_archive CASCADE"))
     conn.execute(text("DROP TABLE IF EXISTS tasks CASCADE"))
     conn.execute(text("DROP TABLE IF EXISTS users CASCADE"))
     conn.commit()
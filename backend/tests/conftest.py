@@ -0,0 +1,53 @@
+"""
+Shared fixtures for the backend tests.
+
+Settings are read when `app` is imported, so the environment is set up here
+first: a throwaway SQLite database, the offline chat provider and no
+background jobs. Run from backend/:
+
+    python -m pytest tests
+"""
+import os
+import tempfile
+import uuid
+
+_DB_DIR = tempfile.mkdtemp(prefix="todo-backend-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DB_DIR, 'test.db')}"
+os.environ["JWT_SECRET"] = "test-secret"
+os.environ["ENVIRONMENT"] = "test"
+os.environ["LLM_PROVIDER"] = "local"
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+os.environ["ARCHIVE_ENABLED"] = "false"
+os.environ["TASK_EVENTS_BACKPLANE"] = "false"
+os.environ.pop("DATABASE_READ_URL", None)
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.database import engine
+from app.main import app
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def session(client):
+    with Session(engine) as db_session:
+        yield db_session
+
+
+@pytest.fixture
+def user(client):
+    """A freshly registered user: (user_id, auth headers)."""
+    response = client.post(
+        "/api/auth/register",
+        json={"email": f"user-{uuid.uuid4().hex[:12]}@example.com", "password": "password123"},
+    )
+    assert response.status_code == 201
+    body = response.json()
+    return uuid.UUID(body["user"]["id"]), {"Authorization": f"Bearer {body['token']}"}
@@ -0,0 +1,99 @@
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+from sqlmodel import SQLModel, create_engine
+
+import app.migrations as migrations
+
+
+def _email():
+    return f"Person-{uuid.uuid4().hex[:12]}@Example.com"
+
+
+def test_register_normalizes_email_and_rejects_case_variants(client):
+    email = _email()
+
+    first = client.post("/api/auth/register", json={"email": email, "password": "password123"})
+    again = client.post("/api/auth/register", json={"email": email.upper(), "password": "password123"})
+
+    assert first.status_code == 201
+    assert first.json()["user"]["email"] == email.lower()
+    assert again.status_code == 409
+
+
+def test_concurrent_registrations_create_one_account(client):
+    email = _email()
+
+    def register(_):
+        return client.post("/api/auth/register", json={"email": email, "password": "password123"}).status_code
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        statuses = sorted(pool.map(register, range(6)))
+
+    assert statuses == [201, 409, 409, 409, 409, 409]
+
+
+def test_login_is_case_insensitive(client):
+    email = _email()
+    client.post("/api/auth/register", json={"email": email, "password": "password123"})
+
+    ok = client.post("/api/auth/login", json={"email": email.swapcase(), "password": "password123"})
+    wrong = client.post("/api/auth/login", json={"email": email, "password": "wrong-password"})
+
+    assert ok.status_code == 200 and ok.json()["token"]
+    assert wrong.status_code == 401
+
+
+def test_short_password_is_rejected(client):
+    response = client.post("/api/auth/register", json={"email": _email(), "password": "short"})
+    assert response.status_code == 400
+
+
+@pytest.fixture
+def legacy_users(tmp_path, monkeypatch):
+    """A users table without the lower(email) index, as before emails were normalized."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    SQLModel.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_users_email_lower"))
+    monkeypatch.setattr(migrations, "engine", engine)
+
+    def add(email):
+        with engine.begin() as conn:
+            conn.execute(text(
+                "INSERT INTO users (id, email, password_hash, created_at, updated_at) "
+                "VALUES (:id, :email, 'x', :now, :now)"
+            ), {"id": uuid.uuid4().hex, "email": email, "now": datetime.utcnow()})
+    return engine, add
+
+
+def _index_sql(engine):
+    with engine.connect() as conn:
+        return conn.execute(text(
+            "SELECT sql FROM sqlite_master WHERE name = 'ix_users_email_lower'"
+        )).scalar()
+
+
+def test_email_index_migration_refuses_case_duplicates(legacy_users):
+    engine, add = legacy_users
+    add("Bob@example.com")
+    add("bob@example.com")
+
+    with engine.connect() as conn, pytest.raises(migrations.MigrationError, match="bob@example.com"):
+        migrations._ensure_email_lower_index(conn)
+    assert _index_sql(engine) is None
+
+
+def test_email_index_migration_upgrades_a_non_unique_index(legacy_users):
+    engine, add = legacy_users
+    add("Carol@example.com")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE INDEX ix_users_email_lower ON users (lower(email))"))
+
+    with engine.connect() as conn:
+        migrations._ensure_email_lower_index(conn)
+
+    assert _index_sql(engine).upper().startswith("CREATE UNIQUE INDEX")
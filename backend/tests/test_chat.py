@@ -0,0 +1,122 @@
+import json
+
+import pytest
+
+from app.services.chatbot_service import ChatbotService, _read_json_object, chat_stats
+from app.services.task_service import TaskService
+
+
+def _chat(client, user_id, headers, text):
+    response = client.post(f"/api/{user_id}/chat/message", json={"text": text}, headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+def _tasks(client, user_id, headers):
+    response = client.get(f"/api/{user_id}/tasks/", headers=headers)
+    return {task["title"]: task for task in response.json()["tasks"]}
+
+
+def test_one_message_runs_several_actions_in_order(client, user):
+    user_id, headers = user
+
+    body = _chat(client, user_id, headers, "add milk, eggs and bread #shopping")
+    assert len(body["actions_performed"]) == 3
+    tasks = _tasks(client, user_id, headers)
+    assert sorted(tasks) == ["bread", "eggs", "milk"]
+    assert all(task["tags"] == ["shopping"] for task in tasks.values())
+
+    body = _chat(client, user_id, headers,
+                 f"complete task {tasks['milk']['id']} and delete task {tasks['eggs']['id']}")
+    assert body["actions_performed"] == [
+        f"✓ Marked task {tasks['milk']['id']} as completed",
+        f"✓ Deleted task {tasks['eggs']['id']}",
+    ]
+    tasks = _tasks(client, user_id, headers)
+    assert sorted(tasks) == ["bread", "milk"] and tasks["milk"]["completed"]
+
+
+def test_a_failed_action_does_not_undo_the_others(client, user):
+    user_id, headers = user
+    task_id = client.post(f"/api/{user_id}/tasks/", json={"title": "Call mum"}, headers=headers).json()["id"]
+
+    body = _chat(client, user_id, headers, f"complete task {task_id} and delete task 999999999")
+
+    assert body["actions_performed"] == [f"✓ Marked task {task_id} as completed"]
+    assert "Task 999999999 not found" in body["message"]
+    assert _tasks(client, user_id, headers)["Call mum"]["completed"]
+
+
+def test_a_database_error_rolls_back_every_action(client, user, monkeypatch):
+    user_id, headers = user
+
+    def fail(session, user_id):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(TaskService, "commit_changes", staticmethod(fail))
+    body = _chat(client, user_id, headers, "add milk, eggs and bread")
+    monkeypatch.undo()
+
+    assert body == {"message": "Sorry, I couldn't save those changes. Nothing was changed.",
+                    "actions_performed": None}
+    assert _tasks(client, user_id, headers) == {}
+
+
+@pytest.mark.parametrize("count", [10, 12])
+def test_actions_per_message_are_capped(client, user, count):
+    user_id, headers = user
+
+    body = _chat(client, user_id, headers, "add " + ", ".join(f"item {i}" for i in range(count)))
+
+    assert len(body["actions_performed"]) == 10
+    assert ("Skipped 2 more action(s)" in body["message"]) == (count == 12)
+
+
+def _events(text):
+    events = []
+    for block in filter(None, text.split("\n\n")):
+        event, data = block.split("\n")
+        events.append((event.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+
+def test_streamed_messages_report_progress_then_the_result(client, user):
+    user_id, headers = user
+
+    with client.stream("POST", f"/api/{user_id}/chat/message/stream",
+                       json={"text": "add milk, eggs"}, headers=headers) as response:
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = _events(response.read().decode())
+
+    assert [event for event, _ in events] == ["interpreting", "executing", "result"]
+    assert events[1][1] == {"actions": ["create_task", "create_task"]}
+    assert len(events[2][1]["actions_performed"]) == 2
+    assert sorted(_tasks(client, user_id, headers)) == ["eggs", "milk"]
+
+
+def test_read_json_object_stops_at_the_end_of_the_first_object():
+    chunks = iter(['```json\n{"actions": [{"data": {"text": "a } b {"}', '}]}', "\n```", "never read"])
+
+    text, found = _read_json_object(chunks)
+
+    assert found == '{"actions": [{"data": {"text": "a } b {"}}]}'
+    assert text == '```json\n{"actions": [{"data": {"text": "a } b {"}}]}'
+    assert next(chunks) == "\n```"
+    assert _read_json_object(['{"unfinished": ']) == ('{"unfinished": ', None)
+
+
+@pytest.mark.parametrize("response_text, expected", [
+    ('{"actions": []}', {"actions": []}),
+    ('```json\n{"actions": []}\n```', {"actions": []}),
+    ("Sure! Here you go", {"error": "invalid_request"}),
+    ('[{"action": "list_tasks"}]', {"error": "invalid_request"}),
+])
+def test_model_responses_are_parsed_as_json_objects(response_text, expected):
+    before = chat_stats()
+
+    assert ChatbotService._parse_json_response(response_text) == expected
+
+    failed = "error" in expected
+    after = chat_stats()
+    assert after["parse_failures"] - before["parse_failures"] == failed
+    assert after["parsed"] - before["parsed"] == (not failed)
@@ -0,0 +1,65 @@
+import asyncio
+import gzip
+
+from app.middleware.compression import CompressionMiddleware
+
+_BODY = b'{"tasks":[' + b'{"title":"Buy milk"},' * 200 + b'{}]}'
+
+
+def _app(chunks, content_type=b"application/json", status=200):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": status,
+                    "headers": [(b"content-type", content_type), (b"vary", b"Origin")]})
+        for i, chunk in enumerate(chunks):
+            await send({"type": "http.response.body", "body": chunk, "more_body": i < len(chunks) - 1})
+    return app
+
+
+def _call(app, accept_encoding=b"gzip"):
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    middleware = CompressionMiddleware(app, minimum_size=100, levels={"gzip": 4})
+    scope = {"type": "http", "headers": [(b"accept-encoding", accept_encoding)]}
+    asyncio.run(middleware(scope, None, send))
+    body = b"".join(message.get("body", b"") for message in messages[1:])
+    return dict(messages[0]["headers"]), body
+
+
+def test_negotiation_honours_quality_values():
+    middleware = CompressionMiddleware(None, levels={"gzip": 4})
+
+    assert middleware.choose(b"gzip, deflate") == "gzip"
+    assert middleware.choose(b"*;q=0.5") == "gzip"
+    assert middleware.choose(b"gzip;q=0, *") is None
+    assert middleware.choose(b"identity") is None
+
+
+def test_large_bodies_are_compressed():
+    headers, body = _call(_app([_BODY]))
+
+    assert headers[b"content-encoding"] == b"gzip"
+    assert headers[b"vary"] == b"Origin, Accept-Encoding"
+    assert int(headers[b"content-length"]) == len(body) < len(_BODY)
+    assert gzip.decompress(body) == _BODY
+
+
+def test_streamed_bodies_are_compressed_incrementally():
+    headers, body = _call(_app([_BODY[:500], _BODY[500:], b""]))
+
+    assert headers[b"content-encoding"] == b"gzip"
+    assert b"content-length" not in headers
+    assert gzip.decompress(body) == _BODY
+
+
+def test_small_event_stream_and_unaccepted_responses_are_left_alone():
+    for app, accept_encoding in [
+        (_app([b"{}"]), b"gzip"),
+        (_app([_BODY], content_type=b"text/event-stream"), b"gzip"),
+        (_app([_BODY]), b"identity"),
+    ]:
+        headers, body = _call(app, accept_encoding)
+        assert b"content-encoding" not in headers
+        assert body in (b"{}", _BODY)
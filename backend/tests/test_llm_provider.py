@@ -0,0 +1,24 @@
+import json
+
+import pytest
+
+from app.services.llm_provider import LLMProvider, LocalProvider
+
+
+def test_providers_must_implement_generate():
+    class Incomplete(LLMProvider):
+        name = "incomplete"
+
+    with pytest.raises(TypeError, match="generate"):
+        Incomplete()
+
+
+def test_local_provider_replays_recordings_then_interprets(tmp_path):
+    recordings = tmp_path / "recorded.jsonl"
+    recordings.write_text(json.dumps({"input": "hello", "output": {"error": "invalid_request"}}) + "\n")
+    provider = LocalProvider(str(recordings))
+
+    assert json.loads(provider.generate("system", " hello ")) == {"error": "invalid_request"}
+    assert json.loads(provider.generate("system", "add buy milk"))["actions"][0]["action"] == "create_task"
+    assert "".join(provider.generate_stream("system", "hello")) == '{"error": "invalid_request"}'
+    assert provider.stats()["tokens"]["calls"] == 3
@@ -0,0 +1,123 @@
+import asyncio
+import uuid
+
+import pytest
+
+from app.middleware.rate_limit import MemoryBucketStore, RateLimitMiddleware, RateLimitPolicy, parse_rate
+from app.services.auth_service import create_access_token
+
+
+async def _ok_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+def _call(middleware, path, client="203.0.113.1", headers=()):
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": path,
+        "headers": [(name.encode(), value.encode()) for name, value in headers],
+        "client": (client, 50000),
+    }
+    asyncio.run(middleware(scope, None, send))
+    return messages[0]["status"], dict(messages[0]["headers"])
+
+
+def _middleware(trust_forwarded=False, trusted_proxies=()):
+    policies = [
+        RateLimitPolicy.from_string("login", r"/api/auth/login$", ["POST"], "2/minute"),
+        RateLimitPolicy.from_string("chat", r"/api/[^/]+/chat/", ["POST"], "2/minute", per_user=True),
+    ]
+    return RateLimitMiddleware(_ok_app, policies=policies, store=MemoryBucketStore(),
+                               trust_forwarded=trust_forwarded, trusted_proxies=trusted_proxies)
+
+
+def test_parse_rate():
+    assert parse_rate("10/minute") == (pytest.approx(10 / 60), 10)
+    with pytest.raises(ValueError):
+        parse_rate("ten per minute")
+
+
+def test_limits_are_per_client_ip():
+    middleware = _middleware()
+
+    assert [_call(middleware, "/api/auth/login")[0] for _ in range(3)] == [200, 200, 429]
+    status, headers = _call(middleware, "/api/auth/login")
+    assert status == 429 and int(headers[b"retry-after"]) > 0
+    assert _call(middleware, "/api/auth/login", client="198.51.100.7")[0] == 200
+    # Unmatched routes are never limited
+    assert _call(middleware, "/api/health")[0] == 200
+
+
+def test_forwarded_for_is_ignored_unless_trusted():
+    middleware = _middleware()
+    for i in range(2):
+        _call(middleware, "/api/auth/login", headers=[("x-forwarded-for", f"192.0.2.{i}")])
+
+    # A client cannot dodge the limit by sending its own X-Forwarded-For
+    assert _call(middleware, "/api/auth/login", headers=[("x-forwarded-for", "192.0.2.99")])[0] == 429
+
+
+def test_trusted_forwarded_for_keys_by_the_address_the_proxy_appended():
+    middleware = _middleware(trust_forwarded=True)
+    proxy = "10.0.0.1"
+    for _ in range(2):
+        _call(middleware, "/api/auth/login", client=proxy, headers=[("x-forwarded-for", "192.0.2.1")])
+
+    assert _call(middleware, "/api/auth/login", client=proxy,
+                 headers=[("x-forwarded-for", "192.0.2.1")])[0] == 429
+    assert _call(middleware, "/api/auth/login", client=proxy,
+                 headers=[("x-forwarded-for", "192.0.2.2")])[0] == 200
+
+
+def test_spoofed_forwarded_for_entries_are_still_limited():
+    middleware = _middleware(trust_forwarded=True)
+
+    # The client prepends a different address each time; the proxy appends the real one
+    statuses = [
+        _call(middleware, "/api/auth/login", client="10.0.0.1",
+              headers=[("x-forwarded-for", f"198.51.100.{i}, 192.0.2.1")])[0]
+        for i in range(3)
+    ]
+
+    assert statuses == [200, 200, 429]
+
+
+def test_trusted_proxies_are_skipped_and_others_ignored():
+    middleware = _middleware(trust_forwarded=True, trusted_proxies=["10.0.0.0/8"])
+
+    # Two proxy hops: the edge (10.1.2.3) appended the client, the inner proxy the edge
+    statuses = [
+        _call(middleware, "/api/auth/login", client="10.0.0.1",
+              headers=[("x-forwarded-for", f"198.51.100.{i}, 192.0.2.1, 10.1.2.3")])[0]
+        for i in range(3)
+    ]
+    assert statuses == [200, 200, 429]
+
+    # A peer that is not a trusted proxy is limited by its own address
+    for i in range(2):
+        _call(middleware, "/api/auth/login", client="203.0.113.9", headers=[("x-forwarded-for", f"192.0.2.{50 + i}")])
+    assert _call(middleware, "/api/auth/login", client="203.0.113.9",
+                 headers=[("x-forwarded-for", "192.0.2.99")])[0] == 429
+
+
+def test_chat_is_limited_per_user_not_per_ip():
+    middleware = _middleware()
+    alice = create_access_token(uuid.uuid4(), "alice@example.com")
+    bob = create_access_token(uuid.uuid4(), "bob@example.com")
+    path = "/api/someone/chat/message"
+
+    def chat(token):
+        return _call(middleware, path, headers=[("authorization", f"Bearer {token}")])[0]
+
+    assert [chat(alice) for _ in range(3)] == [200, 200, 429]
+    # Same IP, different user
+    assert chat(bob) == 200
+    # An invalid token falls back to the client IP
+    assert [chat("not-a-token") for _ in range(3)] == [200, 200, 429]
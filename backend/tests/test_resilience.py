@@ -0,0 +1,120 @@
+import time
+
+import pytest
+
+from app.services.llm_provider import LLMProvider, LocalProvider
+from app.services.resilience import CircuitBreaker, CircuitOpenError, ResilientProvider
+
+
+class ScriptedProvider(LLMProvider):
+    """Raises or returns the next scripted outcome on each call."""
+
+    name = "scripted"
+
+    def __init__(self, *outcomes):
+        super().__init__()
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def _next(self):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    def generate(self, system_prompt, message, timeout=None):
+        return self._next()
+
+    def generate_stream(self, system_prompt, message, timeout=None):
+        for chunk in self._next():
+            if isinstance(chunk, Exception):
+                raise chunk
+            yield chunk
+
+
+def _resilient(provider, fallback=None, breaker=None, max_retries=2):
+    return ResilientProvider(provider, fallback=fallback, max_retries=max_retries, base_delay=0,
+                             breaker=breaker or CircuitBreaker(failure_threshold=5))
+
+
+def test_breaker_opens_then_probes_once_and_closes():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()  # one probe at a time
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.allow()
+    assert breaker.opened == 1
+
+
+def test_failed_probe_reopens_the_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+
+    assert breaker.allow()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.allow()
+    assert breaker.opened == 2
+
+
+def test_transient_errors_are_retried():
+    provider = ScriptedProvider(TimeoutError("slow"), ConnectionError("reset"), "{}")
+    resilient = _resilient(provider)
+
+    assert resilient.generate("system", "hi") == "{}"
+    stats = resilient.stats()
+    assert (provider.calls, stats["retries"], stats["timeouts"], stats["successes"]) == (3, 2, 1, 1)
+
+
+def test_other_errors_and_exhausted_retries_are_not_retried():
+    provider = ScriptedProvider(ValueError("bad request"), TimeoutError(), TimeoutError())
+    resilient = _resilient(provider, max_retries=1)
+
+    with pytest.raises(ValueError):
+        resilient.generate("system", "hi")
+    assert provider.calls == 1
+    with pytest.raises(TimeoutError):
+        resilient.generate("system", "hi")
+    assert provider.calls == 3
+    assert resilient.stats()["failures"] == 2
+
+
+def test_open_breaker_rejects_calls_and_uses_the_fallback():
+    provider = ScriptedProvider(ValueError("down"))
+    resilient = _resilient(provider, breaker=CircuitBreaker(failure_threshold=1, reset_timeout=60))
+
+    with pytest.raises(ValueError):
+        resilient.generate("system", "hi")
+    with pytest.raises(CircuitOpenError):
+        resilient.generate("system", "hi")
+    assert provider.calls == 1
+
+    resilient.fallback = LocalProvider()
+    assert '"action"' in resilient.generate("system", "add task buy milk")
+    stats = resilient.stats()
+    assert (stats["breaker"], stats["rejected"], stats["fallbacks"]) == ("open", 2, 1)
+
+
+def test_streams_are_retried_only_before_the_first_chunk():
+    provider = ScriptedProvider(TimeoutError("no first chunk"), ["{", "}"])
+    resilient = _resilient(provider)
+
+    assert "".join(resilient.generate_stream("system", "hi")) == "{}"
+    assert provider.calls == 2
+
+    provider.outcomes.append(["{", ConnectionError("dropped")])
+    with pytest.raises(ConnectionError):
+        list(resilient.generate_stream("system", "hi"))
+    assert provider.calls == 3
+    assert resilient.stats()["failures"] == 1
@@ -0,0 +1,57 @@
+def _search(client, user_id, headers, q):
+    response = client.get(f"/api/{user_id}/tasks/search", params={"q": q}, headers=headers)
+    assert response.status_code == 200
+    return [task["title"] for task in response.json()["tasks"]]
+
+
+def test_search_matches_prefixes_of_title_and_description(client, user):
+    user_id, headers = user
+    client.post(f"/api/{user_id}/tasks/", json={"title": "Buy groceries", "description": "Milk and eggs"},
+                headers=headers)
+    client.post(f"/api/{user_id}/tasks/", json={"title": "Call the plumber"}, headers=headers)
+
+    assert _search(client, user_id, headers, "groc") == ["Buy groceries"]
+    assert _search(client, user_id, headers, "milk") == ["Buy groceries"]
+    assert _search(client, user_id, headers, "PLUM") == ["Call the plumber"]
+    assert _search(client, user_id, headers, "dentist") == []
+
+
+def test_title_matches_rank_above_description_matches(client, user):
+    user_id, headers = user
+    client.post(f"/api/{user_id}/tasks/", json={"title": "Errands", "description": "report for work"},
+                headers=headers)
+    client.post(f"/api/{user_id}/tasks/", json={"title": "Quarterly report"}, headers=headers)
+
+    assert _search(client, user_id, headers, "report") == ["Quarterly report", "Errands"]
+
+
+def test_index_follows_updates_and_deletes(client, user):
+    user_id, headers = user
+    task = client.post(f"/api/{user_id}/tasks/", json={"title": "Renew passport"}, headers=headers).json()
+
+    client.patch(f"/api/{user_id}/tasks/{task['id']}", json={"title": "Renew driving licence"}, headers=headers)
+    assert _search(client, user_id, headers, "passport") == []
+    assert _search(client, user_id, headers, "licence") == ["Renew driving licence"]
+
+    client.delete(f"/api/{user_id}/tasks/{task['id']}", headers=headers)
+    assert _search(client, user_id, headers, "licence") == []
+
+
+def test_search_only_returns_the_users_own_tasks(client, user):
+    user_id, headers = user
+    other = client.post("/api/auth/register", json={"email": f"other-{user_id.hex[:8]}@example.com",
+                                                     "password": "password123"}).json()
+    other_id = other["user"]["id"]
+    client.post(f"/api/{other_id}/tasks/", json={"title": "Secret plans"},
+                headers={"Authorization": f"Bearer {other['token']}"})
+
+    assert _search(client, user_id, headers, "secret") == []
+
+
+def test_query_operators_are_treated_as_text(client, user):
+    user_id, headers = user
+    client.post(f"/api/{user_id}/tasks/", json={"title": "Fix bike"}, headers=headers)
+
+    for query in ['bike" OR "x', "bike*)", "NOT bike", "title:bike", "!!!"]:
+        response = client.get(f"/api/{user_id}/tasks/search", params={"q": query}, headers=headers)
+        assert response.status_code == 200, query
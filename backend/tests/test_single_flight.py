@@ -0,0 +1,128 @@
+import threading
+import time
+import uuid
+
+import pytest
+
+from app.services.single_flight import SingleFlight
+
+
+def _start(target, count):
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight("test", wait_timeout=5)
+    user_id = uuid.uuid4()
+    release = threading.Event()
+    calls = []
+    results = []
+
+    def slow():
+        calls.append(1)
+        release.wait(5)
+        return "rows"
+
+    threads = _start(lambda: results.append(flight.run(user_id, (), slow)), 5)
+    while flight.stats()["coalesced"] < 4:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [1]
+    assert results == ["rows"] * 5
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_followers_get_the_leaders_error():
+    flight = SingleFlight("test", wait_timeout=5)
+    user_id = uuid.uuid4()
+    started, release = threading.Event(), threading.Event()
+    errors = []
+
+    def failing():
+        started.set()
+        release.wait(5)
+        raise RuntimeError("database down")
+
+    def call():
+        try:
+            flight.run(user_id, (), failing)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    leader = _start(call, 1)
+    started.wait(5)
+    followers = _start(call, 2)
+    while flight.stats()["coalesced"] < 2:
+        time.sleep(0.01)
+    release.set()
+    for thread in leader + followers:
+        thread.join()
+
+    assert errors == ["database down"] * 3
+
+
+def test_follower_runs_its_own_call_after_the_wait_timeout():
+    flight = SingleFlight("test", wait_timeout=0.05)
+    user_id = uuid.uuid4()
+    started, release = threading.Event(), threading.Event()
+
+    def stuck():
+        started.set()
+        release.wait(5)
+        return "late"
+
+    leader = _start(lambda: flight.run(user_id, (), stuck), 1)
+    started.wait(5)
+    try:
+        assert flight.run(user_id, (), lambda: "fresh") == "fresh"
+        assert flight.stats()["wait_timeouts"] == 1
+    finally:
+        release.set()
+        leader[0].join()
+
+
+def test_invalidate_detaches_in_flight_calls():
+    flight = SingleFlight("test", wait_timeout=5)
+    user_id = uuid.uuid4()
+    started, release = threading.Event(), threading.Event()
+
+    def before_write():
+        started.set()
+        release.wait(5)
+        return "stale"
+
+    leader = _start(lambda: flight.run(user_id, (), before_write), 1)
+    started.wait(5)
+    flight.invalidate(user_id)
+    try:
+        # A read after the write must not join the call that started before it
+        assert flight.run(user_id, (), lambda: "fresh") == "fresh"
+    finally:
+        release.set()
+        leader[0].join()
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_keys_are_coalesced_separately():
+    flight = SingleFlight("test")
+    user_id = uuid.uuid4()
+    assert flight.run(user_id, (False,), lambda: "live") == "live"
+    assert flight.run(user_id, (True,), lambda: "all") == "all"
+    assert flight.stats()["executed"] == 2
+
+
+@pytest.mark.parametrize("include_archived", [False, True])
+def test_task_list_route_returns_fresh_results(client, user, include_archived):
+    user_id, headers = user
+    client.post(f"/api/{user_id}/tasks/", json={"title": "first"}, headers=headers)
+    params = {"include_archived": include_archived}
+    assert client.get(f"/api/{user_id}/tasks/", params=params, headers=headers).json()["total"] == 1
+
+    client.post(f"/api/{user_id}/tasks/", json={"title": "second"}, headers=headers)
+    assert client.get(f"/api/{user_id}/tasks/", params=params, headers=headers).json()["total"] == 2
@@ -0,0 +1,150 @@
+import asyncio
+import json
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+from sqlmodel import SQLModel, Session, create_engine, select
+
+import app.migrations as migrations
+from app.models.task import Task, TaskArchive
+from app.services.task_events import task_events
+from app.services.task_service import TaskService
+
+
+def _archive_user_tasks(client, session, user_id, headers, titles, complete):
+    """Create tasks, complete some of them 100 days ago and run the archival job."""
+    ids = [client.post(f"/api/{user_id}/tasks/", json={"title": title}, headers=headers).json()["id"]
+           for title in titles]
+    for task_id in complete:
+        client.patch(f"/api/{user_id}/tasks/{ids[task_id]}/complete", headers=headers)
+
+    old = datetime.utcnow() - timedelta(days=100)
+    for task in session.exec(select(Task).where(Task.user_id == user_id, Task.completed == True)):  # noqa: E712
+        task.updated_at = old
+    session.commit()
+
+    while TaskService.archive_completed_tasks(session, datetime.utcnow() - timedelta(days=90)):
+        pass
+    return ids
+
+
+def test_archive_moves_old_completed_tasks(client, session, user):
+    user_id, headers = user
+    ids = _archive_user_tasks(client, session, user_id, headers, ["open", "done"], complete=[1])
+
+    live = client.get(f"/api/{user_id}/tasks/", headers=headers).json()
+    assert [task["id"] for task in live["tasks"]] == [ids[0]]
+    assert session.get(TaskArchive, ids[1]).title == "done"
+
+    everything = client.get(f"/api/{user_id}/tasks/", params={"include_archived": True}, headers=headers).json()
+    assert sorted(task["id"] for task in everything["tasks"]) == sorted(ids)
+
+
+def test_archived_ids_are_not_reused(client, session, user):
+    user_id, headers = user
+    ids = _archive_user_tasks(client, session, user_id, headers, ["a", "archived", "newest"], complete=[1])
+    # Deleting the newest task drops max(id) in tasks below the archived ID
+    client.delete(f"/api/{user_id}/tasks/{ids[2]}", headers=headers)
+
+    new_id = client.post(f"/api/{user_id}/tasks/", json={"title": "new"}, headers=headers).json()["id"]
+
+    assert new_id > max(ids)
+    everything = client.get(f"/api/{user_id}/tasks/", params={"include_archived": True}, headers=headers).json()
+    listed = [task["id"] for task in everything["tasks"]]
+    assert len(listed) == len(set(listed))
+
+
+def test_migration_rebuilds_sqlite_tasks_with_autoincrement(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    SQLModel.metadata.create_all(engine)
+    user_id = uuid.uuid4().hex
+    now = datetime.utcnow().isoformat(sep=" ")
+    with engine.begin() as conn:
+        # The tasks table as created before AUTOINCREMENT was added
+        conn.execute(text("DROP TABLE tasks"))
+        conn.execute(text(
+            "CREATE TABLE tasks (id INTEGER NOT NULL PRIMARY KEY, user_id CHAR(32) NOT NULL, "
+            "title VARCHAR(200) NOT NULL, description VARCHAR, completed BOOLEAN NOT NULL, "
+            "due_date DATE, tags JSON, created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL)"
+        ))
+        conn.execute(text(
+            "INSERT INTO tasks (id, user_id, title, completed, tags, created_at, updated_at) "
+            "VALUES (1, :u, 'live', 0, '[]', :now, :now)"
+        ), {"u": user_id, "now": now})
+        conn.execute(text(
+            "INSERT INTO tasks_archive (id, user_id, title, completed, tags, created_at, updated_at, archived_at) "
+            "VALUES (7, :u, 'archived', 1, '[]', :now, :now, :now)"
+        ), {"u": user_id, "now": now})
+    monkeypatch.setattr(migrations, "engine", engine)
+    with engine.connect() as conn:
+        migrations._ensure_search_index(conn, set(), [])
+
+    migrations.run_migrations()
+    migrations.run_migrations()  # idempotent
+
+    with engine.begin() as conn:
+        assert "AUTOINCREMENT" in conn.execute(text(
+            "SELECT sql FROM sqlite_master WHERE name = 'tasks'"
+        )).scalar().upper()
+        conn.execute(text(
+            "INSERT INTO tasks (user_id, title, completed, tags, created_at, updated_at) "
+            "VALUES (:u, 'brand new', 0, '[]', :now, :now)"
+        ), {"u": user_id, "now": now})
+    with Session(engine) as session:
+        titles = {task.id: task.title for task in session.exec(select(Task))}
+        assert titles == {1: "live", 8: "brand new"}
+        # The FTS triggers were recreated on the rebuilt table
+        assert [task.title for task in TaskService.search_tasks(session, uuid.UUID(user_id), "bran")] == ["brand new"]
+
+
+def test_archived_tasks_are_marked_and_read_only(client, session, user):
+    user_id, headers = user
+    ids = _archive_user_tasks(client, session, user_id, headers, ["open", "done"], complete=[1])
+    archived_id = ids[1]
+
+    everything = client.get(f"/api/{user_id}/tasks/", params={"include_archived": True}, headers=headers).json()
+    assert {task["id"]: task["archived"] for task in everything["tasks"]} == {ids[0]: False, archived_id: True}
+    assert client.get(f"/api/{user_id}/tasks/{archived_id}", headers=headers).json()["archived"] is True
+
+    for method, path, body in [
+        ("PATCH", f"/{archived_id}", {"title": "x"}),
+        ("PUT", f"/{archived_id}", {"title": "x"}),
+        ("PATCH", f"/{archived_id}/complete", None),
+        ("DELETE", f"/{archived_id}", None),
+    ]:
+        response = client.request(method, f"/api/{user_id}/tasks{path}", json=body, headers=headers)
+        assert response.status_code == 409, (method, path)
+    assert client.patch(f"/api/{user_id}/tasks/999999", json={"title": "x"}, headers=headers).status_code == 404
+
+
+def test_delta_sync_drops_archived_tasks(client, session, user):
+    user_id, headers = user
+    since = (datetime.utcnow() - timedelta(minutes=1) - datetime(1970, 1, 1)) // timedelta(microseconds=1)
+    ids = _archive_user_tasks(client, session, user_id, headers, ["open", "done"], complete=[1])
+
+    delta = client.get(f"/api/{user_id}/tasks/changes", params={"since": since}, headers=headers).json()
+    assert delta["deleted"] == [ids[1]]
+    reset = client.get(f"/api/{user_id}/tasks/changes", headers=headers).json()
+    assert [task["id"] for task in reset["tasks"]] == [ids[0]]
+
+
+def test_archiving_notifies_owners_and_invalidates_their_reads(client, session, user):
+    user_id, headers = user
+    task_id = client.post(f"/api/{user_id}/tasks/", json={"title": "done"}, headers=headers).json()["id"]
+    client.patch(f"/api/{user_id}/tasks/{task_id}/complete", headers=headers)
+    assert [task["id"] for task in client.get(f"/api/{user_id}/tasks/", headers=headers).json()["tasks"]] == [task_id]
+    session.get(Task, task_id).updated_at = datetime.utcnow() - timedelta(days=100)
+    session.commit()
+
+    async def scenario():
+        subscription = task_events.subscribe(user_id)
+        try:
+            await asyncio.to_thread(TaskService.archive_completed_tasks, session, datetime.utcnow())
+            event = await asyncio.wait_for(subscription.queue.get(), timeout=2)
+            assert (event.type, json.loads(event.data)) == ("task.deleted", {"id": task_id})
+        finally:
+            task_events.unsubscribe(subscription)
+
+    asyncio.run(scenario())
+    assert client.get(f"/api/{user_id}/tasks/", headers=headers).json()["tasks"] == []
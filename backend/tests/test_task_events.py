@@ -0,0 +1,137 @@
+import asyncio
+import json
+import uuid
+
+from sqlmodel import Session
+
+from app.database import engine
+from app.models.task import TaskCreate
+from app.services.task_events import _PENDING_KEY, TaskEventBroadcaster, _notify_backplane, task_events
+from app.services.task_service import TaskService
+
+
+async def _next(subscription):
+    return await asyncio.wait_for(subscription.queue.get(), timeout=2)
+
+
+def test_events_reach_only_the_users_subscribers():
+    broadcaster = TaskEventBroadcaster()
+    alice, bob = uuid.uuid4(), uuid.uuid4()
+
+    async def scenario():
+        alice_sub = broadcaster.subscribe(alice)
+        bob_sub = broadcaster.subscribe(bob)
+        broadcaster.publish(alice, "task.created", {"id": 1})
+        event = await _next(alice_sub)
+        assert (event.type, json.loads(event.data)) == ("task.created", {"id": 1})
+        assert bob_sub.queue.empty()
+        broadcaster.unsubscribe(alice_sub)
+        broadcaster.unsubscribe(bob_sub)
+        assert broadcaster.subscriber_count() == 0
+
+    asyncio.run(scenario())
+
+
+def test_reconnect_replays_missed_events():
+    broadcaster = TaskEventBroadcaster()
+    user_id = uuid.uuid4()
+
+    async def scenario():
+        first = broadcaster.subscribe(user_id)
+        broadcaster.publish(user_id, "task.created", {"id": 1})
+        seen = await _next(first)
+        broadcaster.unsubscribe(first)
+
+        broadcaster.publish(user_id, "task.updated", {"id": 1})
+        broadcaster.publish(uuid.uuid4(), "task.created", {"id": 2})  # another user
+        broadcaster.publish(user_id, "task.deleted", {"id": 1})
+
+        resumed = broadcaster.subscribe(user_id, last_event_id=seen.id)
+        assert [event.type for event in resumed.backlog] == ["task.updated", "task.deleted"]
+        assert resumed.resync is False
+
+        unknown = broadcaster.subscribe(user_id, last_event_id="otherworker-3")
+        assert unknown.resync is True and unknown.backlog == []
+
+    asyncio.run(scenario())
+
+
+def test_events_fall_out_of_history_and_force_a_resync():
+    broadcaster = TaskEventBroadcaster(history_size=2)
+    user_id = uuid.uuid4()
+
+    async def scenario():
+        first = broadcaster.subscribe(user_id)
+        broadcaster.publish(user_id, "task.created", {"id": 1})
+        seen = await _next(first)
+        for i in range(3):
+            broadcaster.publish(user_id, "task.updated", {"id": i})
+
+        assert broadcaster.subscribe(user_id, last_event_id=seen.id).resync is True
+
+    asyncio.run(scenario())
+
+
+def test_changes_are_published_only_after_commit(user):
+    user_id, _ = user
+
+    async def scenario():
+        subscription = task_events.subscribe(user_id)
+        try:
+            def rolled_back():
+                with Session(engine) as session:
+                    TaskService.create_tasks(session, [TaskCreate(title="never")], user_id, commit=False)
+                    session.rollback()
+
+            def committed():
+                with Session(engine) as session:
+                    return TaskService.create_task(session, TaskCreate(title="Kept"), user_id).id
+
+            await asyncio.to_thread(rolled_back)
+            task_id = await asyncio.to_thread(committed)
+
+            event = await _next(subscription)
+            assert event.type == "task.created"
+            assert json.loads(event.data)["id"] == task_id
+            assert subscription.queue.empty()
+        finally:
+            task_events.unsubscribe(subscription)
+
+    asyncio.run(scenario())
+
+
+def test_backplane_notifies_carry_only_the_task_id(monkeypatch):
+    sent = []
+
+    class RecordingSession:
+        info = {_PENDING_KEY: [(uuid.uuid4(), "task.updated", {"id": 7, "description": "x" * 10000})]}
+
+        def execute(self, statement, params):
+            sent.append(json.loads(params["payload"]))
+
+    monkeypatch.setattr(task_events, "_backplane_engine", engine)
+    _notify_backplane(RecordingSession())
+
+    assert len(sent) == 1 and set(sent[0]) == {"u", "t", "id"}
+    assert sent[0]["id"] == 7
+
+
+def test_backplane_receivers_reload_the_task(user):
+    user_id, _ = user
+    with Session(engine) as session:
+        task_id = TaskService.create_task(session, TaskCreate(title="From another worker"), user_id).id
+
+    async def scenario():
+        broadcaster = TaskEventBroadcaster()
+        subscription = broadcaster.subscribe(user_id)
+        broadcaster._receive(json.dumps({"u": str(user_id), "t": "task.updated", "id": task_id}), engine)
+        broadcaster._receive(json.dumps({"u": str(user_id), "t": "task.deleted", "id": task_id}), engine)
+        broadcaster._receive(json.dumps({"u": str(uuid.uuid4()), "t": "task.updated", "id": task_id}), engine)
+
+        updated, deleted = await _next(subscription), await _next(subscription)
+        assert json.loads(updated.data)["title"] == "From another worker"
+        assert (deleted.type, json.loads(deleted.data)) == ("task.deleted", {"id": task_id})
+        assert subscription.queue.empty()
+        assert len(broadcaster._history) == 2  # the other user does not own the task
+
+    asyncio.run(scenario())
@@ -0,0 +1,67 @@
+from datetime import datetime
+
+from app.services.task_service import _EPOCH, _MICROSECOND
+
+
+def _now_cursor() -> int:
+    return (datetime.utcnow() - _EPOCH) // _MICROSECOND
+
+
+def test_first_sync_is_a_reset(client, user):
+    user_id, headers = user
+    client.post(f"/api/{user_id}/tasks/", json={"title": "Buy milk"}, headers=headers)
+
+    body = client.get(f"/api/{user_id}/tasks/changes", headers=headers).json()
+
+    assert body["reset"] is True
+    assert [task["title"] for task in body["tasks"]] == ["Buy milk"]
+    assert body["cursor"] <= _now_cursor()
+
+
+def test_delta_returns_changes_and_deletions(client, user):
+    user_id, headers = user
+    keep = client.post(f"/api/{user_id}/tasks/", json={"title": "Keep"}, headers=headers).json()
+    drop = client.post(f"/api/{user_id}/tasks/", json={"title": "Drop"}, headers=headers).json()
+    # Cursors trail "now" by the safety window, so start from before the writes
+    since = _now_cursor() - 60 * 1_000_000
+
+    client.patch(f"/api/{user_id}/tasks/{keep['id']}", json={"title": "Kept"}, headers=headers)
+    client.delete(f"/api/{user_id}/tasks/{drop['id']}", headers=headers)
+    body = client.get(f"/api/{user_id}/tasks/changes", params={"since": since}, headers=headers).json()
+
+    assert body["reset"] is False
+    assert [task["title"] for task in body["tasks"]] == ["Kept"]
+    assert body["deleted"] == [drop["id"]]
+
+
+def test_overflowing_cursor_resets(client, user):
+    user_id, headers = user
+
+    response = client.get(
+        f"/api/{user_id}/tasks/changes", params={"since": 10 ** 18}, headers=headers
+    )
+
+    assert response.status_code == 200
+    assert response.json()["reset"] is True
+    assert response.json()["cursor"] <= _now_cursor()
+
+
+def test_future_cursor_is_never_echoed_back(client, user):
+    user_id, headers = user
+    future = _now_cursor() + 3600 * 1_000_000
+
+    body = client.get(f"/api/{user_id}/tasks/changes", params={"since": future}, headers=headers).json()
+
+    assert body["reset"] is True
+    assert body["cursor"] < future
+    assert body["cursor"] <= _now_cursor()
+
+
+def test_cursor_from_a_slightly_fast_clock_does_not_move_forward(client, user):
+    user_id, headers = user
+    since = _now_cursor()
+
+    body = client.get(f"/api/{user_id}/tasks/changes", params={"since": since}, headers=headers).json()
+
+    assert body["reset"] is False
+    assert body["cursor"] <= since
@@ -0,0 +1,95 @@
+"""
+Benchmark for batch task ingestion.
+
+Compares one add_task call per task with add_tasks (batch validation,
+block ID allocation). Both keep the status and search indexes up to date,
+so the figures include indexing:
+- TaskStorage: add_task loop vs add_tasks from a list
+- TaskStorage: add_tasks streamed from a JSON lines file (read_tasks_jsonl)
+- ColumnarTaskStorage, LogTaskStorage and SqliteTaskStorage: add_tasks
+
+One task in every 1000 is invalid (empty title), to include error reporting.
+
+Usage:
+    python benchmarks/bench_bulk_insert.py --tasks 1000000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from models import read_tasks_jsonl
+from storage import TaskStorage
+from compact_storage import ColumnarTaskStorage
+from log_storage import LogTaskStorage
+from sqlite_storage import SqliteTaskStorage
+
+
+def report(label: str, count: int, elapsed: float):
+    print(f"{label:<40}{elapsed:>8.3f} s  {count / elapsed:>12,.0f} tasks/s")
+
+
+def timed(label: str, count: int, func):
+    start = time.perf_counter()
+    result = func()
+    report(label, count, time.perf_counter() - start)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=1_000_000, help="number of tasks")
+    args = parser.parse_args()
+    n = args.tasks
+
+    items = [("" if i % 1000 == 999 else f"Task number {i}", "Imported task description") for i in range(n)]
+    invalid = n // 1000
+    print(f"Bulk insert benchmark: {n:,} tasks ({invalid:,} invalid)\n")
+
+    def add_one_by_one():
+        storage = TaskStorage()
+        for title, description in items:
+            if title:
+                storage.add_task(title, description)
+        return storage
+
+    timed("TaskStorage add_task loop", n, add_one_by_one)
+
+    storage = TaskStorage()
+    result = timed("TaskStorage add_tasks", n, lambda: storage.add_tasks(items))
+    assert result.added == n - invalid and len(result.errors) == invalid
+    timed("  search afterwards", n, lambda: storage.search("task"))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tasks.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            for title, description in items:
+                f.write(json.dumps({"title": title, "description": description}))
+                f.write("\n")
+
+        def import_file():
+            with open(path, encoding="utf-8") as f:
+                return TaskStorage().add_tasks(read_tasks_jsonl(f))
+
+        timed("TaskStorage add_tasks from JSONL", n, import_file)
+        timed("ColumnarTaskStorage add_tasks", n, lambda: ColumnarTaskStorage().add_tasks(items))
+
+        def into_log():
+            with LogTaskStorage(os.path.join(tmp, "tasks.log"), compact_threshold=sys.maxsize) as log:
+                return log.add_tasks(items)
+
+        timed("LogTaskStorage add_tasks", n, into_log)
+
+        def into_sqlite():
+            with SqliteTaskStorage(os.path.join(tmp, "tasks.db")) as db:
+                return db.add_tasks(items)
+
+        timed("SqliteTaskStorage add_tasks", n, into_sqlite)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Contention benchmark for the thread-safe TaskStorage.
+
+Runs 1-32 threads doing a mixed workload against a preloaded store and
+reports aggregate throughput for:
+- ConcurrentTaskStorage (write lock, copy-on-write tasks, snapshot reads)
+- TaskStorage behind one coarse lock around every call (the naive fix)
+
+Workload per operation (by default): 80% get_task, 8% add_task,
+6% toggle_complete, 4% update_task, 2% list pending tasks.
+After each run the store is checked for unique, gap-free IDs and
+counts that match its contents.
+
+Usage:
+    python benchmarks/bench_concurrency.py --tasks 10000 --ops 20000
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from storage import TaskStorage
+from concurrent_storage import ConcurrentTaskStorage
+
+THREAD_COUNTS = (1, 2, 4, 8, 16, 32)
+
+
+class CoarseLockedStorage:
+    """TaskStorage with a single lock held for the whole of every call."""
+
+    def __init__(self):
+        self._storage = TaskStorage()
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        method = getattr(self._storage, name)
+
+        def locked(*args, **kwargs):
+            with self._lock:
+                return method(*args, **kwargs)
+        return locked
+
+    @property
+    def next_id(self):
+        return self._storage.next_id
+
+
+def worker(storage, ops: int, max_id: int, seed: int, barrier: threading.Barrier):
+    rng = random.Random(seed)
+    barrier.wait()
+    for _ in range(ops):
+        roll = rng.random()
+        if roll < 0.80:
+            storage.get_task(rng.randint(1, max_id))
+        elif roll < 0.88:
+            storage.add_task("Concurrent task", "Added by a benchmark thread")
+        elif roll < 0.94:
+            storage.toggle_complete(rng.randint(1, max_id))
+        elif roll < 0.98:
+            storage.update_task(rng.randint(1, max_id), title="Renamed task")
+        else:
+            storage.get_pending_tasks()
+
+
+def run(factory, threads: int, tasks: int, ops: int) -> float:
+    storage = factory()
+    for i in range(tasks):
+        storage.add_task(f"Task number {i}", "Benchmark task description")
+
+    barrier = threading.Barrier(threads + 1)
+    pool = [
+        threading.Thread(target=worker, args=(storage, ops // threads, tasks, seed, barrier))
+        for seed in range(threads)
+    ]
+    for thread in pool:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    all_tasks = storage.get_all_tasks()
+    counts = storage.count_tasks()
+    assert [t["id"] for t in all_tasks] == list(range(1, storage.next_id)), "IDs not unique and gap-free"
+    assert counts["total"] == len(all_tasks)
+    assert counts["completed"] == sum(1 for t in all_tasks if t["completed"])
+
+    return (ops // threads) * threads / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=10_000, help="tasks preloaded before each run")
+    parser.add_argument("--ops", type=int, default=20_000, help="operations per run (split across threads)")
+    args = parser.parse_args()
+
+    print(f"Concurrency benchmark: {args.tasks:,} tasks, {args.ops:,} mixed operations per run\n")
+    print(f"{'threads':>7}  {'concurrent ops/s':>17}  {'coarse lock ops/s':>18}")
+    for threads in THREAD_COUNTS:
+        concurrent = run(ConcurrentTaskStorage, threads, args.tasks, args.ops)
+        coarse = run(CoarseLockedStorage, threads, args.tasks, args.ops)
+        print(f"{threads:>7}  {concurrent:>17,.0f}  {coarse:>18,.0f}")
+
+
+if __name__ == "__main__":
+    main()
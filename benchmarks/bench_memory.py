@@ -0,0 +1,72 @@
+"""
+Memory benchmark for task representations.
+
+Builds N tasks in each representation and reports the memory held per task
+(measured with tracemalloc, title/description strings included):
+- TaskStorage with dict-based Task records (integer epoch-ns timestamps)
+- dict of CompactTask (__slots__, epoch-nanosecond timestamps)
+- ColumnarTaskStorage (struct-of-arrays, bitset flags)
+
+Usage:
+    python benchmarks/bench_memory.py --tasks 1000000
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from storage import TaskStorage
+from compact_storage import CompactTask, ColumnarTaskStorage
+
+
+def build_dict_storage(n: int):
+    storage = TaskStorage()
+    for i in range(n):
+        storage.add_task(f"Task number {i}", "")
+    return storage
+
+
+def build_compact_dict(n: int):
+    tasks = {}
+    for i in range(1, n + 1):
+        tasks[i] = CompactTask(i, f"Task number {i}", "")
+    return tasks
+
+
+def build_columnar_storage(n: int):
+    storage = ColumnarTaskStorage()
+    for i in range(n):
+        storage.add_task(f"Task number {i}", "")
+    return storage
+
+
+def measure(label: str, build, n: int):
+    """Build a representation and print its memory footprint and build time."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build(n)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<32}{current / 1e6:>10.1f} MB{current / n:>10.0f} B/task{elapsed:>9.2f} s")
+    del result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=1_000_000, help="number of tasks")
+    args = parser.parse_args()
+
+    print(f"Memory per representation, {args.tasks:,} tasks (build time under tracemalloc)\n")
+    measure("TaskStorage (dict Task)", build_dict_storage, args.tasks)
+    measure("dict[int, CompactTask]", build_compact_dict, args.tasks)
+    measure("ColumnarTaskStorage", build_columnar_storage, args.tasks)
+
+
+if __name__ == "__main__":
+    main()
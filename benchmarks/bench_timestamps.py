@@ -0,0 +1,98 @@
+"""
+Benchmark for integer task timestamps.
+
+Compares the old ISO-string timestamps (datetime.now().isoformat() on every
+mutation) with epoch nanoseconds from time.time_ns():
+- cost and allocation of generating one timestamp
+- bulk insert into TaskStorage: time and memory held per task, with the
+  timestamp generator swapped for the ISO one as the baseline
+- sorting tasks by creation time (ISO strings must be parsed back)
+
+Usage:
+    python benchmarks/bench_timestamps.py --tasks 200000
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+import models
+from storage import TaskStorage
+
+
+def iso_now() -> str:
+    return datetime.now().isoformat()
+
+
+def measure(func):
+    """
+    Run func twice: timed, then under tracemalloc (which slows it down).
+
+    Returns:
+        (result, seconds, bytes still allocated by the traced run)
+    """
+    gc.collect()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    del result
+
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, held
+
+
+def bulk_insert(n: int, clock) -> TaskStorage:
+    """Fill a TaskStorage, with create_task's clock swapped for `clock`."""
+    original = models.time.time_ns
+    models.time.time_ns = clock
+    try:
+        storage = TaskStorage()
+        for i in range(n):
+            storage.add_task(f"Task number {i}", "")
+        return storage
+    finally:
+        models.time.time_ns = original
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=200_000, help="number of tasks")
+    args = parser.parse_args()
+    n = args.tasks
+
+    print(f"Timestamp benchmark: {n:,} tasks\n")
+
+    print("Generate one timestamp:")
+    for label, clock in (("datetime.now().isoformat()", iso_now), ("time.time_ns()", time.time_ns)):
+        values, elapsed, held = measure(lambda: [clock() for _ in range(n)])
+        print(f"  {label:<28}{elapsed / n * 1e9:>8.0f} ns  {held / n:>6.0f} B held")
+        del values
+
+    print("\nBulk insert into TaskStorage:")
+    tasks = {}
+    for label, clock in (("ISO strings", iso_now), ("epoch ns", time.time_ns)):
+        storage, elapsed, held = measure(lambda: bulk_insert(n, clock))
+        print(f"  {label:<28}{n / elapsed:>10,.0f} tasks/s  {held / n:>6.0f} B/task")
+        # Keep only the task dicts: a live search index would slow later runs' GC
+        tasks[label] = list(storage.tasks.values())
+        del storage
+
+    print("\nSort by creation time:")
+    iso_tasks, ns_tasks = tasks["ISO strings"], tasks["epoch ns"]
+    _, elapsed, _ = measure(lambda: sorted(iso_tasks, key=lambda t: datetime.fromisoformat(t["created_at"])))
+    print(f"  {'ISO strings (parsed)':<28}{elapsed * 1000:>8.1f} ms")
+    _, elapsed, _ = measure(lambda: sorted(ns_tasks, key=lambda t: t["created_at"]))
+    print(f"  {'epoch ns':<28}{elapsed * 1000:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+"""
+Batch Command-Line Interface
+
+Non-interactive subcommands for scripting, working on the same storage
+backends as the interactive menu:
+
+    python src/main.py --db tasks.db add "Buy milk" -d "2 liters"
+    python src/main.py --db tasks.db list --json
+    python src/main.py --db tasks.db list --sort updated --since 2025-12-01 --reverse
+    python src/main.py --db tasks.db done 3 5 7
+    python src/main.py --db tasks.db import tasks.jsonl
+    python src/main.py --db tasks.db --stdin < commands.txt
+
+With --stdin, every input line is one subcommand (shell-quoted, e.g.
+`add "Buy milk"`), all applied in one process; throughput is reported on
+stderr when the input is exhausted.
+"""
+
+import argparse
+import json
+import shlex
+import sys
+import time
+from typing import TextIO
+from models import (
+    validate_title,
+    truncate_description,
+    format_task_display,
+    export_task,
+    iso_to_timestamp,
+    read_tasks_jsonl
+)
+from storage import TaskStorage
+
+_STATUS_FILTERS = {"pending": False, "completed": True}
+
+# list --sort choice -> timestamp field
+_SORT_FIELDS = {"created": "created_at", "updated": "updated_at"}
+
+
+class CommandError(Exception):
+    """A subcommand could not be parsed."""
+
+
+class _CommandParser(argparse.ArgumentParser):
+    """ArgumentParser that raises CommandError instead of exiting."""
+
+    def error(self, message):
+        raise CommandError(message)
+
+
+def add_subcommands(parser: argparse.ArgumentParser, parser_class=None):
+    """
+    Register the batch subcommands on a parser.
+
+    Args:
+        parser: Parser to extend
+        parser_class: ArgumentParser subclass for the subcommand parsers
+    """
+    kwargs = {"parser_class": parser_class} if parser_class else {}
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND", **kwargs)
+
+    add = commands.add_parser("add", help="add a task")
+    add.add_argument("title", help="task title")
+    add.add_argument("-d", "--description", default="", help="task description")
+
+    list_ = commands.add_parser("list", help="list tasks")
+    list_.add_argument("--json", action="store_true", help="print tasks as a JSON array")
+    status = list_.add_mutually_exclusive_group()
+    status.add_argument("--pending", dest="status", action="store_const", const="pending",
+                        help="only pending tasks")
+    status.add_argument("--completed", dest="status", action="store_const", const="completed",
+                        help="only completed tasks")
+    list_.add_argument("--sort", choices=("id", *_SORT_FIELDS), default="id",
+                       help="sort order (default: id)")
+    list_.add_argument("--reverse", action="store_true", help="newest (highest) first")
+    list_.add_argument("--since", type=_parse_time, metavar="DATE",
+                       help="only tasks created (or updated, with --sort updated) at or after DATE (ISO format)")
+    list_.add_argument("--until", type=_parse_time, metavar="DATE",
+                       help="only tasks created (or updated, with --sort updated) before DATE (ISO format)")
+
+    done = commands.add_parser("done", help="mark tasks complete")
+    done.add_argument("ids", nargs="+", type=int, metavar="ID", help="task IDs")
+
+    undone = commands.add_parser("undone", help="mark tasks incomplete")
+    undone.add_argument("ids", nargs="+", type=int, metavar="ID", help="task IDs")
+
+    delete = commands.add_parser("delete", help="delete tasks")
+    delete.add_argument("ids", nargs="+", type=int, metavar="ID", help="task IDs")
+
+    import_ = commands.add_parser("import", help="add tasks from a JSON lines file")
+    import_.add_argument("file", help='file with one {"title": ..., "description": ...} '
+                                      'object per line ("-" for stdin)')
+
+
+def run_command(storage: TaskStorage, args: argparse.Namespace, out: TextIO = sys.stdout,
+                err: TextIO = sys.stderr, quiet: bool = False) -> int:
+    """
+    Run one parsed subcommand.
+
+    Args:
+        storage: Task storage instance
+        args: Parsed arguments (args.command names the subcommand)
+        out: Stream for command output
+        err: Stream for error messages
+        quiet: Suppress confirmations (listings are still printed)
+
+    Returns:
+        Number of errors (0 on success)
+    """
+    if args.command == "add":
+        return _add(storage, args.title, args.description, out, err, quiet)
+    if args.command == "list":
+        return _list(storage, args, out)
+    if args.command in ("done", "undone"):
+        return _set_completed(storage, args.ids, args.command == "done", out, err, quiet)
+    if args.command == "delete":
+        return _delete(storage, args.ids, out, err, quiet)
+    if args.command == "import":
+        return _import(storage, args.file, out, err, quiet)
+    raise CommandError(f"unknown command '{args.command}'")
+
+
+def run_stdin(storage: TaskStorage, stdin: TextIO = sys.stdin, out: TextIO = sys.stdout,
+              err: TextIO = sys.stderr, quiet: bool = False) -> int:
+    """
+    Apply newline-delimited subcommands from a stream.
+
+    Blank lines and lines starting with '#' are skipped. Invalid lines are
+    reported on `err` and do not stop processing.
+
+    Args:
+        storage: Task storage instance
+        stdin: Command stream
+        out: Stream for command output
+        err: Stream for error messages and the throughput summary
+        quiet: Suppress confirmations
+
+    Returns:
+        Number of errors (0 on success)
+    """
+    parser = _CommandParser(prog="", add_help=False)
+    add_subcommands(parser, _CommandParser)
+
+    applied = errors = 0
+    start = time.perf_counter()
+
+    for line_number, line in enumerate(stdin, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            args = parser.parse_args(shlex.split(line))
+            if args.command is None:
+                raise CommandError("missing command")
+            if args.command == "import" and args.file == "-":
+                raise CommandError("import from stdin is not available in --stdin mode")
+            errors += run_command(storage, args, out, err, quiet)
+        except (CommandError, ValueError) as e:
+            err.write(f"line {line_number}: {e}\n")
+            errors += 1
+        applied += 1
+
+    elapsed = time.perf_counter() - start
+    rate = applied / elapsed if elapsed > 0 else 0.0
+    err.write(f"Applied {applied} commands in {elapsed:.3f} s ({rate:,.0f} commands/s), {errors} errors\n")
+    return errors
+
+
+def _add(storage, title, description, out, err, quiet) -> int:
+    is_valid, error_msg = validate_title(title)
+    if not is_valid:
+        err.write(f"Error: {error_msg}\n")
+        return 1
+
+    task = storage.add_task(title, truncate_description(description))
+    if not quiet:
+        out.write(f"✓ Added task {task['id']}: {task['title']}\n")
+    return 0
+
+
+def _parse_time(value: str) -> int:
+    try:
+        return iso_to_timestamp(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid ISO date/time: '{value}'")
+
+
+def _list(storage, args: argparse.Namespace, out) -> int:
+    completed = _STATUS_FILTERS.get(args.status)
+
+    if args.sort == "id" and args.since is None and args.until is None:
+        tasks = storage.iter_tasks(completed)
+        if args.reverse:
+            tasks = reversed(list(tasks))
+    else:
+        tasks = storage.get_tasks_by_time(
+            _SORT_FIELDS.get(args.sort, "created_at"), args.since, args.until,
+            newest_first=args.reverse
+        )
+        if args.sort == "id":
+            tasks.sort(key=lambda task: task["id"], reverse=args.reverse)
+        if completed is not None:
+            tasks = [task for task in tasks if task["completed"] == completed]
+
+    if args.json:
+        # Streamed element by element, so large lists are never held as one string
+        out.write("[")
+        for index, task in enumerate(tasks):
+            out.write(",\n" if index else "\n")
+            out.write(json.dumps(export_task(task), ensure_ascii=False))
+        out.write("\n]\n")
+        return 0
+
+    for task in tasks:
+        out.write(format_task_display(task))
+        out.write("\n")
+    return 0
+
+
+def _set_completed(storage, task_ids, completed: bool, out, err, quiet) -> int:
+    errors = 0
+    for task_id in task_ids:
+        task = storage.get_task(task_id)
+        if not task:
+            err.write(f"Error: Task with ID {task_id} not found.\n")
+            errors += 1
+            continue
+        if task["completed"] != completed:
+            storage.toggle_complete(task_id)
+        if not quiet:
+            out.write(f"✓ Task {task_id} marked as {'complete' if completed else 'incomplete'}\n")
+    return errors
+
+
+def _delete(storage, task_ids, out, err, quiet) -> int:
+    errors = 0
+    for task_id in task_ids:
+        if storage.delete_task(task_id) is None:
+            err.write(f"Error: Task with ID {task_id} not found.\n")
+            errors += 1
+        elif not quiet:
+            out.write(f"✓ Deleted task {task_id}\n")
+    return errors
+
+
+def _import(storage, path: str, out, err, quiet) -> int:
+    try:
+        # Binary, decoded line by line: a bad line is reported, not fatal
+        source = getattr(sys.stdin, "buffer", sys.stdin) if path == "-" else open(path, "rb")
+    except OSError as e:
+        err.write(f"Error: cannot open {path}: {e.strerror}\n")
+        return 1
+    read_errors: list[tuple[int, str]] = []
+    try:
+        # Streamed: read, validated and inserted in batches
+        result = storage.add_tasks(read_tasks_jsonl(_decoded_lines(source, read_errors)))
+    finally:
+        if path != "-":
+            source.close()
+
+    errors = sorted(result.errors + read_errors)
+    for position, message in errors:
+        err.write(f"{path}:{position + 1}: {message}\n")
+
+    if not quiet:
+        out.write(f"✓ Imported {result.added} tasks ({len(errors)} skipped)\n")
+    return len(errors)
+
+
+def _decoded_lines(source, errors: list):
+    """
+    Yield the lines of `source` as text, one item per line.
+
+    A line that is not valid UTF-8 is recorded in `errors` as
+    (position, message) and yielded blank (skipped by validation, keeping
+    positions aligned); a read error is recorded and ends the stream.
+    """
+    position = 0
+    try:
+        for line in source:
+            if isinstance(line, bytes):
+                try:
+                    line = line.decode("utf-8")
+                except UnicodeDecodeError as e:
+                    errors.append((position, f"Line is not valid UTF-8 (byte {e.start})."))
+                    line = ""
+            yield line
+            position += 1
+    except (OSError, UnicodeDecodeError) as e:
+        # Lines already read are imported; the rest of the file is not
+        errors.append((position, f"Read error, import stopped: {e}"))
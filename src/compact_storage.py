@@ -0,0 +1,464 @@
+"""
+Compact Task Representations
+
+Memory-lean alternatives to the dict-based Task for large in-memory stores:
+
+- CompactTask: a __slots__ record with integer epoch-nanosecond timestamps.
+  It is a MutableMapping, so code that reads task["title"] keeps working.
+- ColumnarTaskStorage: a struct-of-arrays store with the TaskStorage API.
+  IDs and timestamps live in array('q') columns, completion and deletion
+  flags in bitsets; tasks are materialized as CompactTask on access.
+  Keyword search uses the same inverted index as TaskStorage, keyed by
+  task ID so it survives row reclamation.
+
+See benchmarks/bench_memory.py for a comparison at 1M tasks.
+"""
+
+import time
+from array import array
+from bisect import bisect_left
+from collections.abc import MutableMapping
+from typing import Iterable, Iterator, Optional
+from models import coerce_timestamp
+from storage import TIME_FIELDS, BatchResult, SearchIndex, add_in_batches
+
+_PLAIN_FIELDS = ("id", "title", "description", "completed")
+_TIMESTAMP_FIELDS = {"created_at": "created_ns", "updated_at": "updated_ns"}
+_FIELDS = _PLAIN_FIELDS + tuple(_TIMESTAMP_FIELDS)
+
+# Rows skipped per step when seeking to a page (a multiple of 8, so steps
+# start on a bitset byte)
+_SEEK_ROWS = 4096
+
+
+class CompactTask(MutableMapping):
+    """
+    Slotted task record, indexable like the Task dict.
+
+    Timestamps are epoch nanoseconds, stored as created_ns/updated_ns and
+    read as task["created_at"] / task["updated_at"] like a Task dict.
+    """
+
+    __slots__ = ("id", "title", "description", "completed", "created_ns", "updated_ns")
+
+    def __init__(self, id: int, title: str, description: str = "", completed: bool = False,
+                 created_ns: Optional[int] = None, updated_ns: Optional[int] = None):
+        now = time.time_ns() if created_ns is None else created_ns
+        self.id = id
+        self.title = title
+        self.description = description
+        self.completed = completed
+        self.created_ns = now
+        self.updated_ns = now if updated_ns is None else updated_ns
+
+    def __getitem__(self, key: str):
+        if key in _PLAIN_FIELDS:
+            return getattr(self, key)
+        if key in _TIMESTAMP_FIELDS:
+            return getattr(self, _TIMESTAMP_FIELDS[key])
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value):
+        if key in _PLAIN_FIELDS:
+            setattr(self, key, value)
+        elif key in _TIMESTAMP_FIELDS:
+            setattr(self, _TIMESTAMP_FIELDS[key], coerce_timestamp(value))
+        else:
+            raise KeyError(key)
+
+    def __delitem__(self, key: str):
+        raise TypeError("Task fields cannot be deleted")
+
+    def __iter__(self):
+        return iter(_FIELDS)
+
+    def __len__(self) -> int:
+        return len(_FIELDS)
+
+    def __repr__(self) -> str:
+        return f"CompactTask({dict(self)!r})"
+
+
+def _bit(bits: bytearray, index: int) -> bool:
+    return bool(bits[index >> 3] & (1 << (index & 7)))
+
+
+def _set_bit(bits: bytearray, index: int, value: bool):
+    if value:
+        bits[index >> 3] |= 1 << (index & 7)
+    else:
+        bits[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+
+
+class ColumnarTaskStorage:
+    """
+    Struct-of-arrays task storage with the same API as TaskStorage.
+
+    Rows are kept in ID order (IDs are monotonic), so lookups are a binary
+    search over the `ids` column. Deleted rows are flagged and reclaimed
+    once they make up half of the store.
+
+    Tasks returned are CompactTask snapshots: change them through the
+    storage methods, not by mutating the returned objects.
+    """
+
+    def __init__(self):
+        """Initialize empty task storage."""
+        self.ids = array("q")
+        self.titles: list[str] = []
+        self.descriptions: list[str] = []
+        self.created = array("q")
+        self.updated = array("q")
+        self.completed_bits = bytearray()
+        self.deleted_bits = bytearray()
+        self.next_id: int = 1
+        self._deleted = 0
+        self._completed = 0
+        self._search_index = SearchIndex()
+
+    def _row(self, task_id: int) -> Optional[int]:
+        row = bisect_left(self.ids, task_id)
+        if row < len(self.ids) and self.ids[row] == task_id and not _bit(self.deleted_bits, row):
+            return row
+        return None
+
+    def _task(self, row: int) -> CompactTask:
+        return CompactTask(
+            self.ids[row],
+            self.titles[row],
+            self.descriptions[row],
+            _bit(self.completed_bits, row),
+            self.created[row],
+            self.updated[row]
+        )
+
+    def add_task(self, title: str, description: str = "") -> CompactTask:
+        """
+        Add a new task to storage.
+
+        Args:
+            title: Task title (already validated)
+            description: Task description (already validated)
+
+        Returns:
+            Created task
+        """
+        row = len(self.ids)
+        now = time.time_ns()
+        self.ids.append(self.next_id)
+        self.titles.append(title)
+        self.descriptions.append(description)
+        self.created.append(now)
+        self.updated.append(now)
+        if row % 8 == 0:
+            self.completed_bits.append(0)
+            self.deleted_bits.append(0)
+        self._search_index.add(self.next_id, title, description)
+        self.next_id += 1
+        return self._task(row)
+
+    def add_tasks(self, items: Iterable) -> BatchResult:
+        """
+        Validate and add many tasks at once.
+
+        Valid items are appended to the columns a batch at a time, under a
+        consecutive block of IDs.
+
+        Args:
+            items: Title strings, (title, description) pairs or dicts;
+                can be a stream such as read_tasks_jsonl(file)
+
+        Returns:
+            Number of tasks added and errors as (position, message)
+        """
+        return add_in_batches(items, self._insert_batch)
+
+    def _insert_batch(self, items: list[tuple[str, str]]) -> range:
+        first = self.next_id
+        ids = range(first, first + len(items))
+        self.next_id = ids.stop
+
+        now = time.time_ns()
+        self.ids.extend(ids)
+        self.titles.extend(title for title, _ in items)
+        self.descriptions.extend(description for _, description in items)
+        self.created.extend([now] * len(items))
+        self.updated.extend([now] * len(items))
+        # Bitsets grow to cover the new rows (new rows are pending, not deleted)
+        size = (len(self.ids) + 7) // 8
+        self.completed_bits.extend(bytes(size - len(self.completed_bits)))
+        self.deleted_bits.extend(bytes(size - len(self.deleted_bits)))
+        index_text = self._search_index.add
+        for task_id, (title, description) in zip(ids, items):
+            index_text(task_id, title, description)
+        return ids
+
+    def get_task(self, task_id: int) -> Optional[CompactTask]:
+        """
+        Get a task by ID.
+
+        Args:
+            task_id: Task ID to retrieve
+
+        Returns:
+            Task if found, None otherwise
+        """
+        row = self._row(task_id)
+        return None if row is None else self._task(row)
+
+    def iter_tasks(self, completed: Optional[bool] = None) -> Iterator[CompactTask]:
+        """
+        Iterate over tasks in order of creation (by ID).
+
+        Args:
+            completed: True for completed tasks only, False for pending
+                only, None for all tasks
+
+        Yields:
+            Tasks, sorted by ID
+        """
+        for row in range(len(self.ids)):
+            if _bit(self.deleted_bits, row):
+                continue
+            if completed is None or _bit(self.completed_bits, row) == completed:
+                yield self._task(row)
+
+    def get_all_tasks(self) -> list[CompactTask]:
+        """
+        Get all tasks in order of creation (by ID).
+
+        Returns:
+            List of all tasks, sorted by ID
+        """
+        return list(self.iter_tasks())
+
+    def get_pending_tasks(self) -> list[CompactTask]:
+        """
+        Get incomplete tasks in order of creation (by ID).
+
+        Returns:
+            List of pending tasks, sorted by ID
+        """
+        return list(self.iter_tasks(completed=False))
+
+    def get_completed_tasks(self) -> list[CompactTask]:
+        """
+        Get completed tasks in order of creation (by ID).
+
+        Returns:
+            List of completed tasks, sorted by ID
+        """
+        return list(self.iter_tasks(completed=True))
+
+    def get_tasks_page(self, offset: int, limit: int, completed: Optional[bool] = None) -> list[CompactTask]:
+        """
+        Get one page of tasks in order of creation (by ID).
+
+        Rows before the page are skipped _SEEK_ROWS at a time by counting
+        bits in the flag bitsets, not visited one by one.
+
+        Args:
+            offset: Number of matching tasks to skip
+            limit: Maximum number of tasks to return
+            completed: True for completed tasks only, False for pending
+                only, None for all tasks
+
+        Returns:
+            Tasks, sorted by ID
+        """
+        if offset < 0 or limit <= 0:
+            return []
+        rows = len(self.ids)
+        start = 0
+        while start < rows:
+            end = min(start + _SEEK_ROWS, rows)
+            deleted = int.from_bytes(self.deleted_bits[start >> 3:(end + 7) >> 3], "little")
+            done = int.from_bytes(self.completed_bits[start >> 3:(end + 7) >> 3], "little")
+            if completed is None:
+                matching = end - start - deleted.bit_count()
+            elif completed:
+                matching = (done & ~deleted).bit_count()
+            else:
+                matching = end - start - (done | deleted).bit_count()
+            if matching > offset:
+                break
+            offset -= matching
+            start = end
+
+        page = []
+        for row in range(start, rows):
+            if _bit(self.deleted_bits, row):
+                continue
+            if completed is not None and _bit(self.completed_bits, row) != completed:
+                continue
+            if offset:
+                offset -= 1
+                continue
+            page.append(self._task(row))
+            if len(page) == limit:
+                break
+        return page
+
+    def get_tasks_by_time(self, field: str = "created_at", since: Optional[int] = None,
+                          until: Optional[int] = None, newest_first: bool = False) -> list[CompactTask]:
+        """
+        Get tasks sorted (and optionally filtered) by a timestamp.
+
+        Args:
+            field: "created_at" or "updated_at"
+            since: Only tasks with field >= since (epoch nanoseconds)
+            until: Only tasks with field < until (epoch nanoseconds)
+            newest_first: Sort descending instead of ascending
+
+        Returns:
+            Matching tasks, ties broken by ID
+
+        Raises:
+            ValueError: If field is not a timestamp field
+        """
+        if field not in TIME_FIELDS:
+            raise ValueError(f"Cannot sort by '{field}' (expected one of {', '.join(TIME_FIELDS)})")
+
+        # Sort row numbers on the integer column; build tasks only for matches
+        column = self.created if field == "created_at" else self.updated
+        low = since if since is not None else -1
+        high = until if until is not None else float("inf")
+        rows = [
+            row for row in range(len(self.ids))
+            if not _bit(self.deleted_bits, row) and low <= column[row] < high
+        ]
+        rows.sort(key=column.__getitem__, reverse=newest_first)
+        return [self._task(row) for row in rows]
+
+    def update_task(self, task_id: int, title: Optional[str] = None,
+                    description: Optional[str] = None) -> Optional[CompactTask]:
+        """
+        Update a task's title and/or description.
+
+        Args:
+            task_id: Task ID to update
+            title: New title (None to keep current)
+            description: New description (None to keep current)
+
+        Returns:
+            Updated task if found, None otherwise
+        """
+        row = self._row(task_id)
+        if row is None:
+            return None
+
+        if title is not None or description is not None:
+            self._search_index.remove(task_id, self.titles[row], self.descriptions[row])
+            if title is not None:
+                self.titles[row] = title
+            if description is not None:
+                self.descriptions[row] = description
+            self._search_index.add(task_id, self.titles[row], self.descriptions[row])
+        self.updated[row] = time.time_ns()
+
+        return self._task(row)
+
+    def delete_task(self, task_id: int) -> Optional[CompactTask]:
+        """
+        Delete a task from storage.
+
+        Note: Deleted task IDs are NEVER reused.
+
+        Args:
+            task_id: Task ID to delete
+
+        Returns:
+            Deleted task if found, None otherwise
+        """
+        row = self._row(task_id)
+        if row is None:
+            return None
+
+        task = self._task(row)
+        self._search_index.remove(task_id, task.title, task.description)
+        _set_bit(self.deleted_bits, row, True)
+        self.titles[row] = self.descriptions[row] = ""
+        self._deleted += 1
+        if task.completed:
+            self._completed -= 1
+
+        if self._deleted * 2 > len(self.ids):
+            self._reclaim()
+
+        return task
+
+    def toggle_complete(self, task_id: int) -> Optional[CompactTask]:
+        """
+        Toggle a task's completion status.
+
+        Args:
+            task_id: Task ID to toggle
+
+        Returns:
+            Updated task if found, None otherwise
+        """
+        row = self._row(task_id)
+        if row is None:
+            return None
+
+        completed = not _bit(self.completed_bits, row)
+        _set_bit(self.completed_bits, row, completed)
+        self._completed += 1 if completed else -1
+        self.updated[row] = time.time_ns()
+
+        return self._task(row)
+
+    def search(self, query: str) -> list[CompactTask]:
+        """
+        Find tasks whose title or description contains every query word.
+
+        Each query word matches any indexed word it is a prefix of, so
+        "gro" finds "groceries". Matching is case-insensitive.
+
+        Args:
+            query: Search text
+
+        Returns:
+            Matching tasks, sorted by ID (empty if the query has no words)
+        """
+        return [self._task(self._row(task_id)) for task_id in self._search_index.lookup(query)]
+
+    def count_tasks(self) -> dict[str, int]:
+        """
+        Count total, completed, and pending tasks.
+
+        Returns:
+            Dictionary with counts: {"total": n, "completed": n, "pending": n}
+        """
+        total = len(self.ids) - self._deleted
+        return {
+            "total": total,
+            "completed": self._completed,
+            "pending": total - self._completed
+        }
+
+    def is_empty(self) -> bool:
+        """
+        Check if storage is empty.
+
+        Returns:
+            True if no tasks exist, False otherwise
+        """
+        return len(self.ids) == self._deleted
+
+    def _reclaim(self):
+        """Rebuild the columns without deleted rows."""
+        live = [row for row in range(len(self.ids)) if not _bit(self.deleted_bits, row)]
+        completed = [_bit(self.completed_bits, row) for row in live]
+
+        self.ids = array("q", (self.ids[row] for row in live))
+        self.titles = [self.titles[row] for row in live]
+        self.descriptions = [self.descriptions[row] for row in live]
+        self.created = array("q", (self.created[row] for row in live))
+        self.updated = array("q", (self.updated[row] for row in live))
+        self.completed_bits = bytearray((len(live) + 7) // 8)
+        self.deleted_bits = bytearray((len(live) + 7) // 8)
+        for row, is_completed in enumerate(completed):
+            if is_completed:
+                _set_bit(self.completed_bits, row, True)
+        self._deleted = 0
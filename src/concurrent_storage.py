@@ -0,0 +1,274 @@
+"""
+Thread-Safe Task Storage
+
+TaskStorage for embedding in multi-threaded programs:
+
+- One write lock serializes mutations, including ID allocation, so IDs
+  stay unique and in insertion order
+- Task records are copy-on-write: a stored task dict is never modified
+  after it is published, writers replace it with an updated copy
+- Listings are immutable TaskViews (all, pending, completed) that writers
+  derive from the previous ones and swap in as one unit; a view is stored
+  in chunks, so a write copies one chunk instead of the whole list
+- get_task(), listings and count_tasks() never take the lock: readers
+  never wait for writers and never see a half-applied change
+- search() holds the lock only for the index lookup itself
+
+See benchmarks/bench_concurrency.py for throughput under contention.
+"""
+
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from itertools import chain, islice
+from operator import itemgetter
+from typing import Iterable, Iterator, Optional
+from models import Task, create_task
+from storage import TaskStorage
+
+# Target tasks per TaskView chunk; a chunk is split once it doubles
+_CHUNK_SIZE = 512
+
+_task_id = itemgetter("id")
+
+
+class TaskView(Sequence):
+    """
+    Immutable sequence of tasks in ID order.
+
+    Tasks are held in tuples of up to about _CHUNK_SIZE, so the with_task,
+    without and extended methods build an updated view by copying one
+    chunk and the chunk list, never every task.
+    """
+
+    __slots__ = ("_chunks", "_first_ids", "_length")
+
+    def __init__(self, chunks: Iterable[tuple[Task, ...]] = ()):
+        self._chunks = tuple(chunks)
+        self._first_ids = tuple(chunk[0]["id"] for chunk in self._chunks)
+        self._length = sum(map(len, self._chunks))
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[Task]:
+        return chain.from_iterable(self._chunks)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            if step != 1:
+                return tuple(self)[index]
+            return tuple(islice(self._iter_from(start), max(stop - start, 0)))
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("TaskView index out of range")
+        for chunk in self._chunks:
+            if index < len(chunk):
+                return chunk[index]
+            index -= len(chunk)
+
+    def __repr__(self) -> str:
+        return f"TaskView({len(self)} tasks)"
+
+    def _iter_from(self, start: int) -> Iterator[Task]:
+        """Iterate from position start, skipping whole chunks before it."""
+        for index, chunk in enumerate(self._chunks):
+            if start < len(chunk):
+                return chain(islice(chunk, start, None), chain.from_iterable(self._chunks[index + 1:]))
+            start -= len(chunk)
+        return iter(())
+
+    def with_task(self, task: Task) -> "TaskView":
+        """A view with task added, or replacing the task with the same ID."""
+        chunks = list(self._chunks)
+        task_id = task["id"]
+        if not chunks or (task_id > chunks[-1][-1]["id"] and len(chunks[-1]) >= _CHUNK_SIZE):
+            chunks.append((task,))
+            return TaskView(chunks)
+
+        index = max(bisect_right(self._first_ids, task_id) - 1, 0)
+        chunk = chunks[index]
+        position = bisect_left(chunk, task_id, key=_task_id)
+        replaced = position < len(chunk) and chunk[position]["id"] == task_id
+        chunk = chunk[:position] + (task,) + chunk[position + replaced:]
+        if len(chunk) > 2 * _CHUNK_SIZE:
+            chunks[index:index + 1] = [chunk[:_CHUNK_SIZE], chunk[_CHUNK_SIZE:]]
+        else:
+            chunks[index] = chunk
+        return TaskView(chunks)
+
+    def without(self, task_id: int) -> "TaskView":
+        """A view without the task with this ID (this view if it has none)."""
+        index = bisect_right(self._first_ids, task_id) - 1
+        if index < 0:
+            return self
+        chunk = self._chunks[index]
+        position = bisect_left(chunk, task_id, key=_task_id)
+        if position == len(chunk) or chunk[position]["id"] != task_id:
+            return self
+        chunks = list(self._chunks)
+        chunk = chunk[:position] + chunk[position + 1:]
+        if chunk:
+            chunks[index] = chunk
+        else:
+            del chunks[index]
+        return TaskView(chunks)
+
+    def extended(self, tasks: Iterable[Task]) -> "TaskView":
+        """A view with tasks appended (their IDs must follow every ID in the view)."""
+        chunks = list(self._chunks)
+        tasks = iter(tasks)
+        if chunks and len(chunks[-1]) < _CHUNK_SIZE:
+            chunks[-1] += tuple(islice(tasks, _CHUNK_SIZE - len(chunks[-1])))
+        while chunk := tuple(islice(tasks, _CHUNK_SIZE)):
+            chunks.append(chunk)
+        return TaskView(chunks)
+
+
+class ConcurrentTaskStorage(TaskStorage):
+    """
+    TaskStorage that is safe to share between threads.
+
+    Returned tasks and views are shared, read-only snapshots: change them
+    through the storage methods, never by mutating the returned dicts.
+    """
+
+    def __init__(self):
+        """Initialize empty task storage."""
+        super().__init__()
+        self._lock = threading.Lock()
+        # (all, pending, completed), replaced as a whole by every write
+        self._views: tuple[TaskView, TaskView, TaskView] = (TaskView(), TaskView(), TaskView())
+
+    # ----- Writes -----
+
+    def add_task(self, title: str, description: str = "") -> Task:
+        # Build the record outside the lock; only ID allocation and
+        # publishing need to be serialized
+        task = create_task(0, title, description)
+        with self._lock:
+            task["id"] = self.next_id
+            self.next_id += 1
+            self._insert_task(task)
+            self._publish(task)
+        return task
+
+    def _insert_batch(self, items: list[tuple[str, str]]) -> range:
+        # add_tasks validates each batch before this, outside the lock
+        with self._lock:
+            ids = super()._insert_batch(items)
+            tasks = list(map(self.tasks.__getitem__, ids))
+            all_tasks, pending, completed = self._views
+            self._views = (all_tasks.extended(tasks), pending.extended(tasks), completed)
+        return ids
+
+    def update_task(self, task_id: int, title: Optional[str] = None,
+                    description: Optional[str] = None) -> Optional[Task]:
+        now = time.time_ns()
+        with self._lock:
+            old = self.tasks.get(task_id)
+            if old is None:
+                return None
+            task = dict(old)
+            self._set_text(task, title, description)
+            task["updated_at"] = now
+            self.tasks[task_id] = task
+            self._publish(task, old)
+        return task
+
+    def delete_task(self, task_id: int) -> Optional[Task]:
+        with self._lock:
+            task = self._remove_task(task_id)
+            if task is not None:
+                all_tasks, pending, completed = self._views
+                if task["completed"]:
+                    completed = completed.without(task_id)
+                else:
+                    pending = pending.without(task_id)
+                self._views = (all_tasks.without(task_id), pending, completed)
+        return task
+
+    def toggle_complete(self, task_id: int) -> Optional[Task]:
+        now = time.time_ns()
+        with self._lock:
+            old = self.tasks.get(task_id)
+            if old is None:
+                return None
+            task = dict(old)
+            self._set_completed(task, not task["completed"])
+            task["updated_at"] = now
+            self.tasks[task_id] = task
+            self._publish(task, old)
+        return task
+
+    def _publish(self, task: Task, old: Optional[Task] = None):
+        """Swap in views containing task (replacing old); called under the lock."""
+        all_tasks, pending, completed = self._views
+        if old is not None and old["completed"] != task["completed"]:
+            if old["completed"]:
+                completed = completed.without(task["id"])
+            else:
+                pending = pending.without(task["id"])
+        if task["completed"]:
+            completed = completed.with_task(task)
+        else:
+            pending = pending.with_task(task)
+        self._views = (all_tasks.with_task(task), pending, completed)
+
+    # ----- Reads -----
+
+    def get_task(self, task_id: int) -> Optional[Task]:
+        # A single dict lookup is atomic, and published tasks never change
+        return self.tasks.get(task_id)
+
+    def snapshot(self, completed: Optional[bool] = None) -> TaskView:
+        """
+        Get a consistent view of the tasks with the given status.
+
+        Views are published by writers, so this never takes the lock and
+        the view never changes afterwards.
+
+        Args:
+            completed: True for completed tasks only, False for pending
+                only, None for all tasks
+
+        Returns:
+            Tasks, sorted by ID
+        """
+        all_tasks, pending, done = self._views
+        if completed is None:
+            return all_tasks
+        return done if completed else pending
+
+    def get_all_tasks(self) -> list[Task]:
+        return list(self.snapshot())
+
+    def get_pending_tasks(self) -> list[Task]:
+        return list(self.snapshot(completed=False))
+
+    def get_completed_tasks(self) -> list[Task]:
+        return list(self.snapshot(completed=True))
+
+    def iter_tasks(self, completed: Optional[bool] = None) -> Iterator[Task]:
+        return iter(self.snapshot(completed))
+
+    def get_tasks_page(self, offset: int, limit: int, completed: Optional[bool] = None) -> list[Task]:
+        if offset < 0 or limit <= 0:
+            return []
+        return list(self.snapshot(completed)[offset:offset + limit])
+
+    def search(self, query: str) -> list[Task]:
+        # The index sets are mutated in place by writers
+        with self._lock:
+            return super().search(query)
+
+    def count_tasks(self) -> dict[str, int]:
+        # All three views come from the same write
+        all_tasks, pending, completed = self._views
+        return {"total": len(all_tasks), "completed": len(completed), "pending": len(pending)}
+
+    def is_empty(self) -> bool:
+        return not self._views[0]
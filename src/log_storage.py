@@ -0,0 +1,260 @@
+"""
+Persistent Task Storage (append-only log)
+
+Keeps the in-memory TaskStorage but records every change as a compact
+record in an append-only log, so tasks survive restarts.
+
+- Every add/update/delete/toggle appends one JSON-array line to the log
+- fsync is batched: every `sync_every` records or `sync_interval` seconds
+  (and on close), trading a small window of recent changes on power loss
+  for write throughput
+- On startup the latest snapshot is loaded and the log tail replayed
+- When the log grows past `compact_threshold` records, a new snapshot is
+  written atomically and the log is truncated
+- Records are idempotent (they set values rather than flip them), so
+  replaying a log that was already folded into a snapshot is harmless
+- The snapshot stores next_id, so deleted task IDs are never reused
+- Timestamps are epoch nanoseconds; ISO strings written by older
+  versions are converted on load
+"""
+
+import json
+import os
+import time
+from typing import Optional
+from models import Task, coerce_timestamp
+from storage import TaskStorage
+
+# Record layouts (first element is the record type):
+#   ["a", id, title, description, created_at]      add
+#   ["u", id, title|null, description|null, ts]    update
+#   ["c", id, completed, ts]                        set completion status
+#   ["d", id]                                       delete
+_ADD, _UPDATE, _COMPLETE, _DELETE = "a", "u", "c", "d"
+
+_SEPARATORS = (",", ":")
+# JSON string literal encoder (non-ASCII kept as is, like ensure_ascii=False)
+_quote = json.encoder.encode_basestring
+
+
+class LogTaskStorage(TaskStorage):
+    """
+    TaskStorage persisted to an append-only log plus periodic snapshots.
+
+    Files:
+    - <path>           append-only change log
+    - <path>.snapshot  full state as of the last compaction
+    """
+
+    def __init__(self, path: str, sync_every: int = 64, sync_interval: float = 1.0,
+                 compact_threshold: int = 100_000):
+        """
+        Open (or create) a persistent task store.
+
+        Args:
+            path: Log file path
+            sync_every: fsync after this many records
+            sync_interval: fsync when this many seconds passed since the last one
+            compact_threshold: Compact once the log holds this many records
+                (and more records than there are tasks)
+        """
+        super().__init__()
+        self.path = path
+        self.snapshot_path = path + ".snapshot"
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.compact_threshold = compact_threshold
+
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._log_records = 0
+        self._needs_newline = False
+
+        self._load_snapshot()
+        self._replay_log()
+        self._log = open(self.path, "a", encoding="utf-8")
+        if self._needs_newline:
+            self._log.write("\n")
+
+    # ----- TaskStorage API -----
+
+    def add_task(self, title: str, description: str = "") -> Task:
+        task = super().add_task(title, description)
+        self._append([_ADD, task["id"], title, description, task["created_at"]])
+        return task
+
+    def update_task(self, task_id: int, title: Optional[str] = None,
+                    description: Optional[str] = None) -> Optional[Task]:
+        task = super().update_task(task_id, title, description)
+        if task:
+            self._append([_UPDATE, task_id, title, description, task["updated_at"]])
+        return task
+
+    def delete_task(self, task_id: int) -> Optional[Task]:
+        task = super().delete_task(task_id)
+        if task:
+            self._append([_DELETE, task_id])
+        return task
+
+    def toggle_complete(self, task_id: int) -> Optional[Task]:
+        task = super().toggle_complete(task_id)
+        if task:
+            self._append([_COMPLETE, task_id, task["completed"], task["updated_at"]])
+        return task
+
+    # ----- Durability -----
+
+    def sync(self):
+        """Flush buffered records and fsync the log."""
+        self._log.flush()
+        os.fsync(self._log.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        """Sync and close the log."""
+        if not self._log.closed:
+            self.sync()
+            self._log.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def compact(self):
+        """Write a snapshot of the current state and truncate the log."""
+        self.sync()
+
+        snapshot = {
+            "next_id": self.next_id,
+            "tasks": [
+                [t["id"], t["title"], t["description"], t["completed"], t["created_at"], t["updated_at"]]
+                for t in self.tasks.values()
+            ],
+        }
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, separators=_SEPARATORS, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        _fsync_dir(self.snapshot_path)
+
+        # A crash before this truncation just replays already-snapshotted
+        # (idempotent) records on the next start.
+        self._log.close()
+        self._log = open(self.path, "w", encoding="utf-8")
+        self.sync()
+        self._log_records = 0
+
+    def _insert_batch(self, items: list[tuple[str, str]]) -> range:
+        ids = super()._insert_batch(items)
+        created_at = self.tasks[ids.start]["created_at"]
+        # Same layout as json.dumps of the add record, formatted directly
+        quote = _quote
+        self._write_records("".join([
+            f'["{_ADD}",{task_id},{quote(title)},{quote(description)},{created_at}]\n'
+            for task_id, (title, description) in zip(ids, items)
+        ]), len(items))
+        return ids
+
+    def _append(self, record: list):
+        self._write_records(json.dumps(record, separators=_SEPARATORS, ensure_ascii=False) + "\n", 1)
+
+    def _write_records(self, text: str, count: int):
+        """Write `count` encoded records in one call, then sync/compact if due."""
+        self._log.write(text)
+        self._unsynced += count
+        self._log_records += count
+
+        if (self._unsynced >= self.sync_every
+                or time.monotonic() - self._last_sync >= self.sync_interval):
+            self.sync()
+
+        if self._log_records >= self.compact_threshold and self._log_records > len(self.tasks):
+            self.compact()
+
+    # ----- Recovery -----
+
+    def _load_snapshot(self):
+        if not os.path.exists(self.snapshot_path):
+            return
+
+        with open(self.snapshot_path, encoding="utf-8") as f:
+            snapshot = json.load(f)
+
+        self.next_id = snapshot["next_id"]
+        for task_id, title, description, completed, created_at, updated_at in snapshot["tasks"]:
+            self._insert_task(Task(
+                id=task_id,
+                title=title,
+                description=description,
+                completed=completed,
+                created_at=coerce_timestamp(created_at),
+                updated_at=coerce_timestamp(updated_at)
+            ))
+
+    def _replay_log(self):
+        if not os.path.exists(self.path):
+            return
+
+        valid_end = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Torn write from a crash: keep everything before it
+                    break
+                self._apply(record)
+                valid_end += len(line)
+                self._log_records += 1
+                self._needs_newline = not line.endswith(b"\n")
+
+        if valid_end < os.path.getsize(self.path):
+            with open(self.path, "r+b") as f:
+                f.truncate(valid_end)
+
+    def _apply(self, record: list):
+        kind, task_id = record[0], record[1]
+
+        if kind == _ADD:
+            _, _, title, description, created_at = record
+            created_at = coerce_timestamp(created_at)
+            self._insert_task(Task(
+                id=task_id,
+                title=title,
+                description=description,
+                completed=False,
+                created_at=created_at,
+                updated_at=created_at
+            ))
+            self.next_id = max(self.next_id, task_id + 1)
+            return
+
+        task = self.tasks.get(task_id)
+        if kind == _DELETE:
+            self._remove_task(task_id)
+        elif task is None:
+            return
+        elif kind == _UPDATE:
+            _, _, title, description, updated_at = record
+            self._set_text(task, title, description)
+            task["updated_at"] = coerce_timestamp(updated_at)
+        elif kind == _COMPLETE:
+            _, _, completed, updated_at = record
+            self._set_completed(task, completed)
+            task["updated_at"] = coerce_timestamp(updated_at)
+
+
+def _fsync_dir(path: str):
+    """fsync the directory containing path so a rename is durable (POSIX only)."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -6,25 +6,102 @@ Command-line todo application with menu-driven interface.
 Implements: @specs/constitution.md and @specs/overview.md
 """
 
+import argparse
+import sys
 from storage import TaskStorage
+from cli import add_subcommands, run_command, run_stdin
 from ui import (
     show_main_menu,
     add_task_ui,
     view_tasks_ui,
     update_task_ui,
     delete_task_ui,
-    mark_complete_ui
+    mark_complete_ui,
+    search_tasks_ui
 )
 
 
-def main():
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    Parse command-line options.
+
+    Args:
+        argv: Arguments to parse (defaults to sys.argv)
+
+    Returns:
+        Parsed options
+    """
+    parser = argparse.ArgumentParser(description="Todo App - Phase I")
+    backend = parser.add_mutually_exclusive_group()
+    backend.add_argument(
+        "--log",
+        metavar="PATH",
+        help="persist tasks to an append-only log at PATH (default: in-memory only)"
+    )
+    backend.add_argument(
+        "--db",
+        metavar="PATH",
+        help="store tasks in the SQLite database at PATH (default: in-memory only)"
+    )
+    parser.add_argument(
+        "--stdin",
+        action="store_true",
+        help="apply newline-delimited commands from standard input, then exit"
+    )
+    parser.add_argument(
+        "-q", "--quiet",
+        action="store_true",
+        help="suppress confirmations in batch mode"
+    )
+    add_subcommands(parser)
+    return parser.parse_args(argv)
+
+
+def create_storage(args: argparse.Namespace) -> TaskStorage:
+    """
+    Create the storage backend selected on the command line.
+
+    Args:
+        args: Parsed command-line options
+
+    Returns:
+        Task storage instance
+    """
+    if args.log:
+        from log_storage import LogTaskStorage
+        return LogTaskStorage(args.log)
+    if args.db:
+        from sqlite_storage import SqliteTaskStorage
+        return SqliteTaskStorage(args.db)
+    return TaskStorage()
+
+
+def main(argv=None) -> int:
     """
     Main application loop.
 
-    Displays menu and handles user choices until exit.
+    Runs a batch command if one was given on the command line (or
+    --stdin), otherwise displays the menu and handles user choices until
+    exit.
+
+    Returns:
+        Exit status (non-zero if a batch command reported errors)
     """
+    args = parse_args(argv)
+
     # Initialize storage
-    storage = TaskStorage()
+    storage = create_storage(args)
+
+    if args.stdin or args.command:
+        try:
+            if args.stdin:
+                errors = run_stdin(storage, quiet=args.quiet)
+            else:
+                errors = run_command(storage, args, quiet=args.quiet)
+        finally:
+            if hasattr(storage, "close"):
+                storage.close()
+        return 1 if errors else 0
 
     # Welcome message
     print("\n" + "="*50)
@@ -32,7 +109,22 @@ def main():
     print("  Spec-Driven Development with Claude Code")
     print("="*50)
 
-    # Main loop
+    try:
+        run_menu(storage)
+    finally:
+        # Persistent backends flush pending writes on exit
+        if hasattr(storage, "close"):
+            storage.close()
+    return 0
+
+
+def run_menu(storage: TaskStorage):
+    """
+    Run the interactive menu until the user exits.
+
+    Args:
+        storage: Task storage instance
+    """
     while True:
         choice = show_main_menu()
 
@@ -47,13 +139,15 @@ def main():
         elif choice == 5:
             mark_complete_ui(storage)
         elif choice == 6:
+            search_tasks_ui(storage)
+        elif choice == 7:
             print("\n✓ Thank you for using Todo App!")
             print("Goodbye!\n")
             break
         else:
-            print("\n❌ Invalid choice. Please enter a number from 1 to 6.\n")
+            print("\n❌ Invalid choice. Please enter a number from 1 to 7.\n")
             input("Press Enter to continue...")
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
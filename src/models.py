@@ -6,8 +6,14 @@ Defines the Task data structure and validation logic according to:
 - @specs/features/*.md
 """
 
+import json
+import re
+import time
 from datetime import datetime
-from typing import TypedDict
+from typing import Iterable, Iterator, TypedDict, Union
+
+# Search tokens: runs of letters/digits (underscore counts as a separator)
+_TOKEN_RE = re.compile(r"[^\W_]+")
 
 class Task(TypedDict):
     """
@@ -18,15 +24,18 @@ class Task(TypedDict):
         title: Task title (1-200 characters, required)
         description: Task description (0-1000 characters, optional)
         completed: Completion status (default: False)
-        created_at: Creation timestamp (ISO format)
-        updated_at: Last update timestamp (ISO format)
+        created_at: Creation timestamp (epoch nanoseconds)
+        updated_at: Last update timestamp (epoch nanoseconds)
+
+    Timestamps are kept as integers from time.time_ns(): cheap to create
+    and to sort. Use timestamp_to_iso() / export_task() to display them.
     """
     id: int
     title: str
     description: str
     completed: bool
-    created_at: str
-    updated_at: str
+    created_at: int
+    updated_at: int
 
 
 def create_task(task_id: int, title: str, description: str = "") -> Task:
@@ -41,7 +50,7 @@ def create_task(task_id: int, title: str, description: str = "") -> Task:
     Returns:
         Task object with all required fields
     """
-    now = datetime.now().isoformat()
+    now = time.time_ns()
 
     return Task(
         id=task_id,
@@ -53,6 +62,76 @@ def create_task(task_id: int, title: str, description: str = "") -> Task:
     )
 
 
+def iso_to_timestamp(value: str) -> int:
+    """
+    Convert an ISO-format local timestamp to integer epoch nanoseconds.
+
+    Args:
+        value: Timestamp as produced by datetime.isoformat()
+
+    Returns:
+        Nanoseconds since the Unix epoch (microsecond precision)
+    """
+    moment = datetime.fromisoformat(value)
+    return int(moment.replace(microsecond=0).timestamp()) * 1_000_000_000 + moment.microsecond * 1000
+
+
+def coerce_timestamp(value: Union[int, str]) -> int:
+    """
+    Read a stored timestamp, accepting the ISO strings older data used.
+
+    Args:
+        value: Epoch nanoseconds, or an ISO-format local timestamp
+
+    Returns:
+        Nanoseconds since the Unix epoch
+    """
+    return iso_to_timestamp(value) if isinstance(value, str) else value
+
+
+def timestamp_to_iso(value: int) -> str:
+    """
+    Convert integer epoch nanoseconds to an ISO-format local timestamp.
+
+    Args:
+        value: Nanoseconds since the Unix epoch
+
+    Returns:
+        Timestamp string, as datetime.isoformat() would produce
+    """
+    seconds, nanos = divmod(value, 1_000_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=nanos // 1000).isoformat()
+
+
+def export_task(task: Task) -> dict:
+    """
+    Convert a task to a JSON-ready dict with ISO-format timestamps.
+
+    Args:
+        task: Task to export
+
+    Returns:
+        Plain dict with the task's fields
+    """
+    exported = dict(task)
+    exported["created_at"] = timestamp_to_iso(task["created_at"])
+    exported["updated_at"] = timestamp_to_iso(task["updated_at"])
+    return exported
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Split text into normalized search tokens.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        Lowercased (casefolded) words, in order of appearance
+    """
+    return _TOKEN_RE.findall(text.casefold())
+
+
 def validate_title(title: str) -> tuple[bool, str]:
     """
     Validate task title according to spec.
@@ -120,6 +199,95 @@ def truncate_description(description: str) -> str:
     return description[:1000] if len(description) > 1000 else description
 
 
+# Placeholder for an input line that is not valid JSON (see read_tasks_jsonl)
+_INVALID_RECORD = object()
+
+_INVALID_RECORD_MESSAGE = 'Invalid task record (expected a JSON object with a "title").'
+
+
+def validate_batch(items: Iterable, start: int = 0) -> tuple[list[tuple[str, str]], list[tuple[int, str]]]:
+    """
+    Validate and truncate a batch of tasks in one pass.
+
+    Applies the validate_title rules to every title and truncates long
+    descriptions (as truncate_description does). Invalid items are
+    reported and skipped; they never abort the batch.
+
+    Items can be:
+    - a title string
+    - a (title, description) pair
+    - a dict with "title" and optional "description" keys
+    - None, which is skipped silently (lets readers keep positions
+      aligned with input lines, e.g. for blank lines)
+
+    Args:
+        items: Tasks to validate
+        start: Position of the first item, used in error reports
+
+    Returns:
+        Tuple of (valid (title, description) pairs, errors), where each
+        error is (position, error_message)
+    """
+    valid: list[tuple[str, str]] = []
+    errors: list[tuple[int, str]] = []
+    add_valid = valid.append
+
+    for position, item in enumerate(items, start):
+        if item is None:
+            continue
+        if type(item) is str:
+            title, description = item, ""
+        elif type(item) is dict:
+            title, description = item.get("title"), item.get("description") or ""
+        elif type(item) is tuple and len(item) == 2:
+            title, description = item
+            description = description or ""
+        else:
+            errors.append((position, _INVALID_RECORD_MESSAGE))
+            continue
+
+        if type(title) is not str or type(description) is not str:
+            errors.append((position, _INVALID_RECORD_MESSAGE))
+            continue
+        # Fast path for the common case; validate_title words the error
+        if not title or len(title) > 200 or title.isspace():
+            errors.append((position, validate_title(title)[1]))
+            continue
+        if len(description) > 1000:
+            description = description[:1000]
+
+        add_valid((title, description))
+
+    return valid, errors
+
+
+def read_tasks_jsonl(lines: Iterable[str]) -> Iterator:
+    """
+    Stream tasks from JSON lines for validate_batch / TaskStorage.add_tasks.
+
+    Yields exactly one item per input line, so item positions map to line
+    numbers (position + 1): blank lines yield None and lines that are not
+    valid JSON yield a placeholder that validation reports as invalid.
+    Every line is parsed on its own, so a bad line never shifts or
+    swallows its neighbours.
+
+    Args:
+        lines: Lines of {"title": ..., "description": ...} objects
+
+    Yields:
+        Parsed records
+    """
+    loads = json.loads
+    for line in lines:
+        if not line.strip():
+            yield None
+            continue
+        try:
+            yield loads(line)
+        except ValueError:
+            yield _INVALID_RECORD
+
+
 def format_task_display(task: Task, show_description: bool = True) -> str:
     """
     Format task for display.
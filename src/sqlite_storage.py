@@ -0,0 +1,442 @@
+"""
+SQLite Task Storage
+
+Implements the TaskStorage interface on top of sqlite3, so the console app
+can manage very large task lists with bounded memory and instant startup.
+
+- WAL journal mode (readers don't block the writer)
+- Constant SQL strings, so sqlite3's statement cache reuses prepared
+  statements
+- AUTOINCREMENT primary key: deleted task IDs are never reused
+- Index on `completed` for status counts and filtered listing
+- FTS5 index on title/description for keyword search, kept in sync by
+  triggers
+- Timestamps stored as INTEGER epoch nanoseconds (databases with ISO
+  text timestamps are converted once on open)
+"""
+
+import sqlite3
+import time
+from typing import Iterable, Iterator, Optional
+from models import Task, coerce_timestamp, tokenize
+from storage import TIME_FIELDS, BatchResult, add_in_batches
+
+_CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    title       TEXT    NOT NULL,
+    description TEXT    NOT NULL DEFAULT '',
+    completed   INTEGER NOT NULL DEFAULT 0,
+    created_at  INTEGER NOT NULL,
+    updated_at  INTEGER NOT NULL
+)"""
+_CREATE_INDEX = "CREATE INDEX IF NOT EXISTS ix_tasks_completed ON tasks (completed)"
+_SCHEMA = f"{_CREATE_TABLE};\n{_CREATE_INDEX};\n"
+
+_CREATE_INSERT_TRIGGER = """CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN
+    INSERT INTO tasks_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+END"""
+
+# External-content FTS5 table: stores only the index, rows come from tasks
+_SEARCH_SCHEMA = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+    title, description,
+    content='tasks', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 0'
+);
+{_CREATE_INSERT_TRIGGER};
+CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN
+    INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+    VALUES ('delete', old.id, old.title, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN
+    INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+    VALUES ('delete', old.id, old.title, old.description);
+    INSERT INTO tasks_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+END;
+"""
+
+_COLUMNS = "id, title, description, completed, created_at, updated_at"
+
+_INSERT = "INSERT INTO tasks (title, description, completed, created_at, updated_at) VALUES (?, ?, 0, ?, ?)"
+_INSERT_WITH_ID = ("INSERT INTO tasks (id, title, description, completed, created_at, updated_at) "
+                   "VALUES (?, ?, ?, 0, ?, ?)")
+_SELECT_ONE = f"SELECT {_COLUMNS} FROM tasks WHERE id = ?"
+_SELECT_ALL = f"SELECT {_COLUMNS} FROM tasks ORDER BY id"
+_SELECT_BY_STATUS = f"SELECT {_COLUMNS} FROM tasks WHERE completed = ? ORDER BY id"
+_SELECT_PAGE = f"SELECT {_COLUMNS} FROM tasks ORDER BY id LIMIT ? OFFSET ?"
+_SELECT_PAGE_BY_STATUS = f"SELECT {_COLUMNS} FROM tasks WHERE completed = ? ORDER BY id LIMIT ? OFFSET ?"
+_UPDATE = ("UPDATE tasks SET title = coalesce(?, title), description = coalesce(?, description), "
+           "updated_at = ? WHERE id = ?")
+_TOGGLE = "UPDATE tasks SET completed = 1 - completed, updated_at = ? WHERE id = ?"
+_DELETE = "DELETE FROM tasks WHERE id = ?"
+_COUNT = "SELECT count(*), coalesce(sum(completed), 0) FROM tasks"
+_NEXT_ID = "SELECT seq FROM sqlite_sequence WHERE name = 'tasks'"
+_HAS_SEARCH_INDEX = "SELECT 1 FROM sqlite_master WHERE name = 'tasks_fts'"
+_REBUILD_SEARCH_INDEX = "INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')"
+_INDEX_RANGE = "INSERT INTO tasks_fts (rowid, title, description) SELECT id, title, description FROM tasks WHERE id >= ?"
+_SCHEMA_VERSION = 1  # 1: integer timestamps
+# (field, newest_first) -> query; bounds are [since, until)
+_SELECT_BY_TIME = {
+    (field, newest_first): (f"SELECT {_COLUMNS} FROM tasks WHERE {field} >= ? AND {field} < ? "
+                            f"ORDER BY {field} {'DESC' if newest_first else 'ASC'}, id")
+    for field in TIME_FIELDS
+    for newest_first in (False, True)
+}
+_MIN_TIMESTAMP, _MAX_TIMESTAMP = -(2 ** 63), 2 ** 63 - 1
+_SEARCH = (f"SELECT {_COLUMNS} FROM tasks WHERE id IN "
+           "(SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH ?) ORDER BY id")
+
+
+def _row_to_task(row: tuple) -> Task:
+    """Convert a result row to a Task."""
+    return Task(
+        id=row[0],
+        title=row[1],
+        description=row[2],
+        completed=bool(row[3]),
+        created_at=row[4],
+        updated_at=row[5]
+    )
+
+
+class SqliteTaskStorage:
+    """
+    SQLite-backed storage with the same API as TaskStorage.
+
+    Tasks returned are snapshots: change them through the storage methods,
+    not by mutating the returned dicts.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (or create) a task database.
+
+        Args:
+            path: Database file path (":memory:" for a temporary database)
+        """
+        self.path = path
+        # Autocommit: each operation is its own transaction
+        self.conn = sqlite3.connect(path, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        rebuilt = self._upgrade_schema()
+
+        # Databases created before search existed get their index built once
+        had_search_index = self.conn.execute(_HAS_SEARCH_INDEX).fetchone() is not None
+        self.conn.executescript(_SEARCH_SCHEMA)
+        if rebuilt or not had_search_index:
+            self.conn.execute(_REBUILD_SEARCH_INDEX)
+
+    @property
+    def next_id(self) -> int:
+        """ID the next added task will receive."""
+        row = self.conn.execute(_NEXT_ID).fetchone()
+        return (row[0] if row else 0) + 1
+
+    def add_task(self, title: str, description: str = "") -> Task:
+        """
+        Add a new task to storage.
+
+        Args:
+            title: Task title (already validated)
+            description: Task description (already validated)
+
+        Returns:
+            Created Task object
+        """
+        now = time.time_ns()
+        cursor = self.conn.execute(_INSERT, (title, description, now, now))
+        return Task(
+            id=cursor.lastrowid,
+            title=title,
+            description=description,
+            completed=False,
+            created_at=now,
+            updated_at=now
+        )
+
+    def add_tasks(self, items: Iterable) -> BatchResult:
+        """
+        Validate and add many tasks at once.
+
+        Each batch of valid items is inserted with executemany in one
+        transaction under a consecutive block of IDs.
+
+        Args:
+            items: Title strings, (title, description) pairs or dicts;
+                can be a stream such as read_tasks_jsonl(file)
+
+        Returns:
+            Number of tasks added and errors as (position, message)
+        """
+        return add_in_batches(items, self._insert_batch)
+
+    def _insert_batch(self, items: list[tuple[str, str]]) -> range:
+        now = time.time_ns()
+        with self.conn:
+            # IMMEDIATE takes the write lock before the IDs are read
+            self.conn.execute("BEGIN IMMEDIATE")
+            first = self.next_id
+            ids = range(first, first + len(items))
+            # Index the batch with one statement instead of a trigger per
+            # row; DDL is transactional, so other connections never see
+            # the trigger missing
+            self.conn.execute("DROP TRIGGER tasks_fts_ai")
+            self.conn.executemany(_INSERT_WITH_ID, (
+                (task_id, title, description, now, now)
+                for task_id, (title, description) in zip(ids, items)
+            ))
+            self.conn.execute(_INDEX_RANGE, (first,))
+            self.conn.execute(_CREATE_INSERT_TRIGGER)
+        return ids
+
+    def get_task(self, task_id: int) -> Optional[Task]:
+        """
+        Get a task by ID.
+
+        Args:
+            task_id: Task ID to retrieve
+
+        Returns:
+            Task if found, None otherwise
+        """
+        row = self.conn.execute(_SELECT_ONE, (task_id,)).fetchone()
+        return _row_to_task(row) if row else None
+
+    def iter_tasks(self, completed: Optional[bool] = None) -> Iterator[Task]:
+        """
+        Iterate over tasks in order of creation (by ID).
+
+        Rows are streamed from a cursor, so memory use does not grow
+        with the number of tasks.
+
+        Args:
+            completed: True for completed tasks only, False for pending
+                only, None for all tasks
+
+        Yields:
+            Tasks, sorted by ID
+        """
+        if completed is None:
+            cursor = self.conn.execute(_SELECT_ALL)
+        else:
+            cursor = self.conn.execute(_SELECT_BY_STATUS, (int(completed),))
+        while True:
+            rows = cursor.fetchmany(1000)
+            if not rows:
+                return
+            for row in rows:
+                yield _row_to_task(row)
+
+    def get_all_tasks(self) -> list[Task]:
+        """
+        Get all tasks in order of creation (by ID).
+
+        Returns:
+            List of all tasks, sorted by ID
+        """
+        return list(self.iter_tasks())
+
+    def get_pending_tasks(self) -> list[Task]:
+        """
+        Get incomplete tasks in order of creation (by ID).
+
+        Returns:
+            List of pending tasks, sorted by ID
+        """
+        return list(self.iter_tasks(completed=False))
+
+    def get_completed_tasks(self) -> list[Task]:
+        """
+        Get completed tasks in order of creation (by ID).
+
+        Returns:
+            List of completed tasks, sorted by ID
+        """
+        return list(self.iter_tasks(completed=True))
+
+    def get_tasks_page(self, offset: int, limit: int, completed: Optional[bool] = None) -> list[Task]:
+        """
+        Get one page of tasks in order of creation (by ID).
+
+        Only the page's rows are fetched (LIMIT/OFFSET); rows before it are
+        skipped inside SQLite, on the primary key or the status index.
+
+        Args:
+            offset: Number of matching tasks to skip
+            limit: Maximum number of tasks to return
+            completed: True for completed tasks only, False for pending
+                only, None for all tasks
+
+        Returns:
+            Tasks, sorted by ID
+        """
+        if offset < 0 or limit <= 0:
+            return []
+        if completed is None:
+            rows = self.conn.execute(_SELECT_PAGE, (limit, offset))
+        else:
+            rows = self.conn.execute(_SELECT_PAGE_BY_STATUS, (int(completed), limit, offset))
+        return [_row_to_task(row) for row in rows]
+
+    def update_task(self, task_id: int, title: Optional[str] = None,
+                    description: Optional[str] = None) -> Optional[Task]:
+        """
+        Update a task's title and/or description.
+
+        Args:
+            task_id: Task ID to update
+            title: New title (None to keep current)
+            description: New description (None to keep current)
+
+        Returns:
+            Updated Task if found, None otherwise
+        """
+        cursor = self.conn.execute(_UPDATE, (title, description, time.time_ns(), task_id))
+        return self.get_task(task_id) if cursor.rowcount else None
+
+    def delete_task(self, task_id: int) -> Optional[Task]:
+        """
+        Delete a task from storage.
+
+        Note: Deleted task IDs are NEVER reused.
+
+        Args:
+            task_id: Task ID to delete
+
+        Returns:
+            Deleted Task if found, None otherwise
+        """
+        task = self.get_task(task_id)
+        if task:
+            self.conn.execute(_DELETE, (task_id,))
+        return task
+
+    def toggle_complete(self, task_id: int) -> Optional[Task]:
+        """
+        Toggle a task's completion status.
+
+        Args:
+            task_id: Task ID to toggle
+
+        Returns:
+            Updated Task if found, None otherwise
+        """
+        cursor = self.conn.execute(_TOGGLE, (time.time_ns(), task_id))
+        return self.get_task(task_id) if cursor.rowcount else None
+
+    def get_tasks_by_time(self, field: str = "created_at", since: Optional[int] = None,
+                          until: Optional[int] = None, newest_first: bool = False) -> list[Task]:
+        """
+        Get tasks sorted (and optionally filtered) by a timestamp.
+
+        Args:
+            field: "created_at" or "updated_at"
+            since: Only tasks with field >= since (epoch nanoseconds)
+            until: Only tasks with field < until (epoch nanoseconds)
+            newest_first: Sort descending instead of ascending
+
+        Returns:
+            Matching tasks, ties broken by ID
+
+        Raises:
+            ValueError: If field is not a timestamp field
+        """
+        if field not in TIME_FIELDS:
+            raise ValueError(f"Cannot sort by '{field}' (expected one of {', '.join(TIME_FIELDS)})")
+
+        bounds = (_MIN_TIMESTAMP if since is None else since, _MAX_TIMESTAMP if until is None else until)
+        return [_row_to_task(row) for row in self.conn.execute(_SELECT_BY_TIME[field, newest_first], bounds)]
+
+    def search(self, query: str) -> list[Task]:
+        """
+        Find tasks whose title or description contains every query word.
+
+        Each query word matches any indexed word it is a prefix of, so
+        "gro" finds "groceries". Matching is case-insensitive.
+
+        Args:
+            query: Search text
+
+        Returns:
+            Matching tasks, sorted by ID (empty if the query has no words)
+        """
+        terms = sorted(set(tokenize(query)))
+        if not terms:
+            return []
+        # Tokens are plain words, so quoting makes them safe FTS5 prefix terms
+        match = " ".join(f'"{term}"*' for term in terms)
+        return [_row_to_task(row) for row in self.conn.execute(_SEARCH, (match,))]
+
+    def count_tasks(self) -> dict[str, int]:
+        """
+        Count total, completed, and pending tasks.
+
+        Returns:
+            Dictionary with counts: {"total": n, "completed": n, "pending": n}
+        """
+        total, completed = self.conn.execute(_COUNT).fetchone()
+        return {
+            "total": total,
+            "completed": completed,
+            "pending": total - completed
+        }
+
+    def is_empty(self) -> bool:
+        """
+        Check if storage is empty.
+
+        Returns:
+            True if no tasks exist, False otherwise
+        """
+        return self.conn.execute("SELECT 1 FROM tasks LIMIT 1").fetchone() is None
+
+    def _upgrade_schema(self) -> bool:
+        """
+        Bring databases written by older versions up to _SCHEMA_VERSION.
+
+        Version 0 stored ISO text timestamps in TEXT columns; SQLite would
+        keep converting integers back to text there, so the table is
+        rebuilt with INTEGER columns (IDs and the ID sequence preserved).
+
+        Returns:
+            True if the tasks table was rebuilt
+        """
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] >= _SCHEMA_VERSION:
+            return False
+
+        columns = {row[1]: row[2] for row in self.conn.execute("PRAGMA table_info(tasks)")}
+        rebuild = columns["created_at"].upper() != "INTEGER"
+
+        with self.conn:
+            self.conn.execute("BEGIN")
+            if rebuild:
+                last_id = self.next_id - 1
+                self.conn.create_function("to_timestamp", 1, coerce_timestamp, deterministic=True)
+                self.conn.execute("ALTER TABLE tasks RENAME TO tasks_v0")
+                self.conn.execute(_CREATE_TABLE)
+                self.conn.execute(
+                    "INSERT INTO tasks (id, title, description, completed, created_at, updated_at) "
+                    "SELECT id, title, description, completed, to_timestamp(created_at), "
+                    "to_timestamp(updated_at) FROM tasks_v0"
+                )
+                # Also drops the old index and search triggers
+                self.conn.execute("DROP TABLE tasks_v0")
+                self.conn.execute(_CREATE_INDEX)
+                self.conn.execute("DELETE FROM sqlite_sequence WHERE name = 'tasks'")
+                self.conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES ('tasks', ?)", (last_id,))
+            self.conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+        return rebuild
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -6,9 +6,154 @@ Manages task storage and CRUD operations according to:
 - @specs/features/*.md
 """
 
-from datetime import datetime
-from typing import Optional
-from models import Task, create_task
+import time
+from bisect import bisect_left, bisect_right, insort
+from heapq import merge
+from itertools import islice
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional
+from models import Task, create_task, tokenize, validate_batch
+
+
+# Task fields that hold timestamps (see get_tasks_by_time)
+TIME_FIELDS = ("created_at", "updated_at")
+
+# Items validated and inserted per step by add_tasks
+BATCH_SIZE = 10_000
+
+
+class BatchResult(NamedTuple):
+    """Outcome of add_tasks."""
+
+    added: int
+    errors: list[tuple[int, str]]  # (position in the input, error message)
+
+
+def add_in_batches(items: Iterable, insert_batch: Callable[[list[tuple[str, str]]], None],
+                   batch_size: int = BATCH_SIZE) -> BatchResult:
+    """
+    Validate items and hand them to insert_batch, BATCH_SIZE at a time.
+
+    Consuming the input in bounded batches keeps memory flat for streamed
+    input (e.g. read_tasks_jsonl over a large file).
+
+    Args:
+        items: Tasks, in any form validate_batch accepts
+        insert_batch: Stores a list of valid (title, description) pairs
+        batch_size: Items per batch
+
+    Returns:
+        Number of tasks added and the per-item errors
+    """
+    iterator = iter(items)
+    added = 0
+    errors: list[tuple[int, str]] = []
+    position = 0
+
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return BatchResult(added, errors)
+        valid, batch_errors = validate_batch(batch, position)
+        if valid:
+            insert_batch(valid)
+        added += len(valid)
+        errors += batch_errors
+        position += len(batch)
+
+
+class SearchIndex:
+    """
+    Inverted index from search tokens to task IDs.
+
+    The sorted token list used for prefix lookups is brought up to date
+    lazily by the next lookup, so bulk loads don't pay for keeping it
+    sorted.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._postings: dict[str, set[int]] = {}
+        self._terms: list[str] = []
+        self._new_terms: list[str] = []
+        self._terms_stale = False
+
+    def add(self, task_id: int, title: str, description: str):
+        """Index a task's title and description."""
+        postings = self._postings
+        for token in set(tokenize(title)).union(tokenize(description)):
+            ids = postings.get(token)
+            if ids is None:
+                postings[token] = ids = set()
+                self._new_terms.append(token)
+            ids.add(task_id)
+
+    def remove(self, task_id: int, title: str, description: str):
+        """Remove a task indexed with this title and description."""
+        postings = self._postings
+        for token in set(tokenize(title)).union(tokenize(description)):
+            ids = postings.get(token)
+            if ids is None:
+                continue
+            ids.discard(task_id)
+            if not ids:
+                del postings[token]
+                self._terms_stale = True
+
+    def lookup(self, query: str) -> list[int]:
+        """
+        Find tasks whose text contains every query word.
+
+        Each query word matches any indexed word it is a prefix of.
+
+        Args:
+            query: Search text
+
+        Returns:
+            Matching task IDs, sorted (empty if the query has no words)
+        """
+        matches: list[set[int]] = []
+        for term in set(tokenize(query)):
+            ids = self._match_prefix(term)
+            if not ids:
+                return []
+            matches.append(ids)
+
+        if not matches:
+            return []
+
+        # Intersect smallest-first so the working set only shrinks
+        matches.sort(key=len)
+        result = set(matches[0])
+        for ids in matches[1:]:
+            result &= ids
+            if not result:
+                return []
+        return sorted(result)
+
+    def _match_prefix(self, term: str) -> set[int]:
+        """IDs of tasks containing a token that starts with term."""
+        if self._terms_stale:
+            self._terms = sorted(self._postings)
+            self._new_terms.clear()
+            self._terms_stale = False
+        elif self._new_terms:
+            # Sorted run + new tail: timsort merges this in near-linear time
+            self._terms.extend(self._new_terms)
+            self._terms.sort()
+            self._new_terms.clear()
+
+        terms = self._terms
+        start = bisect_left(terms, term)
+        end = start
+        while end < len(terms) and terms[end].startswith(term):
+            end += 1
+
+        if end - start == 1:
+            return self._postings[terms[start]]
+        ids: set[int] = set()
+        for token in terms[start:end]:
+            ids |= self._postings[token]
+        return ids
 
 
 class TaskStorage:
@@ -19,12 +164,24 @@ class TaskStorage:
     - Auto-incrementing IDs
     - Never reuses deleted task IDs
     - Maintains task list during program execution
+    - Counts and pending/completed views maintained on write
+    - Keyword search over an inverted index maintained on write
+    - Batch insertion with block ID allocation (add_tasks)
+
+    IDs are monotonic, so `tasks` (insertion-ordered) is always in ID
+    order and listing never needs to sort. Subclasses that load tasks
+    directly must go through _insert_task/_remove_task/_set_text to keep
+    the status and search indexes in sync.
     """
 
     def __init__(self):
         """Initialize empty task storage."""
         self.tasks: dict[int, Task] = {}
         self.next_id: int = 1
+        # Sorted task IDs per status
+        self._pending_ids: list[int] = []
+        self._completed_ids: list[int] = []
+        self._search_index = SearchIndex()
 
     def add_task(self, title: str, description: str = "") -> Task:
         """
@@ -38,10 +195,27 @@ class TaskStorage:
             Created Task object
         """
         task = create_task(self.next_id, title, description)
-        self.tasks[self.next_id] = task
+        self._insert_task(task)
         self.next_id += 1
         return task
 
+    def add_tasks(self, items: Iterable) -> BatchResult:
+        """
+        Validate and add many tasks at once.
+
+        Items are validated with validate_batch (invalid ones are reported
+        and skipped, the rest are still added) and each batch of valid
+        items gets a consecutive block of IDs.
+
+        Args:
+            items: Title strings, (title, description) pairs or dicts;
+                can be a stream such as read_tasks_jsonl(file)
+
+        Returns:
+            Number of tasks added and errors as (position, message)
+        """
+        return add_in_batches(items, self._insert_batch)
+
     def get_task(self, task_id: int) -> Optional[Task]:
         """
         Get a task by ID.
@@ -61,7 +235,44 @@ class TaskStorage:
         Returns:
             List of all tasks, sorted by ID
         """
-        return [self.tasks[task_id] for task_id in sorted(self.tasks.keys())]
+        return list(self.tasks.values())
+
+    def get_pending_tasks(self) -> list[Task]:
+        """
+        Get incomplete tasks in order of creation (by ID).
+
+        Returns:
+            List of pending tasks, sorted by ID
+        """
+        return list(self.iter_tasks(completed=False))
+
+    def get_completed_tasks(self) -> list[Task]:
+        """
+        Get completed tasks in order of creation (by ID).
+
+        Returns:
+            List of completed tasks, sorted by ID
+        """
+        return list(self.iter_tasks(completed=True))
+
+    def iter_tasks(self, completed: Optional[bool] = None) -> Iterator[Task]:
+        """
+        Iterate over tasks in order of creation (by ID).
+
+        Args:
+            completed: True for completed tasks only, False for pending
+                only, None for all tasks
+
+        Yields:
+            Tasks, sorted by ID
+        """
+        if completed is None:
+            yield from self.tasks.values()
+            return
+
+        tasks = self.tasks
+        for task_id in (self._completed_ids if completed else self._pending_ids):
+            yield tasks[task_id]
 
     def update_task(self, task_id: int, title: Optional[str] = None,
                     description: Optional[str] = None) -> Optional[Task]:
@@ -81,13 +292,10 @@ class TaskStorage:
             return None
 
         # Update fields
-        if title is not None:
-            task["title"] = title
-        if description is not None:
-            task["description"] = description
+        self._set_text(task, title, description)
 
         # Update timestamp
-        task["updated_at"] = datetime.now().isoformat()
+        task["updated_at"] = time.time_ns()
 
         return task
 
@@ -103,12 +311,7 @@ class TaskStorage:
         Returns:
             Deleted Task if found, None otherwise
         """
-        if task_id not in self.tasks:
-            return None
-
-        task = self.tasks[task_id]
-        del self.tasks[task_id]
-        return task
+        return self._remove_task(task_id)
 
     def toggle_complete(self, task_id: int) -> Optional[Task]:
         """
@@ -125,13 +328,83 @@ class TaskStorage:
             return None
 
         # Toggle completion status
-        task["completed"] = not task["completed"]
+        self._set_completed(task, not task["completed"])
 
         # Update timestamp
-        task["updated_at"] = datetime.now().isoformat()
+        task["updated_at"] = time.time_ns()
 
         return task
 
+    def get_tasks_page(self, offset: int, limit: int, completed: Optional[bool] = None) -> list[Task]:
+        """
+        Get one page of tasks in order of creation (by ID).
+
+        Costs O(limit) (plus a logarithmic seek for all tasks) however far
+        into the list the page is.
+
+        Args:
+            offset: Number of matching tasks to skip
+            limit: Maximum number of tasks to return
+            completed: True for completed tasks only, False for pending
+                only, None for all tasks
+
+        Returns:
+            Tasks, sorted by ID
+        """
+        if offset < 0 or limit <= 0:
+            return []
+        if completed is not None:
+            ids = (self._completed_ids if completed else self._pending_ids)[offset:offset + limit]
+        else:
+            ids = self._page_ids(offset, limit)
+        tasks = self.tasks
+        return [tasks[task_id] for task_id in ids]
+
+    def get_tasks_by_time(self, field: str = "created_at", since: Optional[int] = None,
+                          until: Optional[int] = None, newest_first: bool = False) -> list[Task]:
+        """
+        Get tasks sorted (and optionally filtered) by a timestamp.
+
+        Args:
+            field: "created_at" or "updated_at"
+            since: Only tasks with field >= since (epoch nanoseconds)
+            until: Only tasks with field < until (epoch nanoseconds)
+            newest_first: Sort descending instead of ascending
+
+        Returns:
+            Matching tasks, ties broken by ID
+
+        Raises:
+            ValueError: If field is not a timestamp field
+        """
+        if field not in TIME_FIELDS:
+            raise ValueError(f"Cannot sort by '{field}' (expected one of {', '.join(TIME_FIELDS)})")
+
+        tasks = self.iter_tasks()
+        if since is not None or until is not None:
+            low = since if since is not None else -1
+            high = until if until is not None else float("inf")
+            tasks = (task for task in tasks if low <= task[field] < high)
+
+        # Tasks come in ID order and sorting is stable, so ties stay in ID order
+        return sorted(tasks, key=lambda task: task[field], reverse=newest_first)
+
+    def search(self, query: str) -> list[Task]:
+        """
+        Find tasks whose title or description contains every query word.
+
+        Each query word matches any indexed word it is a prefix of, so
+        "gro" finds "groceries". Matching is case-insensitive.
+
+        Args:
+            query: Search text
+
+        Returns:
+            Matching tasks, sorted by ID (empty if the query has no words)
+        """
+        tasks = self.tasks
+        return [tasks[task_id] for task_id in self._search_index.lookup(query)]
+
     def count_tasks(self) -> dict[str, int]:
         """
         Count total, completed, and pending tasks.
@@ -139,14 +412,10 @@ class TaskStorage:
         Returns:
             Dictionary with counts: {"total": n, "completed": n, "pending": n}
         """
-        total = len(self.tasks)
-        completed = sum(1 for task in self.tasks.values() if task["completed"])
-        pending = total - completed
-
         return {
-            "total": total,
-            "completed": completed,
-            "pending": pending
+            "total": len(self.tasks),
+            "completed": len(self._completed_ids),
+            "pending": len(self._pending_ids)
         }
 
     def is_empty(self) -> bool:
@@ -157,3 +426,136 @@ class TaskStorage:
             True if no tasks exist, False otherwise
         """
         return len(self.tasks) == 0
+
+    def _insert_task(self, task: Task):
+        """
+        Store a task and index it by status.
+
+        Replacing an existing task keeps its position in ID order.
+
+        Args:
+            task: Task to store
+        """
+        task_id = task["id"]
+        old = self.tasks.get(task_id)
+        if old is not None:
+            self._unindex(task_id, old["completed"])
+            self._search_index.remove(task_id, old["title"], old["description"])
+
+        self.tasks[task_id] = task
+        self._search_index.add(task_id, task["title"], task["description"])
+        ids = self._completed_ids if task["completed"] else self._pending_ids
+        if not ids or ids[-1] < task_id:
+            ids.append(task_id)
+        else:
+            insort(ids, task_id)
+
+    def _insert_batch(self, items: list[tuple[str, str]]) -> range:
+        """
+        Store validated (title, description) pairs under a block of new IDs.
+
+        Args:
+            items: Valid pairs (see validate_batch)
+
+        Returns:
+            IDs assigned, in item order
+        """
+        first = self.next_id
+        ids = range(first, first + len(items))
+        self.next_id = ids.stop
+
+        now = time.time_ns()
+        tasks = self.tasks
+        index_text = self._search_index.add
+        for task_id, (title, description) in zip(ids, items):
+            tasks[task_id] = {
+                "id": task_id,
+                "title": title,
+                "description": description,
+                "completed": False,
+                "created_at": now,
+                "updated_at": now
+            }
+            index_text(task_id, title, description)
+
+        if not self._pending_ids or self._pending_ids[-1] < first:
+            self._pending_ids.extend(ids)
+        else:
+            for task_id in ids:
+                insort(self._pending_ids, task_id)
+        return ids
+
+    def _page_ids(self, offset: int, limit: int) -> list[int]:
+        """IDs of all tasks from position offset, merged from the status indexes."""
+        pending, completed = self._pending_ids, self._completed_ids
+        if offset >= len(pending) + len(completed):
+            return []
+
+        # Binary search for the ID at position offset: the smallest ID with
+        # more than `offset` tasks at or below it
+        low, high = 1, self.next_id - 1
+        while low < high:
+            middle = (low + high) // 2
+            if bisect_right(pending, middle) + bisect_right(completed, middle) > offset:
+                high = middle
+            else:
+                low = middle + 1
+
+        start_pending = bisect_left(pending, low)
+        start_completed = bisect_left(completed, low)
+        return list(islice(merge(pending[start_pending:start_pending + limit],
+                                 completed[start_completed:start_completed + limit]), limit))
+
+    def _remove_task(self, task_id: int) -> Optional[Task]:
+        """
+        Remove a task and its index entry.
+
+        Args:
+            task_id: Task ID to remove
+
+        Returns:
+            Removed Task if found, None otherwise
+        """
+        task = self.tasks.pop(task_id, None)
+        if task is not None:
+            self._unindex(task_id, task["completed"])
+            self._search_index.remove(task_id, task["title"], task["description"])
+        return task
+
+    def _set_completed(self, task: Task, completed: bool):
+        """
+        Set a task's completion status and move it between status indexes.
+
+        Args:
+            task: Stored task to change
+            completed: New completion status
+        """
+        if task["completed"] == completed:
+            return
+        self._unindex(task["id"], task["completed"])
+        task["completed"] = completed
+        insort(self._completed_ids if completed else self._pending_ids, task["id"])
+
+    def _unindex(self, task_id: int, completed: bool):
+        ids = self._completed_ids if completed else self._pending_ids
+        index = bisect_left(ids, task_id)
+        if index < len(ids) and ids[index] == task_id:
+            del ids[index]
+
+    def _set_text(self, task: Task, title: Optional[str], description: Optional[str]):
+        """
+        Change a task's title and/or description and reindex it for search.
+
+        Args:
+            task: Stored task to change
+            title: New title (None to keep current)
+            description: New description (None to keep current)
+        """
+        if title is None and description is None:
+            return
+        self._search_index.remove(task["id"], task["title"], task["description"])
+        if title is not None:
+            task["title"] = title
+        if description is not None:
+            task["description"] = description
+        self._search_index.add(task["id"], task["title"], task["description"])
@@ -6,7 +6,8 @@ Handles all user input/output according to:
 - @specs/features/*.md
 """
 
-from typing import Optional
+import sys
+from typing import Iterable, Optional
 from models import (
     Task,
     validate_title,
@@ -17,6 +18,12 @@ from models import (
 )
 from storage import TaskStorage
 
+# Tasks shown per page in the task list view
+PAGE_SIZE = 20
+
+# Status filters for the task list view: label -> get_tasks_page(completed=...)
+_VIEW_FILTERS = {"all": None, "pending": False, "completed": True}
+
 
 def clear_screen():
     """Clear the console screen (simple version - just print newlines)."""
@@ -102,7 +109,7 @@ def show_main_menu() -> int:
     Display main menu and get user choice.
 
     Returns:
-        User's menu choice (1-6)
+        User's menu choice (1-7)
     """
     print_header("TODO APP - MAIN MENU")
     print("1. Add Task")
@@ -110,9 +117,10 @@ def show_main_menu() -> int:
     print("3. Update Task")
     print("4. Delete Task")
     print("5. Mark Task Complete/Incomplete")
-    print("6. Exit")
+    print("6. Search Tasks")
+    print("7. Exit")
 
-    choice = get_int_input("\nEnter your choice (1-6): ")
+    choice = get_int_input("\nEnter your choice (1-7): ")
     return choice if choice else 0
 
 
@@ -159,14 +167,18 @@ def add_task_ui(storage: TaskStorage):
     wait_for_enter()
 
 
-def view_tasks_ui(storage: TaskStorage):
+def view_tasks_ui(storage: TaskStorage, page_size: int = PAGE_SIZE):
     """
     View tasks user interface.
 
     Implements: @specs/features/view-tasks.md
 
+    Tasks are shown one page at a time: only the visible page is fetched
+    and formatted, and each page is written to stdout in a single call.
+
     Args:
         storage: Task storage instance
+        page_size: Number of tasks per page
     """
     print_header("YOUR TASKS")
 
@@ -175,15 +187,116 @@ def view_tasks_ui(storage: TaskStorage):
         wait_for_enter()
         return
 
-    # Get counts
-    counts = storage.count_tasks()
-    print(f"Total: {counts['total']} tasks ({counts['completed']} completed, {counts['pending']} pending)\n")
+    status_filter = "all"
+    page = 0
+
+    while True:
+        counts = storage.count_tasks()
+        matching = counts["total"] if status_filter == "all" else counts[status_filter]
+        pages = max(1, -(-matching // page_size))
+        page = min(page, pages - 1)
+
+        start = page * page_size
+        tasks = storage.get_tasks_page(start, page_size, _VIEW_FILTERS[status_filter])
+        sys.stdout.write(render_task_page(tasks, counts, page, pages, status_filter))
+        sys.stdout.flush()
+
+        command = get_input(
+            "\n[n]ext  [p]rev  [j <page>] jump  [f]ilter all/pending/completed"
+            "  (Enter to return to main menu): "
+        ).strip().lower()
+
+        if not command:
+            return
+        if command == "n":
+            page = min(page + 1, pages - 1)
+        elif command == "p":
+            page = max(page - 1, 0)
+        elif command.startswith("j"):
+            target = command[1:].strip()
+            if target.isdigit() and 1 <= int(target) <= pages:
+                page = int(target) - 1
+            else:
+                print_error(f"Please enter a page number from 1 to {pages}.")
+        elif command == "f":
+            filters = list(_VIEW_FILTERS)
+            status_filter = filters[(filters.index(status_filter) + 1) % len(filters)]
+            page = 0
+        else:
+            print_error("Invalid choice.")
+
+
+def render_task_page(tasks: Iterable[Task], counts: dict[str, int], page: int,
+                     pages: int, status_filter: str = "all") -> str:
+    """
+    Render one page of the task list as a single string.
+
+    Args:
+        tasks: Tasks on this page
+        counts: Task counts from TaskStorage.count_tasks()
+        page: Zero-based page number
+        pages: Total number of pages
+        status_filter: "all", "pending" or "completed"
 
-    # Display all tasks
-    tasks = storage.get_all_tasks()
+    Returns:
+        Page text, ready to be written in one call
+    """
+    parts = [f"Total: {counts['total']} tasks ({counts['completed']} completed, {counts['pending']} pending)\n"]
+    if status_filter != "all":
+        parts.append(f"Showing: {status_filter} tasks\n")
+    parts.append("\n")
+
+    shown = 0
     for task in tasks:
-        print(format_task_display(task))
-        print()  # Blank line between tasks
+        parts.append(format_task_display(task))
+        parts.append("\n\n")  # Blank line between tasks
+        shown += 1
+
+    if not shown:
+        parts.append(f"No {status_filter} tasks.\n\n")
+    if pages > 1:
+        parts.append(f"Page {page + 1} of {pages}\n")
+
+    return "".join(parts)
+
+
+def search_tasks_ui(storage: TaskStorage, page_size: int = PAGE_SIZE):
+    """
+    Search tasks user interface.
+
+    Implements: @specs/features/search-tasks.md
+
+    Args:
+        storage: Task storage instance
+        page_size: Maximum number of matches to display
+    """
+    print_header("SEARCH TASKS")
+
+    if storage.is_empty():
+        print_error("No tasks available to search.")
+        wait_for_enter()
+        return
+
+    query = get_input("Enter search words: ").strip()
+    if not query:
+        print_error("Please enter at least one word to search for.")
+        wait_for_enter()
+        return
+
+    matches = storage.search(query)
+    if not matches:
+        print(f"\nNo tasks match '{query}'.")
+        wait_for_enter()
+        return
+
+    parts = [f"\nFound {len(matches)} task{'s' if len(matches) != 1 else ''} matching '{query}'\n\n"]
+    for task in matches[:page_size]:
+        parts.append(format_task_display(task))
+        parts.append("\n\n")
+    if len(matches) > page_size:
+        parts.append(f"Showing the first {page_size}. Refine your search to narrow the results.\n")
+    sys.stdout.write("".join(parts))
+    sys.stdout.flush()
 
     wait_for_enter()
 
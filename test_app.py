@@ -11,7 +11,18 @@ from storage import TaskStorage
 import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
-from models import validate_title, validate_description
+from models import validate_title, validate_description, timestamp_to_iso, export_task, read_tasks_jsonl
+import tempfile
+from log_storage import LogTaskStorage
+from sqlite_storage import SqliteTaskStorage
+from compact_storage import CompactTask, ColumnarTaskStorage
+import io
+import json
+import ui
+from cli import run_stdin, _decoded_lines
+import random
+import threading
+from concurrent_storage import ConcurrentTaskStorage
 
 
 def test_add_task():
@@ -174,6 +185,509 @@ def test_id_management():
     print("✓ ID Management: PASSED")
 
 
+def test_log_storage():
+    """Test append-only log persistence (replay, compaction, torn writes)."""
+    print("Testing: Log Storage...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tasks.log")
+
+        with LogTaskStorage(path) as storage:
+            storage.add_task("Buy groceries", "Milk and eggs")
+            storage.add_task("Call mom")
+            storage.add_task("Temporary")
+            storage.update_task(1, title="Buy groceries and fruits")
+            storage.toggle_complete(2)
+            storage.delete_task(3)
+            expected = storage.get_all_tasks()
+
+        # Replay restores state and never reuses the deleted (highest) ID
+        with LogTaskStorage(path) as storage:
+            assert storage.get_all_tasks() == expected
+            assert storage.add_task("Task 4")["id"] == 4
+            storage.compact()
+            storage.toggle_complete(4)
+            expected = storage.get_all_tasks()
+
+        # Snapshot + log tail
+        with LogTaskStorage(path) as storage:
+            assert storage.get_all_tasks() == expected
+            assert storage.next_id == 5
+
+        # A torn final record is discarded
+        with open(path, "a") as f:
+            f.write('["a",5,"Half writ')
+        with LogTaskStorage(path) as storage:
+            assert storage.get_all_tasks() == expected
+            assert storage.add_task("Task 5")["id"] == 5
+        with LogTaskStorage(path) as storage:
+            assert storage.get_task(5)["title"] == "Task 5"
+
+    print("✓ Log Storage: PASSED")
+
+
+def test_sqlite_storage():
+    """Test the SQLite backend against the TaskStorage API."""
+    print("Testing: SQLite Storage...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tasks.db")
+
+        with SqliteTaskStorage(path) as storage:
+            assert storage.is_empty()
+            task1 = storage.add_task("Buy groceries", "Milk and eggs")
+            task2 = storage.add_task("Call mom")
+            task3 = storage.add_task("Temporary")
+            assert (task1["id"], task2["id"], task3["id"]) == (1, 2, 3)
+            assert task2["description"] == ""
+
+            updated = storage.update_task(1, title="Buy groceries and fruits")
+            assert updated["title"] == "Buy groceries and fruits"
+            assert updated["description"] == "Milk and eggs"
+            assert storage.update_task(99, title="Missing") is None
+
+            assert storage.toggle_complete(2)["completed"] is True
+            assert storage.delete_task(3)["title"] == "Temporary"
+            assert storage.delete_task(3) is None
+
+        # Reopen: data persists and deleted IDs are not reused
+        with SqliteTaskStorage(path) as storage:
+            tasks = storage.get_all_tasks()
+            assert [t["id"] for t in tasks] == [1, 2]
+            assert storage.count_tasks() == {"total": 2, "completed": 1, "pending": 1}
+            assert storage.add_task("Task 4")["id"] == 4
+            assert storage.next_id == 5
+
+    print("✓ SQLite Storage: PASSED")
+
+
+def test_compact_storage():
+    """Test compact task representations."""
+    print("Testing: Compact Storage...")
+
+    # CompactTask reads like a Task dict
+    task = CompactTask(1, "Buy groceries", "Milk and eggs")
+    assert task["title"] == "Buy groceries"
+    assert task["completed"] is False
+    assert task["created_at"] == task["updated_at"]
+    assert isinstance(task["created_at"], int)
+    task["updated_at"] = "2025-12-09T10:30:00.123456"  # ISO strings are converted
+    assert timestamp_to_iso(task["updated_at"]) == "2025-12-09T10:30:00.123456"
+    assert set(dict(task)) == {"id", "title", "description", "completed", "created_at", "updated_at"}
+
+    # ColumnarTaskStorage follows the TaskStorage API
+    storage = ColumnarTaskStorage()
+    for i in range(1, 21):
+        storage.add_task(f"Task {i}")
+    storage.update_task(1, title="Renamed", description="Details")
+    assert storage.get_task(1)["title"] == "Renamed"
+    assert storage.get_task(1)["description"] == "Details"
+    assert storage.toggle_complete(2)["completed"] is True
+    assert storage.toggle_complete(3)["completed"] is True
+
+    # Deleting over half the rows reclaims them without disturbing the rest
+    for task_id in range(3, 15):
+        assert storage.delete_task(task_id)["id"] == task_id
+    assert storage.get_task(3) is None
+    assert [t["id"] for t in storage.get_all_tasks()] == [1, 2] + list(range(15, 21))
+    assert storage.get_task(2)["completed"] is True
+    assert storage.count_tasks() == {"total": 8, "completed": 1, "pending": 7}
+    assert storage.add_task("Task 21")["id"] == 21
+
+    print("✓ Compact Storage: PASSED")
+
+
+def test_status_views():
+    """Test incrementally maintained counts and pending/completed views."""
+    print("Testing: Status Views...")
+
+    storage = TaskStorage()
+    for i in range(1, 11):
+        storage.add_task(f"Task {i}")
+
+    for task_id in (7, 2, 9):
+        storage.toggle_complete(task_id)
+    storage.toggle_complete(9)  # back to pending
+    storage.delete_task(2)
+    storage.delete_task(5)
+
+    assert storage.count_tasks() == {"total": 8, "completed": 1, "pending": 7}
+    assert [t["id"] for t in storage.get_completed_tasks()] == [7]
+    assert [t["id"] for t in storage.get_pending_tasks()] == [1, 3, 4, 6, 8, 9, 10]
+    assert [t["id"] for t in storage.get_all_tasks()] == [1, 3, 4, 6, 7, 8, 9, 10]
+
+    # Replayed storage rebuilds the same indexes
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tasks.log")
+        with LogTaskStorage(path) as logged:
+            for i in range(1, 6):
+                logged.add_task(f"Task {i}")
+            logged.toggle_complete(4)
+            logged.toggle_complete(1)
+            logged.delete_task(1)
+        with LogTaskStorage(path) as logged:
+            assert logged.count_tasks() == {"total": 4, "completed": 1, "pending": 3}
+            assert [t["id"] for t in logged.get_pending_tasks()] == [2, 3, 5]
+
+    print("✓ Status Views: PASSED")
+
+
+def test_paged_view():
+    """Test paged rendering and navigation of the task list."""
+    print("Testing: Paged View...")
+
+    storage = TaskStorage()
+    for i in range(1, 26):
+        storage.add_task(f"Task {i}")
+    for task_id in range(2, 26, 2):
+        storage.toggle_complete(task_id)
+
+    page = ui.render_task_page(storage.get_all_tasks()[:2], storage.count_tasks(), 0, 3)
+    assert page.startswith("Total: 25 tasks (12 completed, 13 pending)\n\n")
+    assert "[1] ○ Task 1\n\n[2] ✓ Task 2\n\n" in page
+    assert page.endswith("Page 1 of 3\n")
+    assert "No completed tasks." in ui.render_task_page([], storage.count_tasks(), 0, 1, "completed")
+
+    # Drive the interactive view: next page, filter to pending, jump, return
+    commands = iter(["n", "f", "j 2", ""])
+    original_input, original_stdout = ui.get_input, sys.stdout
+    ui.get_input = lambda prompt: next(commands)
+    sys.stdout = output = io.StringIO()
+    try:
+        ui.view_tasks_ui(storage, page_size=10)
+    finally:
+        ui.get_input, sys.stdout = original_input, original_stdout
+
+    pages = output.getvalue().split("Total: ")[1:]
+    assert len(pages) == 4
+    assert "[11] ○ Task 11" in pages[1] and "[1] ○" not in pages[1]
+    assert "Showing: pending tasks" in pages[2] and "[2] ✓" not in pages[2]
+    assert "[21] ○ Task 21" in pages[3] and "Page 2 of 2" in pages[3]
+
+    # Every backend fetches just the requested page, matching iter_tasks
+    with tempfile.TemporaryDirectory() as tmp:
+        backends = [TaskStorage(), SqliteTaskStorage(":memory:"), ColumnarTaskStorage(),
+                    ConcurrentTaskStorage(), LogTaskStorage(os.path.join(tmp, "tasks.log"))]
+        for storage in backends:
+            storage.add_tasks(f"Task {i}" for i in range(1, 61))
+            for task_id in range(3, 61, 3):
+                storage.toggle_complete(task_id)
+            for task_id in (1, 5, 30, 31, 60):
+                storage.delete_task(task_id)
+            for completed in (None, False, True):
+                expected = [t["id"] for t in storage.iter_tasks(completed)]
+                for offset in (0, 7, 14, len(expected) - 3, len(expected) + 5):
+                    page = storage.get_tasks_page(offset, 7, completed)
+                    assert [t["id"] for t in page] == expected[offset:offset + 7], (storage, completed, offset)
+            assert storage.get_tasks_page(0, 0) == []
+        backends[-1].close()
+
+    print("✓ Paged View: PASSED")
+
+
+def test_batch_cli():
+    """Test the non-interactive batch commands."""
+    print("Testing: Batch CLI...")
+
+    storage = TaskStorage()
+    out, err = io.StringIO(), io.StringIO()
+    commands = io.StringIO(
+        'add "Buy groceries" -d "Milk and eggs"\n'
+        "add Call\n"
+        "# comments and blank lines are skipped\n"
+        "\n"
+        "done 1 2 99\n"
+        "undone 2\n"
+        "delete 2\n"
+        "frobnicate 1\n"
+        "list --json --completed\n"
+    )
+
+    errors = run_stdin(storage, commands, out, err)
+    assert errors == 2  # missing task 99, unknown command
+    assert "Task with ID 99 not found." in err.getvalue()
+    assert "line 8:" in err.getvalue()
+    assert "Applied 7 commands" in err.getvalue()
+
+    listed = json.loads(out.getvalue()[out.getvalue().index("["):])
+    assert [(t["id"], t["title"], t["completed"]) for t in listed] == [(1, "Buy groceries", True)]
+    assert storage.count_tasks() == {"total": 1, "completed": 1, "pending": 0}
+
+    # Import skips invalid lines and keeps going
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tasks.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write('{"title": "Imported", "description": "From file"}\n')
+            f.write('{"description": "no title"}\n')
+            f.write('{"title": "   "}\n')
+            f.write('{"title": "Second"}\n')
+        err = io.StringIO()
+        assert run_stdin(storage, io.StringIO(f"import '{path}'\n"), io.StringIO(), err, quiet=True) == 2
+        assert [t["title"] for t in storage.get_all_tasks()] == ["Buy groceries", "Imported", "Second"]
+
+        # A missing import file is reported and later lines still run
+        missing = os.path.join(tmp, "missing.jsonl")
+        err = io.StringIO()
+        commands = io.StringIO(f"import '{missing}'\nadd After\n")
+        assert run_stdin(storage, commands, io.StringIO(), err, quiet=True) == 1
+        assert f"Error: cannot open {missing}" in err.getvalue()
+        assert "Applied 2 commands" in err.getvalue()
+        assert storage.get_all_tasks()[-1]["title"] == "After"
+
+        # Lines that are not UTF-8 are reported by line; the rest is imported
+        latin1 = os.path.join(tmp, "latin1.jsonl")
+        with open(latin1, "wb") as f:
+            f.write(b'{"title": "Before"}\n{"title": "Caf\xe9"}\n{"title": "Later"}\n')
+        out, err = io.StringIO(), io.StringIO()
+        assert run_stdin(storage, io.StringIO(f"import '{latin1}'\n"), out, err) == 1
+        assert f"{latin1}:2: Line is not valid UTF-8" in err.getvalue()
+        assert "Imported 2 tasks (1 skipped)" in out.getvalue()
+        assert [t["title"] for t in storage.get_all_tasks()[-2:]] == ["Before", "Later"]
+
+    # A read error stops the import but keeps and reports what was read
+    def failing_read():
+        yield b'{"title": "Read"}\n'
+        raise OSError(5, "Input/output error")
+
+    read_errors = []
+    assert list(_decoded_lines(failing_read(), read_errors)) == ['{"title": "Read"}\n']
+    assert read_errors == [(1, "Read error, import stopped: [Errno 5] Input/output error")]
+
+    print("✓ Batch CLI: PASSED")
+
+
+def test_search():
+    """Test keyword search with the inverted index."""
+    print("Testing: Search Tasks...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        backends = [TaskStorage(), SqliteTaskStorage(":memory:"), ColumnarTaskStorage(),
+                    LogTaskStorage(os.path.join(tmp, "tasks.log"))]
+        for storage in backends:
+            storage.add_task("Buy groceries", "Milk and eggs")
+            storage.add_task("Groom the dog", "")
+            storage.add_task("Call mom", "Birthday_party plans")
+
+            assert [t["id"] for t in storage.search("milk")] == [1]
+            assert [t["id"] for t in storage.search("gro")] == [1, 2]
+            assert [t["id"] for t in storage.search("GRO milk")] == [1]
+            assert [t["id"] for t in storage.search("party")] == [3]
+            assert storage.search("gro zebra") == []
+            assert storage.search("  !! ") == []
+
+            storage.update_task(1, title="Sell car")
+            assert [t["id"] for t in storage.search("gro")] == [2]
+            assert [t["id"] for t in storage.search("car milk")] == [1]
+
+            storage.delete_task(2)
+            assert storage.search("gro") == []
+
+        # Row reclamation keeps columnar search results valid
+        columnar = backends[2]
+        for i in range(4):
+            columnar.add_task(f"Temporary {i}")
+        for task_id in range(4, 8):
+            columnar.delete_task(task_id)
+        assert [t["title"] for t in columnar.search("sell")] == ["Sell car"]
+        assert columnar.search("temp") == []
+
+        # Replaying the log rebuilds the index
+        backends[-1].close()
+        with LogTaskStorage(os.path.join(tmp, "tasks.log")) as storage:
+            assert [t["id"] for t in storage.search("sell")] == [1]
+            assert storage.search("groom") == []
+
+    print("✓ Search Tasks: PASSED")
+
+
+def test_concurrent_storage():
+    """Test the thread-safe storage under concurrent writers and readers."""
+    print("Testing: Concurrent Storage...")
+
+    storage = ConcurrentTaskStorage()
+    errors = []
+
+    def writer(n):
+        for i in range(200):
+            task = storage.add_task(f"Writer {n} task {i}")
+            if i % 3 == 0:
+                storage.toggle_complete(task["id"])
+
+    def reader():
+        try:
+            for _ in range(200):
+                counted = sum(1 for _ in storage.iter_tasks())
+                assert counted <= storage.next_id
+                storage.get_pending_tasks()
+        except Exception as e:  # surfaced in the main thread
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+    threads += [threading.Thread(target=reader) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors, errors
+    assert [t["id"] for t in storage.get_all_tasks()] == list(range(1, 1601))
+    assert storage.count_tasks() == {"total": 1600, "completed": 536, "pending": 1064}
+
+    # Snapshots and returned tasks are not affected by later writes
+    before = storage.snapshot(completed=False)
+    task = before[0]
+    storage.toggle_complete(task["id"])
+    storage.update_task(task["id"], title="Renamed")
+    assert not task["completed"] and task["title"].startswith("Writer")
+    assert storage.snapshot(completed=False)[0] is not task
+    current = storage.get_task(task["id"])
+    assert current["completed"] and current["title"] == "Renamed"
+    assert [t["id"] for t in storage.search("renamed")] == [task["id"]]
+
+    # Published views match the stored tasks across chunk boundaries
+    rng = random.Random(7)
+    storage.add_tasks(f"Bulk {i}" for i in range(1500))
+    for _ in range(3000):
+        task_id = rng.randrange(1, storage.next_id)
+        roll = rng.random()
+        if roll < 0.4:
+            storage.toggle_complete(task_id)
+        elif roll < 0.6:
+            storage.delete_task(task_id)
+        elif roll < 0.8:
+            storage.update_task(task_id, description="Changed")
+        else:
+            storage.add_task("Late")
+    stored = sorted(storage.tasks.values(), key=lambda t: t["id"])
+    assert list(storage.snapshot()) == stored
+    assert list(storage.snapshot(completed=True)) == [t for t in stored if t["completed"]]
+    assert list(storage.snapshot(completed=False)) == [t for t in stored if not t["completed"]]
+    assert storage.snapshot()[-1] is stored[-1] and storage.snapshot()[700] is stored[700]
+    assert storage.count_tasks()["total"] == len(stored)
+
+    print("✓ Concurrent Storage: PASSED")
+
+
+def test_timestamps():
+    """Test integer timestamps, time ordering and ISO export."""
+    print("Testing: Timestamps...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        backends = [
+            TaskStorage(),
+            SqliteTaskStorage(":memory:"),
+            ColumnarTaskStorage(),
+            ConcurrentTaskStorage(),
+            LogTaskStorage(os.path.join(tmp, "tasks.log")),
+        ]
+        for storage in backends:
+            for i in range(1, 5):
+                task = storage.add_task(f"Task {i}")
+                assert isinstance(task["created_at"], int)
+                assert task["created_at"] == task["updated_at"]
+            first = storage.get_task(1)["created_at"]
+            third = storage.get_task(3)["created_at"]
+            storage.update_task(2, title="Touched")
+            assert storage.get_task(2)["updated_at"] > storage.get_task(2)["created_at"]
+
+            assert [t["id"] for t in storage.get_tasks_by_time()] == [1, 2, 3, 4]
+            assert [t["id"] for t in storage.get_tasks_by_time(newest_first=True)] == [4, 3, 2, 1]
+            assert [t["id"] for t in storage.get_tasks_by_time("updated_at", newest_first=True)][0] == 2
+            assert [t["id"] for t in storage.get_tasks_by_time(since=first, until=third)] == [1, 2]
+
+            exported = export_task(storage.get_task(1))
+            assert exported["created_at"] == timestamp_to_iso(first)
+            assert json.loads(json.dumps(exported))["title"] == "Task 1"
+
+        try:
+            TaskStorage().get_tasks_by_time("title")
+            assert False, "expected ValueError"
+        except ValueError:
+            pass
+
+        # Logs written with ISO timestamps still load
+        path = os.path.join(tmp, "legacy.log")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write('["a",1,"Old task","","2025-12-09T10:30:00.123456"]\n')
+            f.write('["c",1,true,"2025-12-10T08:00:00"]\n')
+        with LogTaskStorage(path) as storage:
+            task = storage.get_task(1)
+            assert timestamp_to_iso(task["created_at"]) == "2025-12-09T10:30:00.123456"
+            assert timestamp_to_iso(task["updated_at"]) == "2025-12-10T08:00:00"
+
+    print("✓ Timestamps: PASSED")
+
+
+def test_add_tasks():
+    """Test batch validation and insertion."""
+    print("Testing: Batch Insert...")
+
+    items = [
+        "Plain title",
+        ("Buy groceries", "Milk and eggs"),
+        {"title": "From JSON", "description": "x" * 1500},
+        ("", "empty title"),
+        None,
+        {"description": "missing title"},
+        ("   ", ""),
+        ("T" * 201, ""),
+        ("Last one", None),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = os.path.join(tmp, "tasks.log")
+        backends = [
+            TaskStorage(),
+            SqliteTaskStorage(":memory:"),
+            ColumnarTaskStorage(),
+            ConcurrentTaskStorage(),
+            LogTaskStorage(log_path),
+        ]
+        for storage in backends:
+            storage.add_task("Existing")
+            result = storage.add_tasks(iter(items))
+            assert result.added == 4
+            assert [position for position, _ in result.errors] == [3, 5, 6, 7]
+            assert result.errors[0][1] == "Title cannot be empty. Please try again."
+            assert "max 200 characters" in result.errors[3][1]
+
+            tasks = storage.get_all_tasks()
+            assert [t["id"] for t in tasks] == [1, 2, 3, 4, 5]
+            assert [t["title"] for t in tasks[1:]] == ["Plain title", "Buy groceries", "From JSON", "Last one"]
+            assert len(tasks[3]["description"]) == 1000
+            assert storage.count_tasks() == {"total": 5, "completed": 0, "pending": 5}
+            assert storage.add_task("After")["id"] == 6
+
+            storage.update_task(3, title="Buy bread")
+            assert [t["id"] for t in storage.search("json")] == [4]
+            assert [t["id"] for t in storage.search("buy")] == [3]
+            assert storage.search("groceries") == []
+
+        backends[-1].close()
+        with LogTaskStorage(log_path) as storage:
+            assert [t["title"] for t in storage.get_all_tasks()] == [
+                "Existing", "Plain title", "Buy bread", "From JSON", "Last one", "After"
+            ]
+
+        # Streaming from a JSON lines file; positions map to line numbers
+        path = os.path.join(tmp, "tasks.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write('{"title": "One"}\n\n{not json}\n{"title": "Two", "description": "d"}\n1, 2\n')
+        with open(path, encoding="utf-8") as f:
+            result = TaskStorage().add_tasks(read_tasks_jsonl(f))
+        assert result.added == 2
+        assert [position + 1 for position, _ in result.errors] == [3, 5]
+
+    # Bad lines whose commas would balance out inside one JSON array are
+    # each rejected on their own line, never merged or shifted
+    lines = ['{"title": "A"}, {"title": "B"}\n', '["x"\n', '"y"]\n', '{"title": "C"}\n']
+    result = TaskStorage().add_tasks(read_tasks_jsonl(lines))
+    assert result.added == 1
+    assert [position + 1 for position, _ in result.errors] == [1, 2, 3]
+
+    print("✓ Batch Insert: PASSED")
+
+
 def main():
     """Run all tests."""
     print("\n" + "="*50)
@@ -189,6 +703,16 @@ def main():
         test_delete_task(storage)
         test_validations()
         test_id_management()
+        test_log_storage()
+        test_sqlite_storage()
+        test_compact_storage()
+        test_status_views()
+        test_paged_view()
+        test_batch_cli()
+        test_search()
+        test_concurrent_storage()
+        test_timestamps()
+        test_add_tasks()
 
         print("\n" + "="*50)
         print("  ✓ ALL TESTS PASSED!")